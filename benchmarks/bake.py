@@ -0,0 +1,273 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Measure the bake of each template and compare it against a baseline.
+
+Each template is baked once per value of its build system and, for the
+solution template, once per type of user interface. Each bake runs in a new
+Python process, like a call to the command line interface, and starts from an
+empty cache unless ``--warm`` is given. The wall time, the peak resident set
+size and the number and size of the baked files are recorded.
+
+Usage::
+
+    python benchmarks/bake.py run --output baseline.json
+    python benchmarks/bake.py run --output results.json
+    python benchmarks/bake.py compare baseline.json results.json --threshold 10
+
+The ``compare`` command exits with an error if any metric of any bake is more
+than ``--threshold`` percent higher than in the baseline.
+
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from ansys.templates.cache import CACHE_DIR_ENV_VAR
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+from ansys.templates.registry import get_templates
+
+BAKE_SCRIPT = """
+import json
+import os
+import sys
+import time
+
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+from ansys.templates.utils import bake_template
+
+template, output_path, extra_context, in_process_hooks = sys.argv[1:]
+
+start = time.perf_counter()
+project_path = bake_template(
+    TEMPLATE_PATH_FINDER[template],
+    output_path,
+    overwrite_if_exists=True,
+    no_input=True,
+    extra_context=json.loads(extra_context),
+    in_process_hooks=in_process_hooks == "1",
+)
+wall_time = time.perf_counter() - start
+
+try:
+    import resource
+except ImportError:
+    peak_rss = None
+else:
+    # Hooks may run in a subprocess, so the largest of both is kept. The
+    # resident set size is given in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    peak_rss = unit * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+files, size = 0, 0
+for root, _, filenames in os.walk(project_path):
+    for filename in filenames:
+        files += 1
+        size += os.path.getsize(os.path.join(root, filename))
+
+print(json.dumps(dict(wall_time=wall_time, peak_rss=peak_rss, files=files, bytes=size)))
+"""
+
+RESULTS_VERSION = 1
+"""Version of the layout of the results files."""
+
+METRICS = ["wall_time", "peak_rss", "files", "bytes"]
+"""Metrics recorded for each bake."""
+
+VARIANT_VARIABLES = ["build_system", "the type of solution UI"]
+"""Variables whose choices are each baked separately."""
+
+
+def get_bakes():
+    """Return the name, the template and the variables of each bake.
+
+    The common template is not listed in the registry and is only baked
+    through the other templates.
+
+    """
+    templates = get_templates()
+    bakes = {}
+    for template in TEMPLATE_PATH_FINDER:
+        if template not in templates:
+            continue
+        choices = templates[template]["choices"]
+        variants = [(name, value) for name in VARIANT_VARIABLES for value in choices.get(name, [])]
+        if not variants:
+            bakes[template] = (template, {})
+        for name, value in variants:
+            bakes[f"{template}-{value}"] = (template, {name: value})
+    return bakes
+
+
+def measure_bake(template, extra_context, output_path, cache_dir, in_process_hooks):
+    """Bake a template in a new process and return its metrics."""
+    env = dict(os.environ, **{CACHE_DIR_ENV_VAR: cache_dir})
+    args = [template, output_path, json.dumps(extra_context), "1" if in_process_hooks else "0"]
+    process = subprocess.run(
+        [sys.executable, "-c", BAKE_SCRIPT, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def run(args):
+    """Measure all the bakes and write their metrics to a JSON file."""
+    results = {}
+    for name, (template, extra_context) in get_bakes().items():
+        if args.select and not any(fnmatch.fnmatchcase(name, glob) for glob in args.select):
+            continue
+
+        samples = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                cache_dir, output_path = os.path.join(tmp_dir, "cache"), os.path.join(
+                    tmp_dir, "out"
+                )
+                bake_args = (template, extra_context, output_path, cache_dir, args.in_process_hooks)
+                if args.warm:
+                    measure_bake(*bake_args)
+                samples.append(measure_bake(*bake_args))
+
+        peak_rss = [sample["peak_rss"] for sample in samples if sample["peak_rss"] is not None]
+        results[name] = dict(
+            wall_time=statistics.median(sample["wall_time"] for sample in samples),
+            peak_rss=max(peak_rss) if peak_rss else None,
+            files=samples[-1]["files"],
+            bytes=samples[-1]["bytes"],
+        )
+        print(
+            f"{name:<32}{results[name]['wall_time'] * 1000:>10.1f} ms"
+            f"{(results[name]['peak_rss'] or 0) / 2**20:>10.1f} MiB"
+            f"{results[name]['files']:>8} files{results[name]['bytes']:>12} bytes"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as json_file:
+        json.dump(
+            dict(
+                version=RESULTS_VERSION,
+                python=platform.python_version(),
+                platform=platform.platform(),
+                repeat=args.repeat,
+                warm=args.warm,
+                in_process_hooks=args.in_process_hooks,
+                results=results,
+            ),
+            json_file,
+            indent=2,
+        )
+        json_file.write("\n")
+    return 0
+
+
+def compare(args):
+    """Compare the metrics of two runs and report the regressions."""
+    runs = []
+    for path in (args.baseline, args.results):
+        with open(path, encoding="utf-8") as json_file:
+            content = json.load(json_file)
+        if content.get("version") != RESULTS_VERSION:
+            print(f"Unsupported results version {content.get('version')!r} in '{path}'.")
+            return 2
+        runs.append(content["results"])
+    baseline, results = runs
+
+    regressions = 0
+    print(f"{'Bake':<32}{'Metric':<12}{'Baseline':>14}{'Results':>14}{'Change':>10}")
+    for name in sorted(baseline.keys() & results.keys()):
+        for metric in args.metric:
+            before, after = baseline[name].get(metric), results[name].get(metric)
+            if not before or after is None:
+                continue
+            change = 100 * (after - before) / before
+            regressed = change > args.threshold
+            regressions += regressed
+            print(
+                f"{name:<32}{metric:<12}{before:>14.4g}{after:>14.4g}{change:>+9.1f}%"
+                + ("  REGRESSION" if regressed else "")
+            )
+
+    for name in sorted(baseline.keys() ^ results.keys()):
+        print(f"{name:<32}only in '{args.baseline if name in baseline else args.results}'")
+
+    if regressions:
+        print(f"{regressions} metric(s) regressed by more than {args.threshold}%.")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Measure the bakes.")
+    run_parser.add_argument("--output", default="bake-benchmark.json", help="Results file.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Number of bakes of each case.")
+    run_parser.add_argument(
+        "--select",
+        action="append",
+        help="Only measure the bakes matching this shell-style pattern. Can be repeated.",
+    )
+    run_parser.add_argument(
+        "--warm", action="store_true", help="Bake once before measuring, to fill the cache."
+    )
+    run_parser.add_argument(
+        "--in-process-hooks", action="store_true", help="Run the hooks in the baking process."
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare results to a baseline.")
+    compare_parser.add_argument("baseline", help="Results file used as reference.")
+    compare_parser.add_argument("results", help="Results file being checked.")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed increase, in percent."
+    )
+    compare_parser.add_argument(
+        "--metric",
+        action="append",
+        choices=METRICS,
+        help="Metric being compared. Can be repeated. Default is all of them.",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare" and not args.metric:
+        args.metric = METRICS
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Compare cold and warm bakes of the Jinja bytecode cache.
+
+Each bake runs in a new Python process, like successive calls to the command
+line interface. The first bake starts from an empty cache while the following
+ones reuse the compiled templates. Hooks are disabled so only rendering is
+measured.
+
+Usage::
+
+    python benchmarks/bytecode_cache.py --repeat 5
+
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from ansys.templates.cache import CACHE_DIR_ENV_VAR
+
+BAKE_SCRIPT = """
+import sys
+import time
+
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+from ansys.templates.utils import bake_template
+
+start = time.perf_counter()
+bake_template(
+    TEMPLATE_PATH_FINDER[sys.argv[1]],
+    sys.argv[2],
+    overwrite_if_exists=True,
+    no_input=True,
+    accept_hooks=False,
+)
+print(time.perf_counter() - start)
+"""
+
+TEMPLATES = ["solution", "pyansys-advanced"]
+"""Templates being benchmarked."""
+
+
+def time_bake(template, output_path, cache_dir):
+    """Bake a template in a new process and return the elapsed time."""
+    env = dict(os.environ, **{CACHE_DIR_ENV_VAR: cache_dir})
+    process = subprocess.run(
+        [sys.executable, "-c", BAKE_SCRIPT, template, output_path],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of cold and warm bakes.")
+    args = parser.parse_args()
+
+    print(f"{'Template':<20}{'Cold (ms)':>12}{'Warm (ms)':>12}{'Speedup':>10}")
+    for template in TEMPLATES:
+        cold_times, warm_times = [], []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                cache_dir = os.path.join(tmp_dir, "cache")
+                output_path = os.path.join(tmp_dir, "out")
+                cold_times.append(time_bake(template, output_path, cache_dir))
+                warm_times.append(time_bake(template, output_path, cache_dir))
+
+        cold, warm = statistics.median(cold_times), statistics.median(warm_times)
+        print(f"{template:<20}{cold * 1000:>12.1f}{warm * 1000:>12.1f}{cold / warm:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
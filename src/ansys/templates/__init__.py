@@ -27,23 +27,28 @@ A collection of interactive templates for building Python projects from scratch
 according to PyAnsys guidelines.
 """
 
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata
-
-__version__ = importlib_metadata.version(__name__.replace(".", "-"))
-
-AVAILABLE_TEMPLATES_AND_DESCRIPTION = {
-    "doc-project": "Create a documentation project using Sphinx.",
-    "pybasic": "Create a basic Python Package.",
-    "pyansys": "Create a PyAnsys Python Package project.",
-    "pyansys-advanced": "Create an advanced PyAnsys Python Package project.",
-    "pyansys-openapi_client": "Create an OpenAPI Client Package project.",
-    "pyace": "Create a Python project for any method developers.",
-    "pyace-flask": "Create a Flask project initialized for any developer.",
-    "pyace-grpc": "Create gRPC project initialized for any developer.",
-    "pyace-fast": "Create a FastAPI project initialized for any developer.",
-    "solution": "[Ansys Internal Use Only] Create a solution based on SAF.",
-}
-"""A list holding all available templates names."""
+
+def __getattr__(name):
+    """Resolve the version and the available templates the first time they are requested.
+
+    Reading the package metadata and the registry of the templates is slow, so
+    it is deferred until they are actually required.
+
+    """
+    if name == "__version__":
+        try:
+            import importlib.metadata as importlib_metadata
+        except ModuleNotFoundError:
+            import importlib_metadata
+
+        value = importlib_metadata.version(__name__.replace(".", "-"))
+    elif name == "AVAILABLE_TEMPLATES_AND_DESCRIPTION":
+        # A dictionary relating templates names with their descriptions
+        from ansys.templates.registry import get_templates
+
+        value = {template: entry["description"] for template, entry in get_templates().items()}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
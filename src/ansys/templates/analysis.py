@@ -0,0 +1,329 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Static analysis of the variables each file of a template depends on.
+
+The Jinja syntax tree of each file content, file path, manifest condition and
+hook is searched for the cookiecutter variables it reads. Private variables
+derived from other variables in ``cookiecutter.json`` are followed, so a file
+reading ``cookiecutter.__build_system`` also depends on ``build_system``.
+
+Usage::
+
+    python -m ansys.templates.analysis pyansys-advanced
+    python -m ansys.templates.analysis pyansys-advanced --changed build_system
+
+"""
+
+import argparse
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+import json
+from pathlib import Path
+import sys
+
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.generate import is_copy_only_path
+from jinja2 import meta, nodes
+
+from ansys.templates.licenses import MIT_LICENSE
+from ansys.templates.overlay import PROJECT_DIR_NAME, TEMPLATED, TemplateOverlay
+
+ALL_VARIABLES = "*"
+"""Name standing for all the variables, used when the whole context is read."""
+
+_DICT_METHODS = {"get", "items", "keys", "values"}
+"""Methods of the cookiecutter dictionary which read its variables."""
+
+
+def find_variables(ast):
+    """
+    Return the cookiecutter variables read by a Jinja syntax tree.
+
+    Variables are read as ``cookiecutter.name``, ``cookiecutter['name']`` or
+    ``cookiecutter.get('name')``. Any other use of the ``cookiecutter``
+    dictionary, like passing it to a filter, reads all the variables.
+
+    Parameters
+    ----------
+    ast : ~jinja2.nodes.Template
+        Syntax tree of a template.
+
+    Returns
+    -------
+    set
+        Names of the variables. Holds :data:`ALL_VARIABLES` if all the
+        variables may be read.
+
+    """
+    variables, resolved = set(), set()
+
+    for call in ast.find_all(nodes.Call):
+        method = call.node
+        if (
+            isinstance(method, nodes.Getattr)
+            and method.attr == "get"
+            and isinstance(method.node, nodes.Name)
+            and method.node.name == "cookiecutter"
+            and call.args
+            and isinstance(call.args[0], nodes.Const)
+        ):
+            variables.add(call.args[0].value)
+            resolved.add(id(method.node))
+
+    for node in ast.find_all((nodes.Getattr, nodes.Getitem)):
+        if not isinstance(node.node, nodes.Name) or node.node.name != "cookiecutter":
+            continue
+        if id(node.node) in resolved:
+            continue
+        if isinstance(node, nodes.Getattr) and node.attr not in _DICT_METHODS:
+            variables.add(node.attr)
+        elif isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+            variables.add(node.arg.value)
+        else:
+            continue
+        resolved.add(id(node.node))
+
+    for name in ast.find_all(nodes.Name):
+        if name.name == "cookiecutter" and id(name) not in resolved:
+            variables.add(ALL_VARIABLES)
+            break
+
+    return variables
+
+
+@dataclass
+class TemplateDependencies:
+    """
+    Variables each file of a template depends on.
+
+    Parameters
+    ----------
+    files : dict
+        Paths of the files relative to the project directory, before rendering,
+        as keys and the names of the variables changing their path, content or
+        presence as values.
+    hooks : frozenset
+        Names of the variables read by the hooks of the template.
+
+    """
+
+    files: dict
+    hooks: frozenset
+
+    def get_graph(self):
+        """
+        Return the files depending on each variable.
+
+        Returns
+        -------
+        dict
+            Names of the variables as keys and the sorted paths of the files
+            depending on them as values.
+
+        """
+        graph = {}
+        for path, variables in self.files.items():
+            for variable in variables:
+                graph.setdefault(variable, []).append(path)
+        return {variable: sorted(paths) for variable, paths in sorted(graph.items())}
+
+    def get_affected_files(self, variables):
+        """
+        Return the files whose baked version may change with some variables.
+
+        Hooks may move, delete or modify any file, so all the files are
+        affected by a variable read by the hooks.
+
+        Parameters
+        ----------
+        variables : list
+            Names of the changed variables.
+
+        Returns
+        -------
+        list
+            Sorted paths of the affected files, relative to the project
+            directory and before rendering.
+
+        """
+        variables = set(variables)
+        if variables & self.hooks or ALL_VARIABLES in self.hooks:
+            return sorted(self.files)
+        return sorted(
+            path
+            for path, dependencies in self.files.items()
+            if variables & dependencies or ALL_VARIABLES in dependencies
+        )
+
+
+def _expand(variables, definitions):
+    """Add the variables from which the given ones are defined."""
+    expanded, pending = set(), list(variables)
+    while pending:
+        variable = pending.pop()
+        if variable in expanded:
+            continue
+        expanded.add(variable)
+        pending.extend(definitions.get(variable, ()))
+    return frozenset(expanded)
+
+
+def _find_definitions(configuration, environment):
+    """Return the variables each variable of ``cookiecutter.json`` is defined from."""
+    definitions = {}
+    for name, value in configuration.items():
+        values = value if isinstance(value, list) else [value]
+        definitions[name] = set()
+        for item in values:
+            if isinstance(item, str):
+                definitions[name] |= find_variables(environment.parse(item))
+        definitions[name].discard(name)
+    return definitions
+
+
+def _find_source_variables(overlay, relative_path, environment, seen=None):
+    """Return the variables read by a file and the templates it includes."""
+    seen = set() if seen is None else seen
+    seen.add(relative_path)
+    source = overlay.resolve(relative_path).read_text(encoding="utf-8")
+    ast = environment.parse(source)
+    variables = find_variables(ast)
+    for name in meta.find_referenced_templates(ast):
+        included_path = f"{PROJECT_DIR_NAME}/{name}"
+        if name is None or included_path not in overlay:
+            variables.add(ALL_VARIABLES)
+        elif included_path not in seen:
+            variables |= _find_source_variables(overlay, included_path, environment, seen)
+    return variables
+
+
+def _find_condition_variables(condition, environment):
+    """Return the variables read by a condition of the manifest."""
+    ast = environment.parse(f"{{{{ {condition} }}}}")
+    variables = find_variables(ast)
+    variables |= meta.find_undeclared_variables(ast) - {"cookiecutter"}
+    return variables
+
+
+def analyze_template(template_path, license_path=MIT_LICENSE, use_cache=True):
+    """
+    Find the variables each file of a template depends on.
+
+    A file depends on the variables read by its path, by its content unless it
+    is copied without rendering, and by the conditions of the manifest
+    selecting it. Files the manifest never selects are not listed.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    license_path : ~pathlib.Path
+        Path to license file. Default is MIT.
+    use_cache : bool
+        Reuse the properties of the template files stored in the cache.
+        Default is ``True``.
+
+    Returns
+    -------
+    TemplateDependencies
+        Variables each file depends on.
+
+    """
+    overlay = TemplateOverlay(template_path, license_path, use_cache=use_cache)
+    with open(overlay.template_path / "cookiecutter.json", encoding="utf-8") as json_file:
+        configuration = json.load(json_file)
+
+    context = {"cookiecutter": configuration}
+    environment = StrictEnvironment(context=context, keep_trailing_newline=True)
+    definitions = _find_definitions(configuration, environment)
+
+    manifest = overlay.load_manifest()
+    patterns = None
+    if manifest is not None:
+        patterns = [(pattern, set()) for pattern in manifest.get("files", [])]
+        for group in manifest.get("conditional_files", []):
+            condition = _find_condition_variables(group["when"], environment)
+            patterns.extend((pattern, condition) for pattern in group["files"])
+
+    files = {}
+    for path in overlay.walk(PROJECT_DIR_NAME):
+        if "__pycache__" in path.split("/"):
+            continue
+
+        variables = set()
+        if patterns is not None:
+            matches = [condition for pattern, condition in patterns if fnmatchcase(path, pattern)]
+            if not matches:
+                continue
+            # Files always selected do not depend on the conditions
+            if all(matches):
+                variables |= set().union(*matches)
+
+        variables |= find_variables(environment.parse(path))
+        relative_path = f"{PROJECT_DIR_NAME}/{path}"
+        if overlay.get_kind(relative_path) == TEMPLATED and not is_copy_only_path(path, context):
+            variables |= _find_source_variables(overlay, relative_path, environment)
+
+        files[path] = _expand(variables, definitions)
+
+    hooks = set()
+    hooks_path = overlay.template_path / "hooks"
+    if hooks_path.is_dir():
+        for hook_path in sorted(hooks_path.glob("*.py")):
+            hooks |= find_variables(environment.parse(hook_path.read_text(encoding="utf-8")))
+
+    return TemplateDependencies(files=files, hooks=_expand(hooks, definitions))
+
+
+def main(argv=None):
+    """Print the files depending on each variable of a template."""
+    # Only required for finding the templates by name
+    from ansys.templates.paths import TEMPLATE_PATH_FINDER
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ansys.templates.analysis",
+        description="Find the variables each file of a template depends on.",
+    )
+    parser.add_argument("template", help="Name of or path to the template.")
+    parser.add_argument(
+        "--changed",
+        action="append",
+        metavar="VARIABLE",
+        help="Only print the files affected by a change of this variable. Can be repeated.",
+    )
+    args = parser.parse_args(argv)
+
+    template_path = TEMPLATE_PATH_FINDER.get(args.template, Path(args.template))
+    dependencies = analyze_template(template_path)
+    if args.changed:
+        output = dependencies.get_affected_files(args.changed)
+    else:
+        output = {"files": dependencies.get_graph(), "hooks": sorted(dependencies.hooks)}
+    json.dump(output, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Writing of baked projects into archives."""
+
+import os
+import tarfile
+import zipfile
+
+ARCHIVE_FORMATS = {
+    "zip": (".zip",),
+    "tar": (".tar",),
+    "gztar": (".tar.gz", ".tgz"),
+    "bztar": (".tar.bz2", ".tbz2"),
+    "xztar": (".tar.xz", ".txz"),
+}
+"""Supported archive formats and their file extensions."""
+
+_TAR_MODES = {"tar": "w", "gztar": "w:gz", "bztar": "w:bz2", "xztar": "w:xz"}
+"""Modes used to open each format of tar archive for writing."""
+
+
+def get_archive_format(archive_path):
+    """
+    Guess the format of an archive from its extension.
+
+    Parameters
+    ----------
+    archive_path : str
+        Path to the archive.
+
+    Returns
+    -------
+    str
+        One of the keys of :data:`ARCHIVE_FORMATS`.
+
+    Raises
+    ------
+    ValueError
+        If the extension does not match any supported format.
+
+    """
+    name = str(archive_path).lower()
+    for archive_format, extensions in ARCHIVE_FORMATS.items():
+        if name.endswith(extensions):
+            return archive_format
+    raise ValueError(
+        f"Unable to guess the format of '{archive_path}'. "
+        f"Use one of the extensions: {', '.join(sum(ARCHIVE_FORMATS.values(), ()))}."
+    )
+
+
+def write_archive(source_path, archive, archive_format, arcname):
+    """
+    Write the contents of a directory into an archive.
+
+    Entries are written in a sorted order, so archiving the same files twice
+    produces the same list of entries.
+
+    Parameters
+    ----------
+    source_path : str
+        Path to the directory to be archived.
+    archive : file object
+        Binary file receiving the archive. It does not need to be seekable.
+    archive_format : str
+        One of the keys of :data:`ARCHIVE_FORMATS`.
+    arcname : str
+        Name of the directory holding the files within the archive.
+
+    """
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for folder, subfolders, files in os.walk(source_path):
+                subfolders.sort()
+                relative_folder = os.path.normpath(
+                    os.path.join(arcname, os.path.relpath(folder, source_path))
+                )
+                zip_file.write(folder, relative_folder)
+                for name in sorted(files):
+                    zip_file.write(os.path.join(folder, name), os.path.join(relative_folder, name))
+    else:
+        with tarfile.open(fileobj=archive, mode=_TAR_MODES[archive_format]) as tar_file:
+            tar_file.add(source_path, arcname=arcname)
@@ -0,0 +1,254 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""A persistent on-disk cache for artifacts reused across bakes."""
+
+import os
+from pathlib import Path
+import shutil
+import sys
+
+CACHE_DIR_ENV_VAR = "ANSYS_TEMPLATES_CACHE_DIR"
+"""Environment variable overriding the default cache directory."""
+
+CACHE_MAX_SIZE_ENV_VAR = "ANSYS_TEMPLATES_CACHE_MAX_SIZE"
+"""Environment variable overriding the maximum cache size in bytes."""
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+"""Default maximum size of the cache in bytes."""
+
+_SIZE_FILE_NAME = ".size"
+"""Name of the file holding the estimated size of the cache in bytes."""
+
+
+def get_cache_dir():
+    """Return the directory holding the cache of ansys-templates.
+
+    The directory can be set through the ``ANSYS_TEMPLATES_CACHE_DIR``
+    environment variable. Otherwise, the user cache directory of the current
+    platform is used.
+
+    Returns
+    -------
+    ~pathlib.Path
+        Path to the cache directory.
+
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return Path(cache_dir)
+
+    if sys.platform.startswith("win"):
+        base_dir = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base_dir = Path.home() / "Library" / "Caches"
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+
+    return Path(base_dir) / "ansys-templates"
+
+
+def get_cache_max_size():
+    """Return the maximum size of the cache in bytes.
+
+    Returns
+    -------
+    int
+        Maximum size in bytes, read from the ``ANSYS_TEMPLATES_CACHE_MAX_SIZE``
+        environment variable if defined.
+
+    """
+    return int(os.environ.get(CACHE_MAX_SIZE_ENV_VAR, DEFAULT_CACHE_MAX_SIZE))
+
+
+def get_cache_entry(namespace, key):
+    """Return the path of a cache entry.
+
+    Parameters
+    ----------
+    namespace : str
+        Name of the group of entries, for example ``"templates"``.
+    key : str
+        Unique key of the entry within its namespace.
+
+    Returns
+    -------
+    ~pathlib.Path
+        Path of the entry. The entry may not exist yet.
+
+    """
+    return get_cache_dir() / namespace / key
+
+
+def touch_cache_entry(entry):
+    """Mark a cache entry as recently used.
+
+    Parameters
+    ----------
+    entry : ~pathlib.Path
+        Path of the cache entry.
+
+    """
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+
+def _get_entry_size(entry):
+    """Return the size in bytes of a cache entry.
+
+    Files removed by a concurrent process while walking the entry are ignored.
+
+    """
+    if not entry.is_dir():
+        return entry.stat().st_size
+    size = 0
+    for root, _, files in os.walk(entry):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(root, file))
+            except FileNotFoundError:
+                continue
+    return size
+
+
+def _remove_entry(entry):
+    """Remove a cache entry from disk."""
+    if entry.is_dir():
+        shutil.rmtree(entry, ignore_errors=True)
+    else:
+        entry.unlink(missing_ok=True)
+
+
+def _read_cache_size(cache_dir):
+    """Return the estimated size of the cache or ``None`` if it is unknown."""
+    try:
+        with open(cache_dir / _SIZE_FILE_NAME, encoding="utf-8") as size_file:
+            return int(size_file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache_size(cache_dir, size):
+    """Store the estimated size of the cache."""
+    size_file = cache_dir / _SIZE_FILE_NAME
+    tmp_size_file = size_file.with_name(f"{size_file.name}.{os.getpid()}")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_size_file, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(str(size))
+        os.replace(tmp_size_file, size_file)
+    except OSError:
+        pass
+
+
+def evict_cache(max_size=None, keep=()):
+    """Remove the least recently used entries until the cache fits in size.
+
+    Entries removed by a concurrent process while the cache is walked are
+    ignored. The estimated size of the cache is reset to its actual size.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum size of the cache in bytes. Default is the value returned by
+        :func:`get_cache_max_size`.
+    keep : list, optional
+        Entries which must not be removed, for example the one in use.
+
+    Returns
+    -------
+    list
+        Paths of the removed entries.
+
+    """
+    max_size = get_cache_max_size() if max_size is None else max_size
+    cache_dir = get_cache_dir()
+    if not cache_dir.is_dir():
+        return []
+
+    # Entries live one level below their namespace directory. Temporary
+    # entries which are still being written start with a dot
+    entries = {}
+    for namespace in cache_dir.iterdir():
+        try:
+            namespace_entries = list(namespace.iterdir()) if namespace.is_dir() else []
+        except FileNotFoundError:
+            continue
+        for entry in namespace_entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                entries[entry] = (entry.stat().st_mtime, _get_entry_size(entry))
+            except FileNotFoundError:
+                continue
+    total_size = sum(size for _, size in entries.values())
+
+    removed = []
+    keep = {Path(entry) for entry in keep}
+    for entry, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+        if total_size <= max_size:
+            break
+        if entry in keep:
+            continue
+        _remove_entry(entry)
+        total_size -= size
+        removed.append(entry)
+
+    _write_cache_size(cache_dir, total_size)
+    return removed
+
+
+def record_cache_write(size, keep=()):
+    """Account for bytes written to the cache and evict entries if required.
+
+    The estimated size of the cache is kept in a file, so the entries are only
+    walked once the estimate exceeds the maximum size of the cache. The
+    estimate may drift when several processes write at the same time, but
+    each eviction resets it to the actual size.
+
+    Parameters
+    ----------
+    size : int
+        Number of bytes written to the cache.
+    keep : list, optional
+        Entries which must not be removed, for example the one written.
+
+    Returns
+    -------
+    list
+        Paths of the removed entries.
+
+    """
+    cache_dir = get_cache_dir()
+    cache_size = _read_cache_size(cache_dir)
+    if cache_size is None or cache_size + size > get_cache_max_size():
+        return evict_cache(keep=keep)
+    _write_cache_size(cache_dir, cache_size + size)
+    return []
+
+
+def clear_cache():
+    """Remove all the entries of the cache."""
+    shutil.rmtree(get_cache_dir(), ignore_errors=True)
@@ -22,25 +22,266 @@
 
 """Command Line Interface for PyAnsys Templates."""
 
+import builtins
+import json
 import os
+import time
 
 import click
 
-from ansys.templates import AVAILABLE_TEMPLATES_AND_DESCRIPTION, __version__
+from ansys.templates import AVAILABLE_TEMPLATES_AND_DESCRIPTION
+from ansys.templates.archive import ARCHIVE_FORMATS
 from ansys.templates.paths import PYTHON_TEMPLATES_SOLUTION_PATH, TEMPLATE_PATH_FINDER
-from ansys.templates.utils import bake_template, load_inputs_from_configuration_file
 
-
-def create_project(template, no_input=False, extra_context={}):
+# Cookiecutter, Jinja and the package utilities are only imported by the
+# commands requiring them, so listing templates or displaying the version
+# starts quickly
+
+
+def create_project(
+    template,
+    no_input=False,
+    extra_context={},
+    no_cache=False,
+    contexts=None,
+    jobs=None,
+    output_dir=None,
+    record=False,
+    output_archive=None,
+    archive_format=None,
+    force=False,
+    profile=None,
+    in_process_hooks=False,
+):
     """Create Python project based on a given template.
 
     Parameters
     ----------
     template : str
         Name of the template to be used as basis for the project
+    no_input : bool
+        Do not prompt for user input.
+    extra_context : dict
+        Variables overriding the default ones of the template.
+    no_cache : bool
+        Do not use the cache of template files properties.
+    contexts : str, optional
+        Path to a JSON or YAML file holding a list of variables. A project is
+        created for each item of the list without prompting for user input.
+    jobs : int, optional
+        Number of projects created in parallel when using ``contexts``.
+    output_dir : str, optional
+        Directory where projects are created. Default is the current one.
+    record : bool
+        Store the record required to update the projects later in their
+        ``.ansys-templates`` directory.
+    output_archive : str, optional
+        Path to an archive receiving the project instead of a directory, or
+        ``"-"`` for the standard output.
+    archive_format : str, optional
+        Format of the archive. Default is guessed from its extension.
+    force : bool
+        Create the projects from ``contexts`` even if they were already created
+        from the same variables and template. Required by ``contexts`` unless
+        ``record`` is set, as only recorded projects can be skipped.
+    profile : str, optional
+        Path to a Chrome trace receiving the time spent in each phase of the
+        bake. A summary of these times is also printed.
+    in_process_hooks : bool
+        Run the hooks of the template in the current interpreter instead of a
+        subprocess.
+
+    """
+    from ansys.templates.utils import bake_archive, bake_many, bake_template
+
+    if profile is not None:
+        if contexts is not None:
+            raise click.UsageError("--profile can not be combined with --contexts.")
+        from ansys.templates.profiling import Profiler, activate
+
+        profiler = Profiler()
+        try:
+            with activate(profiler):
+                create_project(
+                    template,
+                    no_input=no_input,
+                    extra_context=extra_context,
+                    no_cache=no_cache,
+                    output_dir=output_dir,
+                    record=record,
+                    output_archive=output_archive,
+                    archive_format=archive_format,
+                    in_process_hooks=in_process_hooks,
+                )
+        finally:
+            profiler.write_chrome_trace(profile)
+            click.echo(profiler.summary(), err=True)
+            click.echo(f"\nProfile written to {profile}", err=True)
+        return
+
+    if output_archive is not None:
+        if contexts is not None:
+            raise click.UsageError("--output-archive can not be combined with --contexts.")
+        try:
+            bake_archive(
+                TEMPLATE_PATH_FINDER[template],
+                output_archive,
+                archive_format=archive_format,
+                use_cache=not no_cache,
+                record=record,
+                in_process_hooks=in_process_hooks,
+                no_input=no_input,
+                extra_context=extra_context,
+            )
+        except ValueError as err:
+            raise click.UsageError(str(err))
+        return
+
+    output_dir = output_dir or os.getcwd()
+    if contexts is None:
+        bake_template(
+            TEMPLATE_PATH_FINDER[template],
+            output_dir,
+            use_cache=not no_cache,
+            record=record,
+            overwrite_if_exists=True,
+            in_process_hooks=in_process_hooks,
+            staged=True,
+            no_input=no_input,
+            extra_context=extra_context,
+        )
+        return
+
+    if not (record or force):
+        raise click.UsageError(
+            "--contexts requires --record to skip the projects which are up to date, "
+            "or --force to create all of them."
+        )
+
+    contexts_list = load_contexts(contexts)
+    start = time.perf_counter()
+    results = bake_many(
+        TEMPLATE_PATH_FINDER[template],
+        [{**extra_context, **context} for context in contexts_list],
+        output_dir,
+        jobs=jobs,
+        use_cache=not no_cache,
+        record=record,
+        skip_unchanged=record and not force,
+        staged=True,
+        overwrite_if_exists=True,
+        in_process_hooks=in_process_hooks,
+    )
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result.skipped:
+            print(f"Skipped {result.project_path}, already up to date")
+        elif result.succeeded:
+            print(f"Created {result.project_path} in {result.timings['total']:.2f} s")
+        else:
+            print(f"Failed to create project from {result.context}: {result.error}")
+
+    skipped = sum(result.skipped for result in results)
+    failures = sum(not result.succeeded for result in results)
+    created = len(results) - skipped - failures
+    print(
+        f"\n{created} created, {skipped} skipped, {failures} failed in {elapsed:.2f} s "
+        f"({created / elapsed:.1f} projects/s)"
+    )
+    if failures:
+        raise click.ClickException(f"{failures} out of {len(results)} projects failed.")
+
+
+def load_contexts(contexts_path):
+    """Load the list of variables used for creating many projects.
+
+    Parameters
+    ----------
+    contexts_path : str
+        Path to a JSON file, or to a YAML file if its extension is ``.yaml``
+        or ``.yml``.
+
+    Returns
+    -------
+    list
+        Variables of each project.
 
     """
-    bake_template(TEMPLATE_PATH_FINDER[template], os.getcwd(), overwrite_if_exists=True, no_input=no_input, extra_context=extra_context)
+    with open(contexts_path, "r", encoding="utf-8") as contexts_file:
+        if contexts_path.endswith((".yaml", ".yml")):
+            import yaml
+
+            try:
+                contexts_list = yaml.safe_load(contexts_file)
+            except yaml.YAMLError as err:
+                raise click.UsageError(f"Invalid YAML file '{contexts_path}': {err}")
+        else:
+            try:
+                contexts_list = json.load(contexts_file)
+            except json.JSONDecodeError as err:
+                raise click.UsageError(f"Invalid JSON file '{contexts_path}': {err}")
+
+    # The list command of this module shadows the builtin
+    if not isinstance(contexts_list, builtins.list) or not all(
+        isinstance(context, dict) for context in contexts_list
+    ):
+        raise click.UsageError(f"'{contexts_path}' must hold a list of variables mappings.")
+    return contexts_list
+
+
+def bake_options(command):
+    """Decorate a command with the options shared by all templates."""
+    command = click.option(
+        "--no-cache", is_flag=True, help="Do not reuse data stored in the cache."
+    )(command)
+    command = click.option(
+        "--contexts",
+        type=click.Path(exists=True, dir_okay=False),
+        help="JSON or YAML file with a list of variables. A project is created for each item.",
+    )(command)
+    command = click.option(
+        "--force",
+        is_flag=True,
+        help="Recreate the projects of --contexts even if they are up to date.",
+    )(command)
+    command = click.option(
+        "--jobs", type=int, help="Number of projects created in parallel with --contexts."
+    )(command)
+    command = click.option(
+        "--output-dir",
+        type=click.Path(file_okay=False),
+        help="Directory where projects are created. Default is the current one.",
+    )(command)
+    command = click.option(
+        "--record",
+        is_flag=True,
+        help="Store the record used by 'ansys-templates update' in the .ansys-templates "
+        "directory of the project.",
+    )(command)
+    command = click.option(
+        "--output-archive",
+        type=click.Path(dir_okay=False, allow_dash=True),
+        help="Write the project into an archive instead of a directory. Use '-' for stdout.",
+    )(command)
+    command = click.option(
+        "--in-process-hooks",
+        is_flag=True,
+        help="Run the hooks of the template in the current interpreter instead of a subprocess.",
+    )(command)
+    command = click.option(
+        "--profile",
+        is_flag=False,
+        flag_value="ansys-templates-profile.json",
+        type=click.Path(dir_okay=False),
+        help="Write the time spent in each phase as a Chrome trace, by default "
+        "ansys-templates-profile.json, and print a summary.",
+    )(command)
+    command = click.option(
+        "--archive-format",
+        type=click.Choice(ARCHIVE_FORMATS),
+        help="Format of the archive. Default is guessed from its extension, or gztar for stdout.",
+    )(command)
+    return command
 
 
 @click.group()
@@ -60,9 +301,127 @@ def list():
 @main.command()
 def version():
     """Display current version."""
+    from ansys.templates import __version__
+
     print(f"ansys-templates {__version__}")
 
 
+@main.group()
+def cache():
+    """Manage the cache of ansys-templates."""
+    pass
+
+
+@cache.command()
+def clear():
+    """Remove all the entries of the cache."""
+    from ansys.templates.cache import clear_cache, get_cache_dir
+
+    clear_cache()
+    print(f"Cleared the cache in {get_cache_dir()}")
+
+
+@main.command()
+@click.argument("project_path", default=".", type=click.Path(exists=True, file_okay=False))
+@click.option("--no-cache", is_flag=True, help="Do not reuse data stored in the cache.")
+@click.option("--dry-run", is_flag=True, help="Only show the changes, without applying them.")
+def update(project_path, no_cache, dry_run):
+    """Update a project with the current version of its template."""
+    from ansys.templates.utils import update_project
+
+    try:
+        result = update_project(project_path, use_cache=not no_cache, dry_run=dry_run)
+    except FileNotFoundError as err:
+        raise click.ClickException(str(err))
+
+    if not result.changed:
+        print(f"{project_path} is up to date.")
+        return
+
+    for status in ["updated", "added", "removed", "merged", "conflicts"]:
+        for path in getattr(result, status):
+            print(f"{status}: {path}")
+
+    if result.conflicts:
+        raise click.ClickException(
+            f"{len(result.conflicts)} files could not be merged. Resolve the conflicts manually."
+        )
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen to.")
+@click.option("--port", default=8765, show_default=True, help="Port to listen to.")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen to a Unix socket instead of a port.",
+)
+@click.option(
+    "--workers", type=int, help="Maximum number of concurrent bakes. Default is the number of CPUs."
+)
+@click.option(
+    "--queue-depth",
+    default=16,
+    show_default=True,
+    help="Maximum number of requests waiting for a worker.",
+)
+@click.option(
+    "--in-process-hooks",
+    is_flag=True,
+    help="Run the hooks of the templates in the server process instead of a subprocess.",
+)
+@click.option("--no-cache", is_flag=True, help="Do not reuse data stored in the cache.")
+@click.option(
+    "--output-root",
+    type=click.Path(file_okay=False),
+    help="Directory below which projects can be baked on request. "
+    "Default is to only return projects as archives.",
+)
+@click.option(
+    "--allowed-host",
+    "allowed_hosts",
+    multiple=True,
+    help="Host name accepted in the requests in addition to the loopback ones.",
+)
+def serve(
+    host,
+    port,
+    socket_path,
+    workers,
+    queue_depth,
+    in_process_hooks,
+    no_cache,
+    output_root,
+    allowed_hosts,
+):
+    """Serve bake requests from templates kept in memory."""
+    from ansys.templates.server import BakeHTTPServer, BakeService
+
+    service = BakeService(
+        workers=workers,
+        queue_depth=queue_depth,
+        use_cache=not no_cache,
+        in_process_hooks=in_process_hooks,
+        output_root=output_root,
+    )
+    if socket_path:
+        from ansys.templates.server import BakeUnixServer
+
+        server = BakeUnixServer(service, socket_path, allowed_hosts)
+        address = socket_path
+    else:
+        server = BakeHTTPServer(service, host, port, allowed_hosts)
+        address = f"http://{host}:{server.server_address[1]}"
+
+    print(f"Serving {len(service.templates)} templates on {address}")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
 @main.group()
 def new():
     """Create a new project from desired template."""
@@ -70,65 +429,84 @@ def new():
 
 
 @new.command()
-def doc_project():
+@bake_options
+def doc_project(**options):
     """Create a documentation project using Sphinx."""
-    create_project("doc-project")
+    create_project("doc-project", **options)
 
 
 @new.command()
-def pybasic():
+@bake_options
+def pybasic(**options):
     """Create a basic Python Package."""
-    create_project("pybasic")
+    create_project("pybasic", **options)
 
 
 @new.command()
-def pyansys():
+@bake_options
+def pyansys(**options):
     """Create a PyAnsys Python Package project."""
-    create_project("pyansys")
+    create_project("pyansys", **options)
 
 
 @new.command()
-def pyansys_advanced():
+@bake_options
+def pyansys_advanced(**options):
     """Create an advanced PyAnsys Python Package project."""
-    create_project("pyansys-advanced")
+    create_project("pyansys-advanced", **options)
 
 
 @new.command()
-def pyansys_openapi_client():
+@bake_options
+def pyansys_openapi_client(**options):
     """Create an OpenAPI Client Package project."""
-    create_project("pyansys-openapi-client")
+    create_project("pyansys-openapi-client", **options)
 
 
 @new.command()
-def pyace():
+@bake_options
+def pyace(**options):
     """Create a Python project for any method developers."""
-    create_project("pyace")
+    create_project("pyace", **options)
 
 
 @new.command()
-def pyace_fast():
+@bake_options
+def pyace_fast(**options):
     """Create a FastAPI project initialized for any developer."""
-    create_project("pyace-fast")
+    create_project("pyace-fast", **options)
 
 
 @new.command()
-def pyace_flask():
+@bake_options
+def pyace_flask(**options):
     """Create a Flask project initialized for any developer."""
-    create_project("pyace-flask")
+    create_project("pyace-flask", **options)
 
 
 @new.command()
-def pyace_grpc():
+@bake_options
+def pyace_grpc(**options):
     """Create gRPC project initialized for any developer."""
-    create_project("pyace-grpc")
+    create_project("pyace-grpc", **options)
 
 
 @new.command()
-@click.option('-s', '--solution-name', type=str, help="Name of the solution in the definition.")
-@click.option('-d', '--solution-display-name', type=str, help="Name of the solution in the user interface.")
-@click.option("-u", "--with-dash-ui", type=click.Choice(["no", "dash", "awc-dash"]), help="Create a Dash UI for the solution.")
-def solution(solution_name, solution_display_name, with_dash_ui):
+@click.option("-s", "--solution-name", type=str, help="Name of the solution in the definition.")
+@click.option(
+    "-d", "--solution-display-name", type=str, help="Name of the solution in the user interface."
+)
+@click.option(
+    "-u",
+    "--with-dash-ui",
+    type=click.Choice(["no", "dash", "awc-dash"]),
+    help="Create a Dash UI for the solution.",
+)
+@bake_options
+def solution(solution_name, solution_display_name, with_dash_ui, **options):
     """[Ansys Internal Use Only] Create a solution based on SAF."""
+    from ansys.templates.utils import load_inputs_from_configuration_file
+
     template = "solution"
     extra_context = load_inputs_from_configuration_file(PYTHON_TEMPLATES_SOLUTION_PATH)
     no_input = True if solution_name or solution_display_name or with_dash_ui else False
@@ -143,4 +521,4 @@ def solution(solution_name, solution_display_name, with_dash_ui):
     elif with_dash_ui == "awc-dash":
         extra_context["the type of solution UI"] = "awc-dash"
 
-    create_project(template, no_input=no_input, extra_context=extra_context)
+    create_project(template, no_input=no_input, extra_context=extra_context, **options)
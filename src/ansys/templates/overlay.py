@@ -0,0 +1,438 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""A layered view over the files composing a template."""
+
+from fnmatch import fnmatchcase
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from binaryornot.check import is_binary
+from jinja2 import BaseLoader, TemplateNotFound
+
+from ansys.templates.cache import get_cache_entry, record_cache_write, touch_cache_entry
+
+PROJECT_DIR_NAME = "{{cookiecutter.__project_name_slug}}"
+"""Name of the templated directory holding the files of a project."""
+
+BINARY, STATIC, TEMPLATED = "binary", "static", "templated"
+"""Kinds of template files. Only templated files need to be rendered."""
+
+MANIFEST_FILE_NAME = "manifest.json"
+"""Name of the file declaring which files of a template get rendered."""
+
+_PROPERTIES_VERSION = 2
+"""Version of the layout of the file properties stored in the cache."""
+
+_JINJA_TOKENS = ("{{", "{%", "{#")
+"""Tokens opening a Jinja variable, block or comment."""
+
+
+def _classify_file(path):
+    """
+    Return the kind of a template file and its newline character.
+
+    Static files are text files which contain no Jinja syntax and use the same
+    newline character everywhere. Rendering them produces the same content, so
+    they can be copied instead.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+
+    Returns
+    -------
+    tuple
+        Kind of the file and newline character detected in its first line.
+
+    """
+    if is_binary(path):
+        return BINARY, None
+
+    with open(path, encoding="utf-8") as text_file:
+        text_file.readline()
+        newline = text_file.newlines
+
+    with open(path, "rb") as binary_file:
+        content = binary_file.read()
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return TEMPLATED, newline
+
+    crlf_count = content.count(b"\r\n")
+    consistent_newlines = content.count(b"\r") == crlf_count and (
+        crlf_count == 0 or content.count(b"\n") == crlf_count
+    )
+    if consistent_newlines and not any(token in text for token in _JINJA_TOKENS):
+        return STATIC, newline
+
+    return TEMPLATED, newline
+
+
+_CONTENT_DIGESTS = {}
+"""Digests of the content of the files indexed by path, size and modification time."""
+
+
+def _get_content_digest(path, size, mtime):
+    """Return the SHA-256 digest of the content of a file.
+
+    Digests are kept in memory for the lifetime of the process, so a file is
+    only read again once its size or modification time changes.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    size : int
+        Size of the file in bytes.
+    mtime : int
+        Modification time of the file in nanoseconds.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the content of the file.
+
+    """
+    key = (path, size, mtime)
+    if key not in _CONTENT_DIGESTS:
+        with open(path, "rb") as template_file:
+            _CONTENT_DIGESTS[key] = hashlib.sha256(template_file.read()).hexdigest()
+    return _CONTENT_DIGESTS[key]
+
+
+def _scan_files(root, prefix=""):
+    """Collect all the files below a directory using a single stat per entry.
+
+    Parameters
+    ----------
+    root : str
+        Path to the directory to be scanned.
+    prefix : str
+        Prefix prepended to the relative path of each file.
+
+    Returns
+    -------
+    dict
+        Relative paths using forward slashes as keys and a tuple holding the
+        absolute path, size and modification time as values.
+
+    """
+    files = {}
+    with os.scandir(root) as entries:
+        for entry in entries:
+            relative_path = f"{prefix}{entry.name}"
+            if entry.is_dir():
+                files.update(_scan_files(entry.path, f"{relative_path}/"))
+            else:
+                stat = entry.stat()
+                files[relative_path] = (entry.path, stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _is_glob(pattern):
+    """Check if a path of a manifest contains shell-style wildcards."""
+    return any(char in pattern for char in "*?[")
+
+
+class TemplateOverlay:
+    """Layered view over the license, a template and the common files.
+
+    Each path is resolved against the license first, then against the desired
+    template and finally against the common template. Files are read straight
+    from the installed package, so no intermediate copy of the template is
+    required.
+
+    Files are classified as binary, static or templated the first time they are
+    required. This classification is stored in the cache for each version of
+    the template files.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    license_path : ~pathlib.Path
+        Path to the license template.
+    use_cache : bool
+        Store the properties of the files in the cache. Default is ``True``.
+
+    """
+
+    def __init__(self, template_path, license_path, use_cache=True):
+        """Index the files of each layer."""
+        self.template_path = Path(template_path)
+        self.license_path = Path(license_path)
+        self.use_cache = use_cache
+
+        # Lowest priority layers are collected first so they get overridden
+        common_path = self.template_path / "../common" / PROJECT_DIR_NAME
+        files = {}
+        if common_path.is_dir():
+            files.update(_scan_files(common_path, f"{PROJECT_DIR_NAME}/"))
+        files.update(_scan_files(self.template_path))
+        license_stat = self.license_path.stat()
+        files[f"{PROJECT_DIR_NAME}/LICENSE"] = (
+            str(self.license_path),
+            license_stat.st_size,
+            license_stat.st_mtime_ns,
+        )
+        self._files = dict(sorted(files.items()))
+
+        digest = hashlib.sha256()
+        for relative_path, (path, size, mtime) in self._files.items():
+            digest.update(f"{relative_path}:{_get_content_digest(path, size, mtime)}\n".encode())
+        self.fingerprint = digest.hexdigest()
+        """Fingerprint of the relative path and content of the files of all the layers."""
+
+        self._properties = None
+
+    def __contains__(self, relative_path):
+        """Check if a file exists in any of the layers."""
+        return relative_path in self._files
+
+    @property
+    def files(self):
+        """Relative paths of all the files of the template."""
+        return list(self._files)
+
+    def resolve(self, relative_path):
+        """Return the path of the file providing the given relative path.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path relative to the template root using forward slashes.
+
+        Returns
+        -------
+        ~pathlib.Path
+            Path to the file within the layer providing it.
+
+        """
+        return Path(self._files[relative_path][0])
+
+    def walk(self, directory):
+        """Return the files found below a directory of the template.
+
+        Parameters
+        ----------
+        directory : str
+            Path relative to the template root using forward slashes.
+
+        Returns
+        -------
+        list
+            Paths of the files relative to the given directory.
+
+        """
+        prefix = f"{directory}/"
+        return [path[len(prefix) :] for path in self._files if path.startswith(prefix)]
+
+    def load_manifest(self):
+        """Load the manifest declaring the files of the template.
+
+        The manifest is a JSON file named ``manifest.json`` located next to
+        the ``cookiecutter.json`` file of the template. It lists the paths of
+        the files of the project, relative to the project directory and
+        before rendering, which are always rendered. Files only required for
+        some values of the variables are declared in ``conditional_files``
+        groups, each one holding a Jinja expression in its ``when`` key. Paths
+        may contain shell-style wildcards.
+
+        Returns
+        -------
+        dict or None
+            Content of the manifest or ``None`` if the template does not
+            declare one.
+
+        """
+        manifest_path = self.template_path / MANIFEST_FILE_NAME
+        if not manifest_path.is_file():
+            return None
+        with open(manifest_path, encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def select(self, context, environment):
+        """Return the files of the project declared by the manifest.
+
+        Parameters
+        ----------
+        context : dict
+            Cookiecutter context used to evaluate the conditions.
+        environment : ~jinja2.Environment
+            Environment compiling the conditions.
+
+        Returns
+        -------
+        list
+            Paths of the files relative to the project directory. All the files
+            are returned if the template does not declare a manifest.
+
+        """
+        files = self.walk(PROJECT_DIR_NAME)
+        manifest = self.load_manifest()
+        if manifest is None:
+            return files
+
+        variables = context["cookiecutter"]
+        patterns = list(manifest.get("files", []))
+        for group in manifest.get("conditional_files", []):
+            condition = environment.compile_expression(group["when"])
+            if condition(cookiecutter=variables, **variables):
+                patterns.extend(group["files"])
+
+        exact_paths = {pattern for pattern in patterns if not _is_glob(pattern)}
+        glob_patterns = [pattern for pattern in patterns if _is_glob(pattern)]
+        return [
+            path
+            for path in files
+            if path in exact_paths or any(fnmatchcase(path, glob) for glob in glob_patterns)
+        ]
+
+    def _get_cache_entry(self):
+        """Return the cache entry holding the properties of the files."""
+        key = f"{self.template_path.name}-{self.license_path.name}-{self.fingerprint[:32]}"
+        return get_cache_entry("templates", f"{key}-v{_PROPERTIES_VERSION}.json")
+
+    def _load_properties(self):
+        """Load the properties of the files from the cache or compute them."""
+        entry = self._get_cache_entry()
+        if self.use_cache and entry.is_file():
+            touch_cache_entry(entry)
+            with open(entry, encoding="utf-8") as json_file:
+                return json.load(json_file)
+
+        properties = {
+            relative_path: _classify_file(path)
+            for relative_path, (path, _, _) in self._files.items()
+        }
+
+        if self.use_cache:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp_entry = entry.with_name(f".{entry.name}.{os.getpid()}")
+            with open(tmp_entry, "w", encoding="utf-8") as json_file:
+                json.dump(properties, json_file)
+            os.replace(tmp_entry, entry)
+            record_cache_write(entry.stat().st_size, keep=[entry])
+
+        return properties
+
+    def load_properties(self):
+        """Load the properties of all the files if not loaded yet.
+
+        Properties are read from the cache when available. Otherwise, they are
+        computed and stored in the cache.
+
+        """
+        if self._properties is None:
+            self._properties = self._load_properties()
+
+    def _get_properties(self, relative_path):
+        """Return the properties of a file, loading them if required."""
+        self.load_properties()
+        return self._properties[relative_path]
+
+    def is_binary(self, relative_path):
+        """Check if a file of the template is a binary file.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path relative to the template root using forward slashes.
+
+        Returns
+        -------
+        bool
+            ``True`` if the file is a binary file, ``False`` otherwise.
+
+        """
+        return self.get_kind(relative_path) == BINARY
+
+    def get_kind(self, relative_path):
+        """Return the kind of a file of the template.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path relative to the template root using forward slashes.
+
+        Returns
+        -------
+        str
+            Either ``"binary"``, ``"static"`` or ``"templated"``. Only templated
+            files contain Jinja syntax.
+
+        """
+        return self._get_properties(relative_path)[0]
+
+    def get_newline(self, relative_path):
+        """Return the newline character detected in the first line of a file.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path relative to the template root using forward slashes.
+
+        Returns
+        -------
+        str or None
+            Newline character of the file or ``None`` if it could not be
+            detected.
+
+        """
+        return self._get_properties(relative_path)[1]
+
+
+class OverlayLoader(BaseLoader):
+    """Jinja loader reading the templates from a :class:`TemplateOverlay`.
+
+    Parameters
+    ----------
+    overlay : TemplateOverlay
+        Overlay providing the files.
+    directory : str
+        Directory of the overlay from which template names are resolved.
+
+    """
+
+    def __init__(self, overlay, directory=PROJECT_DIR_NAME):
+        """Initialize the loader."""
+        self.overlay = overlay
+        self.directory = directory
+
+    def get_source(self, environment, template):
+        """Return the source, filename and reload helper of a template."""
+        relative_path = f"{self.directory}/{template}"
+        if relative_path not in self.overlay:
+            raise TemplateNotFound(template)
+
+        path = self.overlay.resolve(relative_path)
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as template_file:
+            source = template_file.read()
+
+        return source, str(path), lambda: os.path.getmtime(path) == mtime
@@ -25,6 +25,8 @@
 import os
 from pathlib import Path
 
+from ansys.templates.registry import get_templates
+
 _PATHS_MODULE = Path(os.path.dirname(os.path.abspath(__file__)))
 
 LICENSES_TEMPLATES_PATH = _PATHS_MODULE / "licenses"
@@ -68,15 +70,6 @@ PYTHON_TEMPLATES_SOLUTION_PATH = PYTHON_TEMPLATES_PATH / "solution"
 
 TEMPLATE_PATH_FINDER = {
     "common": PYTHON_TEMPLATES_COMMON_PATH,
-    "doc-project": PYTHON_TEMPLATES_DOC_PROJECT,
-    "pybasic": PYTHON_TEMPLATES_PYBASIC_PATH,
-    "pyansys": PYTHON_TEMPLATES_PYANSYS_PATH,
-    "pyansys-advanced": PYTHON_TEMPLATES_PYANSYS_ADVANCED_PATH,
-    "pyansys-openapi-client": PYTHON_TEMPLATES_PYANSYS_OPENAPI_CLIENT_PATH,
-    "pyace": PYTHON_TEMPLATES_PYACE_PATH,
-    "pyace-grpc": PYTHON_TEMPLATES_PYACE_GRPC_PATH,
-    "pyace-flask": PYTHON_TEMPLATES_PYACE_FLASK_PATH,
-    "pyace-fast": PYTHON_TEMPLATES_PYACE_FAST_PATH,
-    "solution": PYTHON_TEMPLATES_SOLUTION_PATH,
+    **{template: _PATHS_MODULE / entry["path"] for template, entry in get_templates().items()},
 }
 """A dictionary relating templates names with their paths."""
@@ -0,0 +1,311 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Timing of the phases of a bake."""
+
+import atexit
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+import functools
+import json
+import os
+import threading
+import time
+
+HOOK_SPANS_ENV = "ANSYS_TEMPLATES_PROFILE_SPANS"
+"""Environment variable holding the file receiving the spans of a hook process."""
+
+_ACTIVE_PROFILER = ContextVar("ansys_templates_profiler", default=None)
+"""Profiler recording the spans of the current context, if any."""
+
+
+@dataclass
+class Span:
+    """Timed region of a bake."""
+
+    name: str
+    """Name of the phase."""
+
+    category: str
+    """Category of the phase, like ``"bake"``, ``"file"`` or ``"hook"``."""
+
+    start: int
+    """Start time in nanoseconds, as returned by :func:`time.perf_counter_ns`."""
+
+    duration: int
+    """Elapsed time in nanoseconds."""
+
+    pid: int = field(default_factory=os.getpid)
+    """Identifier of the process running the phase."""
+
+    tid: int = field(default_factory=threading.get_ident)
+    """Identifier of the thread running the phase."""
+
+    args: dict = field(default_factory=dict)
+    """Additional details, like the path of a rendered file."""
+
+
+class Profiler:
+    """Recorder of the spans of one or more bakes.
+
+    Spans are recorded by the functions of ``ansys-templates`` while the
+    profiler is active, see :func:`activate`. Hooks running in a subprocess
+    report their spans to the profiler once they exit.
+
+    """
+
+    def __init__(self):
+        """Initialize an empty profiler."""
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        """Record a span."""
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name, category="bake", **args):
+        """Record the time spent in a block of code.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase.
+        category : str
+            Category of the phase. Default is ``"bake"``.
+        **args : dict
+            Additional details stored with the span.
+
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(Span(name, category, start, time.perf_counter_ns() - start, args=args))
+
+    def to_chrome_trace(self):
+        """Return the spans as Chrome trace events.
+
+        The trace can be opened with ``chrome://tracing`` or
+        https://ui.perfetto.dev.
+
+        Returns
+        -------
+        dict
+            Trace in the JSON object format of the trace event format.
+
+        """
+        origin = min((span.start for span in self.spans), default=0)
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - origin) / 1000,
+                "dur": span.duration / 1000,
+                "pid": span.pid,
+                "tid": span.tid,
+                "args": span.args,
+            }
+            for span in sorted(self.spans, key=lambda span: span.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """Write the spans as Chrome trace events into a JSON file.
+
+        Parameters
+        ----------
+        path : str or ~pathlib.Path
+            Path to the output file.
+
+        """
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(self.to_chrome_trace(), json_file)
+
+    def summary(self, top=10):
+        """Return a table with the time spent in each phase.
+
+        Parameters
+        ----------
+        top : int
+            Number of slowest rendered files listed after the phases. Default
+            is ``10``.
+
+        Returns
+        -------
+        str
+            Number of calls, total time and share of the elapsed time of each
+            phase, followed by the render time of the slowest files.
+
+        """
+        if not self.spans:
+            return "No spans recorded."
+
+        elapsed = max(span.start + span.duration for span in self.spans) - min(
+            span.start for span in self.spans
+        )
+        phases = {}
+        for span in self.spans:
+            calls, total = phases.get(span.name, (0, 0))
+            phases[span.name] = (calls + 1, total + span.duration)
+
+        lines = [f"{'Phase':<30} {'Calls':>6} {'Total (ms)':>11} {'Share':>7}"]
+        for name, (calls, total) in sorted(phases.items(), key=lambda item: -item[1][1]):
+            share = 100 * total / elapsed if elapsed else 0
+            lines.append(f"{name:<30} {calls:>6} {total / 1e6:>11.2f} {share:>6.1f}%")
+
+        files = sorted(
+            (span for span in self.spans if span.category == "file"),
+            key=lambda span: -span.duration,
+        )
+        if files:
+            lines.extend(["", f"Slowest {min(top, len(files))} rendered files"])
+            for span in files[:top]:
+                lines.append(f"{span.duration / 1e6:>11.2f} ms  {span.args.get('path', '')}")
+
+        return "\n".join(lines)
+
+
+def get_profiler():
+    """Return the profiler recording the spans of the current context, if any."""
+    return _ACTIVE_PROFILER.get() or _HOOK_PROFILER
+
+
+@contextmanager
+def activate(profiler):
+    """Record the spans of the enclosed code with a profiler.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        Profiler receiving the spans.
+
+    """
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+
+
+def span(name, category="bake", **args):
+    """Record the time spent in a block of code if a profiler is active.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase.
+    category : str
+        Category of the phase. Default is ``"bake"``.
+    **args : dict
+        Additional details stored with the span.
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+        Context manager timing the block, doing nothing if no profiler is
+        active.
+
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, category, **args)
+
+
+def profiled(name, category="hook"):
+    """Record the time spent in each call of the decorated function.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase.
+    category : str
+        Category of the phase. Default is ``"hook"``.
+
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_hook_spans(profiler):
+    """Collect the spans recorded by the hook processes started in the block.
+
+    The path of a temporary file is exposed to the hook processes through the
+    :data:`HOOK_SPANS_ENV` environment variable. Each process appends its spans
+    to this file when it exits.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        Profiler receiving the spans of the hooks.
+
+    """
+    import tempfile
+
+    descriptor, spans_path = tempfile.mkstemp(prefix="ansys-templates-", suffix=".jsonl")
+    os.close(descriptor)
+    previous_value = os.environ.get(HOOK_SPANS_ENV)
+    os.environ[HOOK_SPANS_ENV] = spans_path
+    try:
+        yield
+    finally:
+        if previous_value is None:
+            del os.environ[HOOK_SPANS_ENV]
+        else:
+            os.environ[HOOK_SPANS_ENV] = previous_value
+        with open(spans_path, encoding="utf-8") as spans_file:
+            for line in spans_file:
+                profiler.add(Span(**json.loads(line)))
+        os.remove(spans_path)
+
+
+def _dump_hook_spans(profiler, spans_path):
+    """Append the spans of the current hook process to a file."""
+    with open(spans_path, "a", encoding="utf-8") as spans_file:
+        for recorded_span in profiler.spans:
+            spans_file.write(json.dumps(asdict(recorded_span)) + "\n")
+
+
+def _start_hook_profiler(spans_path):
+    """Profile the current hook process and report its spans when it exits."""
+    profiler = Profiler()
+    atexit.register(_dump_hook_spans, profiler, spans_path)
+    return profiler
+
+
+_HOOK_PROFILER = (
+    _start_hook_profiler(os.environ[HOOK_SPANS_ENV]) if os.environ.get(HOOK_SPANS_ENV) else None
+)
+"""Profiler of the current process if it runs a hook of a profiled bake."""
@@ -0,0 +1,69 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Pytest plugin providing projects baked once per test session.
+
+The plugin is registered through the ``pytest11`` entry point of the package,
+so its fixtures are available to any test suite once ``ansys-templates`` is
+installed.
+
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def baked_project_cache(tmp_path_factory):
+    """Cache of the projects baked during the test session.
+
+    Workers of ``pytest-xdist`` share the same cache, so each project is baked
+    only once for the whole session.
+
+    """
+    from ansys.templates.testing import BakedProjectCache
+
+    base_path = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        base_path = base_path.parent
+    return BakedProjectCache(base_path / "ansys-templates-projects")
+
+
+@pytest.fixture
+def baked_project(baked_project_cache, tmp_path):
+    """Return a function providing a project baked from a template.
+
+    The function expects the name or the path of a template and, optionally,
+    the variables overriding its default ones. It returns the path to a clone
+    of the project within the temporary directory of the test. The files of
+    the clone are read-only unless ``writable=True`` is given. They are copies,
+    so modifying them never affects the other tests.
+
+    """
+    from ansys.templates.paths import TEMPLATE_PATH_FINDER
+
+    def bake(template, context=None, writable=False):
+        template_path = TEMPLATE_PATH_FINDER.get(template, template)
+        return baked_project_cache.clone(template_path, tmp_path, context, writable=writable)
+
+    return bake
@@ -3,9 +3,7 @@ import os
 import shutil
 from pathlib import Path
 
-import isort
-
-from ansys.templates.utils import keep_files
+from ansys.templates.utils import keep_files, sort_imports
 
 DESIRED_STRUCTURE = [
     "AUTHORS",
@@ -50,17 +48,16 @@ DESIRED_STRUCTURE = [
     "src/stubs/__init__.py",
     "tests/test_metadata.py",
     "tox.ini",
-    "protobufs/pingerserver.proto",
     "tests/test_server.py",
     "tests/conftest.py"
 ]
 """A list holding all desired files to be included in the project."""
 
 
-def main():
-    """Entry point of the script."""
+def main(project_path=None):
+    """Entry point of the script, run from the baked project unless a path is given."""
     # Get baked project location path
-    project_path = Path(os.getcwd())
+    project_path = Path(project_path or os.getcwd())
 
     # Move all requirements files into a requirements/ directory
     os.mkdir(project_path / "requirements")
@@ -70,16 +67,13 @@ def main():
     for file in requirements_files:
         shutil.move(str(project_path / file), str(project_path / "requirements"))
 
-    # Apply isort with desired config
-    isort_config = isort.settings.Config(
+    # Sort the imports of the Python files with the desired config
+    sort_imports(
+        [project_path / "doc/source/conf.py"],
+        project_path,
         line_length="{{ cookiecutter.__max_linelength }}",
-        profile="black",
+        use_cache={{ cookiecutter._use_cache }},
     )
-    filepaths_list = [
-        project_path / "doc/source/conf.py",
-    ]
-    for filepath in filepaths_list:
-        isort.api.sort_file(filepath, isort_config)
 
     # Remove ci/cd non-desired  files
     ci_cd = "{{ cookiecutter.ci_cd_platform }}"
@@ -105,7 +99,7 @@ def main():
         DESIRED_STRUCTURE.append(".dockerignore")
 
     # Remove non-desired files
-    keep_files(DESIRED_STRUCTURE)
+    keep_files(DESIRED_STRUCTURE, project_path)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 from ansys.templates.utils import keep_files
 
 DESIRED_STRUCTURE = [
@@ -38,10 +41,12 @@ DESIRED_STRUCTURE = [
 """A list holding all desired files to be included in the project."""
 
 
-def main():
-    """Entry point of the script."""
+def main(project_path=None):
+    """Entry point of the script, run from the baked project unless a path is given."""
+    project_path = Path(project_path or os.getcwd())
+
     # Apply the desired structure to the project
-    keep_files(DESIRED_STRUCTURE)
+    keep_files(DESIRED_STRUCTURE, project_path)
 
 if __name__ == "__main__":
     main()
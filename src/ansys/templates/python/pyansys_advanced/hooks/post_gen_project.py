@@ -1,11 +1,8 @@
 """Post-processing script for cleaning the raw rendered project."""
 import os
-import shutil
 from pathlib import Path
 
-import isort
-
-from ansys.templates.utils import keep_files, remove_file
+from ansys.templates.utils import keep_files, sort_imports
 
 ALLOWED_BUILD_SYSTEMS = ["flit", "poetry", "setuptools"]
 """A list of all allowed build systems by the template."""
@@ -49,44 +46,26 @@ DESIRED_STRUCTURE = [
 ]
 """A list holding all desired files to be included in the project."""
 
-def main():
-    """Entry point of the script."""
+def main(project_path=None):
+    """Entry point of the script, run from the baked project unless a path is given."""
     # Get baked project location path
-    project_path = Path(os.getcwd())
+    project_path = Path(project_path or os.getcwd())
 
     # Get the desired build system
     build_system = "{{ cookiecutter.build_system }}"
 
-    # Move all requirements files into a requirements/ directory
-    requirements_files = [
-        f"requirements_{name}.txt" for name in ["build", "doc", "tests"]
-    ]
-    if build_system == "poetry":
-        # Poetry required and extra dependencies are collected inside the
-        # 'pyproject.toml' file. Thus, there is no need to have requirements
-        # files
-        for file in requirements_files:
-            remove_file(file, project_path)
-    else:
-        os.mkdir(project_path / "requirements")
-        for file in requirements_files:
-            shutil.move(str(project_path / file), str(project_path / "requirements"))
-
-    # Apply isort with desired config
-    isort_config = isort.settings.Config(
+    # Sort the imports of the Python files with the desired config
+    sort_imports(
+        [project_path / "doc/source/conf.py"],
+        project_path,
         line_length="{{ cookiecutter.__max_linelength }}",
-        profile="black",
+        use_cache={{ cookiecutter._use_cache }},
     )
-    filepaths_list = [
-        project_path / "doc/source/conf.py",
-    ]
-    for filepath in filepaths_list:
-        isort.api.sort_file(filepath, isort_config)
 
     # Remove non-desired files
     if build_system == "setuptools":
         DESIRED_STRUCTURE.append("setup.py")
-    keep_files(DESIRED_STRUCTURE)
+    keep_files(DESIRED_STRUCTURE, project_path)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from ansys.templates.utils import keep_files, rename_files
 import shutil
 import os
+from pathlib import Path
 
 DESIRED_STRUCTURE = [
     ".devcontainer/devcontainer.json",
@@ -33,8 +34,6 @@ DESIRED_STRUCTURE = [
     "doc/make.bat",
     "doc/Makefile",
     "examples/README.md",
-    "lock_files/awc/poetry.lock",
-    "lock_files/dash/poetry.lock",
     f"src/ansys/solutions/{{ cookiecutter.__solution_name_slug }}/datamodel/README.md",
     f"src/ansys/solutions/{{ cookiecutter.__solution_name_slug }}/logic/assets/README.md",
     f"src/ansys/solutions/{{ cookiecutter.__solution_name_slug }}/logic/README.md",
@@ -73,7 +72,6 @@ DESIRED_STRUCTURE = [
     "CONTRIBUTING.md",
     "CONTRIBUTORS.md",
     "LICENSE.rst",
-    "poetry.lock",
     "pyproject.toml",
     "README.md",
     "setup_environment.py",
@@ -117,24 +115,24 @@ AWC_UI_STRUCTURE = [
 
 # Add UI structure to desired structure if applicable
 if "{{ cookiecutter.__frontend_type }}" == "dash":
-    DESIRED_STRUCTURE = DESIRED_STRUCTURE + UI_STRUCTURE
+    DESIRED_STRUCTURE = DESIRED_STRUCTURE + UI_STRUCTURE + ["lock_files/dash/poetry.lock"]
 elif "{{ cookiecutter.__frontend_type }}" == "awc-dash":
-    DESIRED_STRUCTURE = DESIRED_STRUCTURE + AWC_UI_STRUCTURE
-if "{{ cookiecutter.__frontend_type }}" != "dash":
-    DESIRED_STRUCTURE.remove("poetry.lock")
+    DESIRED_STRUCTURE = DESIRED_STRUCTURE + AWC_UI_STRUCTURE + ["lock_files/awc/poetry.lock"]
 
 
-def main():
-    """Entry point of the script."""
+def main(project_path=None):
+    """Entry point of the script, run from the baked project unless a path is given."""
+    project_path = Path(project_path or os.getcwd())
+
     # Apply the desired structure to the project
-    keep_files(DESIRED_STRUCTURE)
+    keep_files(DESIRED_STRUCTURE, project_path)
     if "{{ cookiecutter.__frontend_type }}" == "awc-dash":
         combined_structure = list(zip(AWC_UI_STRUCTURE, UI_STRUCTURE))
-        rename_files(combined_structure)
-        shutil.copy(os.path.join("lock_files", "awc", "poetry.lock"), ".")
+        rename_files(combined_structure, project_path)
+        shutil.copy(project_path / "lock_files" / "awc" / "poetry.lock", project_path)
     elif "{{ cookiecutter.__frontend_type }}" == "dash":
-        shutil.copy(os.path.join("lock_files", "dash", "poetry.lock"), ".")
-    shutil.rmtree("lock_files")
+        shutil.copy(project_path / "lock_files" / "dash" / "poetry.lock", project_path)
+    shutil.rmtree(project_path / "lock_files", ignore_errors=True)
 
 if __name__ == "__main__":
     main()
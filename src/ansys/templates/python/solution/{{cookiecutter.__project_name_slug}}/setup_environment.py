@@ -57,6 +57,16 @@ To reinstall all dependencies by deleting venvs, local poetry cache and lock fil
 used only if REALLY necessary as the installation time for the whole process will be quite long.
     ``python setup_environment.py -F``
 
+Skipping unchanged steps
+------------------------
+
+Each step records a fingerprint of its inputs in the ``.poetry/setup_environment_state.json`` file once it succeeds.
+The inputs are the hashes of ``pyproject.toml``, ``poetry.lock`` and ``.env`` files, the installed dependency group
+and the Python version, depending on the step. A step is skipped if its inputs did not change since it last succeeded
+and what it creates, like the virtual environment, still exists. Running the script again without any change is then
+almost instantaneous. Dependencies are installed again whenever the virtual environment is created again. The ``-f``
+and ``-F`` options delete the state file, so all the steps run again.
+
 Private sources
 ---------------
 
@@ -92,6 +102,9 @@ Given its size and its scope, this script will be refactored and transformed int
 # ==================================================== [Imports] ==================================================== #
 
 import argparse
+import fnmatch
+import hashlib
+import json
 import os
 from pathlib import Path
 import platform
@@ -138,9 +151,16 @@ DEPENDENCY_MANAGER_PATHS = {
         "lock_file": "poetry.lock",
         "build_system_venv": Path(".poetry") / ".venv",
         "cache_folder": Path(".poetry").absolute() / ".cache",
+        "state_file": Path(".poetry").absolute() / "setup_environment_state.json",
     },
 }
 
+STATE_VERSION = 1
+"""Version of the layout of the state file."""
+
+VENV_DEPENDENT_STEPS = ("group-*", "lock", "dotnet")
+"""Steps which must run again once the virtual environment is created."""
+
 configuration = toml.load(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"])
 STANDARD_OPTIONAL_DEPENDENCY_GROUPS = []
 if "group" in configuration["tool"]["poetry"].keys():
@@ -533,15 +553,23 @@ def get_python_package_versions(
         return extract_substring_between_markers(process.stderr, "(from versions:", ")").replace(" ", "").split(",")
 
 
-def create_virtual_environment(args: object, venv: str = ".venv") -> None:
-    """Create a virtual environment."""
+def create_virtual_environment(
+    args: object, venv: str = ".venv", step: str = "venv", python_executable: str = None
+) -> None:
+    """Create a virtual environment unless it exists with the same Python version."""
     print("Create virtual environment")
-    if not args.has_install or args.force_clear or args.force_clear_all:
+    python_executable = python_executable or DEPENDENCY_MANAGER_PATHS[sys.platform]["python_executable"]
+    fingerprint = compute_fingerprint(get_python_version(), str(venv))
+    if not is_step_up_to_date(args, step, fingerprint, outputs=[python_executable]):
         if sys.platform == "linux":
             subprocess.run([sys.executable, "-m", "pip", "install", "virtualenv"], check=True)
         subprocess.run(
             [sys.executable, "-m", "venv", venv], check=True, shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"]
         )
+        if step == "venv":
+            # Whatever was installed in a previous environment is gone, even if its fingerprint is unchanged
+            forget_steps(args, VENV_DEPENDENT_STEPS)
+        record_step(args, step, fingerprint)
     else:
         print("Skipped")
     print()
@@ -578,6 +606,82 @@ def is_virtual_environment():
     return sys.prefix != sys.base_prefix
 
 
+# State -------------------------------------------------------------------------------------------------------------
+
+
+def hash_file(file_path: str) -> str:
+    """Return the SHA-256 digest of the content of a file, or an empty string if it does not exist."""
+    if not os.path.isfile(file_path):
+        return ""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_fingerprint(*inputs: object) -> str:
+    """Return a digest of the inputs of a step."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_state() -> dict:
+    """Load the fingerprints of the steps which succeeded during previous runs."""
+    state_file = DEPENDENCY_MANAGER_PATHS["common"]["state_file"]
+    try:
+        with open(state_file) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("steps", {})
+
+
+def save_state(state: dict) -> None:
+    """Write the fingerprints of the steps which succeeded."""
+    state_file = DEPENDENCY_MANAGER_PATHS["common"]["state_file"]
+    os.makedirs(state_file.parent, exist_ok=True)
+    temporary_file = state_file.with_name(f".{state_file.name}.tmp")
+    with open(temporary_file, "w") as file:
+        json.dump({"version": STATE_VERSION, "steps": state}, file, indent=2)
+    os.replace(temporary_file, state_file)
+
+
+def is_step_up_to_date(args: object, step: str, fingerprint: str, outputs: list = ()) -> bool:
+    """Check if a step already succeeded with the same inputs and if its outputs still exist."""
+    if args.force_clear or args.force_clear_all:
+        return False
+    if args.state.get(step) != fingerprint:
+        return False
+    return all(os.path.exists(output) for output in outputs)
+
+
+def record_step(args: object, step: str, fingerprint: str) -> None:
+    """Record that a step succeeded with the given inputs."""
+    args.state[step] = fingerprint
+    save_state(args.state)
+
+
+def forget_steps(args: object, patterns: tuple) -> None:
+    """Forget the steps whose name matches one of the given shell-style patterns."""
+    forgotten_steps = [step for step in args.state if any(fnmatch.fnmatchcase(step, pattern) for pattern in patterns)]
+    for step in forgotten_steps:
+        del args.state[step]
+    if forgotten_steps:
+        save_state(args.state)
+
+
+def get_install_fingerprint(*inputs: object) -> str:
+    """Return the fingerprint of a step installing dependencies."""
+    return compute_fingerprint(
+        get_python_version(),
+        hash_file(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"]),
+        hash_file(DEPENDENCY_MANAGER_PATHS["common"]["lock_file"]),
+        *inputs,
+    )
+
+
 # Dependency Management System (Build System) -----------------------------------------------------------------------
 
 
@@ -607,6 +711,8 @@ def get_sign_from_python_specification(specification: str) -> str:
 
 def get_build_system_version(args: object) -> str:
     """Assign build system version."""
+    # The requested version identifies the install, as the latest version depends on when it is resolved
+    args.requested_build_system_version = args.build_system_version
     if not args.has_install or args.force_clear or args.force_clear_all:
         configuration = toml.load(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"])
         if "build-system-requirements" in configuration.keys():
@@ -622,12 +728,21 @@ def get_build_system_version(args: object) -> str:
 def install_build_system(args: object) -> None:
     """Install build system."""
     print("Install dependency management system.")
-    if not args.has_install or args.force_clear or args.force_clear_all:
-        configuration = toml.load(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"])
-        if args.build_system_version == "*" and "build-system-version" in configuration["build-system-requirements"]:
-            args.build_system_version = configuration["build-system-requirements"]["build-system-version"]
-
-        create_virtual_environment(args, venv=DEPENDENCY_MANAGER_PATHS["common"]["build_system_venv"])
+    configuration = toml.load(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"])
+    pinned_version = configuration.get("build-system-requirements", {}).get("build-system-version")
+    if args.build_system_version == "*" and pinned_version:
+        args.build_system_version = pinned_version
+
+    fingerprint = compute_fingerprint(get_python_version(), args.requested_build_system_version, pinned_version)
+    build_system_executable = DEPENDENCY_MANAGER_PATHS[sys.platform]["build_sys_exec"]
+    outputs = [build_system_executable, DEPENDENCY_MANAGER_PATHS[sys.platform]["dep_bin_venv_path"]]
+    if not is_step_up_to_date(args, "poetry", fingerprint, outputs=outputs):
+        create_virtual_environment(
+            args,
+            venv=DEPENDENCY_MANAGER_PATHS["common"]["build_system_venv"],
+            step="poetry-venv",
+            python_executable=DEPENDENCY_MANAGER_PATHS[sys.platform]["poetry_python_executable"],
+        )
         get_python_package(
             args.build_system_version,
             method="install",
@@ -637,7 +752,6 @@ def install_build_system(args: object) -> None:
         # Create a file symbolic link from the virtual environment (.venv) that the build system (poetry) manages
         # to the build system executable (poetry.exe) in the poetry virtual environment (.poetry/.venv).  This
         # ensures that the correct poetry is accessible when the managed virtual environment is activated
-        build_system_executable = DEPENDENCY_MANAGER_PATHS[sys.platform]["build_sys_exec"]
         if os.path.exists(build_system_executable):
             if sys.platform == "win32":
                 subprocess.run(
@@ -662,6 +776,7 @@ def install_build_system(args: object) -> None:
                         DEPENDENCY_MANAGER_PATHS[sys.platform]["dep_bin_venv_path"],
                     ]
                 )
+        record_step(args, "poetry", fingerprint)
         return
     print("Skipped")
     print()
@@ -670,13 +785,23 @@ def install_build_system(args: object) -> None:
 def configure_build_system(args: object) -> None:
     """Configure the build system to enable connection to private sources."""
     print("Configure dependency management system.")
-    if not args.has_install or args.force_clear or args.force_clear_all:
+    fingerprint = compute_fingerprint(
+        hash_file(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"]),
+        hash_file(args.env),
+        args.credentials_management_method,
+        args.disable_modern_installation,
+        bool(args.local_wheels),
+    )
+    # Credentials stored in environment variables only live as long as this process, so they are always declared
+    always_configure = args.credentials_management_method == "environment-variables"
+    if always_configure or not is_step_up_to_date(args, "config", fingerprint, outputs=["poetry.toml"]):
         configure_poetry(
             DEPENDENCY_MANAGER_PATHS["common"]["build_system_venv"],
             args.credentials_management_method,
             modern_installation=not args.disable_modern_installation,
             use_private_sources=not bool(args.local_wheels),
         )
+        record_step(args, "config", fingerprint)
         print()
         return
     print("Skipped")
@@ -888,6 +1013,11 @@ def clear_workspace(args: object) -> None:
         if os.path.isdir(DEPENDENCY_MANAGER_PATHS["common"]["cache_folder"]):
             print("Delete existing poetry cache")
             shutil.rmtree(DEPENDENCY_MANAGER_PATHS["common"]["cache_folder"])
+        # Remove the fingerprints of the previous runs
+        if os.path.isfile(DEPENDENCY_MANAGER_PATHS["common"]["state_file"]):
+            print("Delete existing setup state")
+            os.remove(DEPENDENCY_MANAGER_PATHS["common"]["state_file"])
+        args.state = {}
         if args.force_clear_all:
             # Remove lock file
             if DEPENDENCY_MANAGER_PATHS["common"]["lock_file"]:
@@ -905,6 +1035,12 @@ def update_lock_file_to_consider_local_wheels(args: object) -> None:
         return
 
     print("Adapting lock file to consider local wheels.")
+    # The lock file is part of the inputs, so the fingerprint recorded after adapting it matches the next runs
+    fingerprint = get_install_fingerprint(sorted(os.listdir(args.local_wheels)))
+    if is_step_up_to_date(args, "lock", fingerprint):
+        print("Skipped")
+        print()
+        return
     subprocess.run(
         [
             DEPENDENCY_MANAGER_PATHS[sys.platform]["build_sys_exec"],
@@ -914,12 +1050,15 @@ def update_lock_file_to_consider_local_wheels(args: object) -> None:
         check=True,
         shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"],
     )
+    record_step(args, "lock", get_install_fingerprint(sorted(os.listdir(args.local_wheels))))
 
 
 def install_production_dependencies(args: object) -> None:
     """Install the package (mandatory requirements only)."""
     print("Install production dependencies")
-    if "run" in args.dependencies:
+    fingerprint = get_install_fingerprint("run")
+    outputs = [DEPENDENCY_MANAGER_PATHS[sys.platform]["python_executable"]]
+    if "run" in args.dependencies and not is_step_up_to_date(args, "group-run", fingerprint, outputs=outputs):
         subprocess.run(
             [
                 DEPENDENCY_MANAGER_PATHS[sys.platform]["build_sys_exec"],
@@ -929,6 +1068,8 @@ def install_production_dependencies(args: object) -> None:
             check=True,
             shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"],
         )
+        # The install may create or update the lock file, which is part of the fingerprint
+        record_step(args, "group-run", get_install_fingerprint("run"))
         print()
         return
     print("Skipped")
@@ -939,9 +1080,17 @@ def install_optional_dependencies(args: object) -> None:
     """Install optional requirements (doc, tests, build or style)."""
     # Load configuration file
     configuration = toml.load(DEPENDENCY_MANAGER_PATHS["common"]["configuration_file"])
+    outputs = [DEPENDENCY_MANAGER_PATHS[sys.platform]["python_executable"]]
     # Install standard optional dependency groups
     for dependency_group in STANDARD_OPTIONAL_DEPENDENCY_GROUPS:
         print(f"Install {dependency_group} dependencies")
+        requirements_file = os.path.join("requirements", f"requirements_{dependency_group}.txt")
+        step = f"group-{dependency_group}"
+        fingerprint = get_install_fingerprint(dependency_group, hash_file(requirements_file))
+        if dependency_group in args.dependencies and is_step_up_to_date(args, step, fingerprint, outputs=outputs):
+            print("Skipped")
+            print()
+            continue
         if dependency_group in args.dependencies:
             # Install dependency group in the configuration file of the build system
             has_dependency_group = check_dependency_group(dependency_group, configuration)
@@ -958,10 +1107,10 @@ def install_optional_dependencies(args: object) -> None:
                     check=True,
                     shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"],
                 )
+                record_step(args, step, get_install_fingerprint(dependency_group, hash_file(requirements_file)))
                 print()
                 continue
             # Alternatively search dependency group in the requirements folder
-            requirements_file = os.path.join("requirements", f"requirements_{dependency_group}.txt")
             if os.path.exists(requirements_file):
                 print("Installing from requirements file.")
                 subprocess.run(
@@ -979,6 +1128,7 @@ def install_optional_dependencies(args: object) -> None:
                     check=True,
                     shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"],
                 )
+                record_step(args, step, get_install_fingerprint(dependency_group, hash_file(requirements_file)))
                 print()
                 continue
         print("Skipped")
@@ -987,8 +1137,12 @@ def install_optional_dependencies(args: object) -> None:
     if args.extra_dependencies:
         for dependency_group in args.extra_dependencies:
             print(f"Install {dependency_group} dependencies")
+            step = f"group-{dependency_group}"
+            fingerprint = get_install_fingerprint(dependency_group)
             has_dependency_group = check_dependency_group(dependency_group, configuration)
-            if has_dependency_group:
+            if has_dependency_group and is_step_up_to_date(args, step, fingerprint, outputs=outputs):
+                print("Skipped")
+            elif has_dependency_group:
                 subprocess.run(
                     [
                         DEPENDENCY_MANAGER_PATHS[sys.platform]["build_sys_exec"],
@@ -1000,16 +1154,25 @@ def install_optional_dependencies(args: object) -> None:
                     check=True,
                     shell=DEPENDENCY_MANAGER_PATHS[sys.platform]["shell"],
                 )
+                record_step(args, step, get_install_fingerprint(dependency_group))
             else:
                 print(f"No dependency group named {dependency_group}.")
                 print("Skipped")
             print()
 
 
-def install_dotnet_linux_dependencies():
+def install_dotnet_linux_dependencies(args: object) -> None:
     """Install .NET for Linux."""
     print("Install dotnet dependencies")
-    if sys.platform == "linux":
+    # The activation script of the virtual environment is modified by the install, so it is hashed once installed
+    activate_script = Path(args.venv_name) / "bin" / "activate"
+    dotnet_root = Path("/home") / os.environ.get("USER", "") / ".dotnet"
+    if sys.platform == "linux" and is_step_up_to_date(
+        args, "dotnet", compute_fingerprint("8.0.8", hash_file(activate_script)), outputs=[dotnet_root]
+    ):
+        print("Skipped")
+        print()
+    elif sys.platform == "linux":
         subprocess.run(
             """
             set -xe \
@@ -1026,6 +1189,7 @@ def install_dotnet_linux_dependencies():
             check=True,
             shell=True,
         )
+        record_step(args, "dotnet", compute_fingerprint("8.0.8", hash_file(activate_script)))
 
 
 def main() -> None:
@@ -1052,6 +1216,9 @@ def main() -> None:
     # Check inputs consistency
     check_inputs(args)
 
+    # Load the fingerprints of the steps which succeeded during previous runs
+    args.state = load_state()
+
     modify_toml_file_in_case_of_wheel_files(args)
 
     # Update build system version
@@ -1093,7 +1260,7 @@ def main() -> None:
 
     install_optional_dependencies(args)
 
-    install_dotnet_linux_dependencies()
+    install_dotnet_linux_dependencies(args)
 
     # Back to current working directory
     os.chdir(working_directory)
@@ -0,0 +1,252 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Index of the available templates, generated from the template files.
+
+The registry holds the name, description and variables of each template. It is generated with ``python -m ansys.templates.registry`` and
+shipped with the package, so no template directory needs to be read for
+listing the templates or for looking up their variables.
+
+"""
+
+import argparse
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import sys
+
+_PACKAGE_PATH = Path(os.path.dirname(os.path.abspath(__file__)))
+
+REGISTRY_PATH = _PACKAGE_PATH / "registry.json"
+"""Path to the registry shipped with the package."""
+
+REGISTRY_VERSION = 2
+"""Version of the layout of the registry."""
+
+
+@lru_cache(maxsize=None)
+def load_registry(registry_path=REGISTRY_PATH):
+    """
+    Load the registry of the templates.
+
+    The registry is read only once per process.
+
+    Parameters
+    ----------
+    registry_path : ~pathlib.Path
+        Path to the registry. Default is the registry shipped with the package.
+
+    Returns
+    -------
+    dict
+        Content of the registry.
+
+    Raises
+    ------
+    ValueError
+        If the registry was generated with another version of its layout.
+
+    """
+    with open(registry_path, encoding="utf-8") as json_file:
+        registry = json.load(json_file)
+
+    if registry.get("version") != REGISTRY_VERSION:
+        raise ValueError(
+            f"Unsupported registry version {registry.get('version')!r} in '{registry_path}'. "
+            "Regenerate it with 'python -m ansys.templates.registry'."
+        )
+
+    return registry
+
+
+def get_templates():
+    """
+    Return the entries of all the templates of the registry.
+
+    Returns
+    -------
+    dict
+        Names of the templates as keys and their entries as values. Each entry
+        holds the ``path`` of the template relative to the package, its
+        ``description``, the default value of its public ``variables`` and the
+        ``choices`` of the variables accepting a list of values.
+
+    """
+    return load_registry()["templates"]
+
+
+def find_template(template_path):
+    """
+    Return the entry of the registry describing a template directory.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+
+    Returns
+    -------
+    dict or None
+        Entry of the template or ``None`` if the template is not part of the
+        package.
+
+    """
+    try:
+        relative_path = Path(template_path).resolve().relative_to(_PACKAGE_PATH.resolve())
+    except ValueError:
+        return None
+
+    for entry in get_templates().values():
+        if entry["path"] == relative_path.as_posix():
+            return entry
+    return None
+
+
+def validate_context(template, context):
+    """
+    Check the variables of a context against the ones of a template.
+
+    Parameters
+    ----------
+    template : str
+        Name of the template.
+    context : dict
+        Variables overriding the default ones of the template.
+
+    Raises
+    ------
+    ValueError
+        If a public variable is not declared by the template or if the value of
+        a variable is not one of its choices.
+
+    """
+    entry = get_templates()[template]
+    for name, value in context.items():
+        if name.startswith("_"):
+            continue
+        if name not in entry["variables"]:
+            raise ValueError(f"Unknown variable '{name}' for template '{template}'.")
+        choices = entry["choices"].get(name)
+        if choices is not None and value not in choices:
+            raise ValueError(
+                f"Invalid value {value!r} for variable '{name}' of template '{template}'. "
+                f"Expected one of {choices}."
+            )
+
+
+def build_registry():
+    """
+    Build the registry from the template files of the package.
+
+    Templates are found through their ``manifest.json`` file, which declares
+    their name, description and the position in which they are listed. The
+    files of the templates are not indexed, as they are read and fingerprinted
+    by :class:`~ansys.templates.overlay.TemplateOverlay` when baking.
+
+    Returns
+    -------
+    dict
+        Content of the registry.
+
+    """
+    # Only required for building the registry, not for reading it
+    from ansys.templates.overlay import MANIFEST_FILE_NAME
+
+    templates, positions = {}, {}
+    for manifest_path in sorted(_PACKAGE_PATH.glob(f"*/*/{MANIFEST_FILE_NAME}")):
+        template_path = manifest_path.parent
+        with open(manifest_path, encoding="utf-8") as json_file:
+            manifest = json.load(json_file)
+        with open(template_path / "cookiecutter.json", encoding="utf-8") as json_file:
+            configuration = json.load(json_file)
+
+        variables, choices = {}, {}
+        for name, value in configuration.items():
+            if name.startswith("_"):
+                continue
+            if isinstance(value, list):
+                choices[name] = value
+                value = value[0]
+            variables[name] = value
+
+        positions[manifest["name"]] = manifest.get("order", float("inf"))
+        templates[manifest["name"]] = {
+            "path": template_path.relative_to(_PACKAGE_PATH).as_posix(),
+            "description": manifest["description"],
+            "variables": variables,
+            "choices": choices,
+        }
+
+    # Templates are listed in the order declared by their manifest, then by name
+    templates = dict(sorted(templates.items(), key=lambda item: (positions[item[0]], item[0])))
+    return {"version": REGISTRY_VERSION, "templates": templates}
+
+
+def write_registry(registry, registry_path=REGISTRY_PATH):
+    """
+    Write a registry to a JSON file.
+
+    Parameters
+    ----------
+    registry : dict
+        Content of the registry.
+    registry_path : ~pathlib.Path
+        Path to the output file. Default is the registry shipped with the
+        package.
+
+    """
+    with open(registry_path, "w", encoding="utf-8", newline="\n") as json_file:
+        json.dump(registry, json_file, indent=2, ensure_ascii=False)
+        json_file.write("\n")
+
+
+def main(argv=None):
+    """Regenerate the registry or check that it is up to date."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ansys.templates.registry",
+        description="Generate the registry of the templates shipped with the package.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with an error if the registry is outdated instead of regenerating it.",
+    )
+    args = parser.parse_args(argv)
+
+    registry = build_registry()
+    if args.check:
+        if registry != load_registry():
+            print(
+                f"The registry '{REGISTRY_PATH}' is outdated. "
+                "Regenerate it with 'python -m ansys.templates.registry'.",
+                file=sys.stderr,
+            )
+            return 1
+        return 0
+
+    write_registry(registry)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
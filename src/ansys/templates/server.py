@@ -0,0 +1,477 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""A local service baking projects from templates kept in memory."""
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from cookiecutter.generate import generate_context, is_copy_only_path
+
+from ansys.templates.archive import ARCHIVE_FORMATS, write_archive
+from ansys.templates.licenses import MIT_LICENSE
+from ansys.templates.overlay import PROJECT_DIR_NAME, TEMPLATED, TemplateOverlay
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+from ansys.templates.registry import get_templates, validate_context
+from ansys.templates.update import write_record
+from ansys.templates.utils import (
+    _generate_context,
+    _get_project_path,
+    create_environment,
+    generate_files,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+"""Address the service listens to by default. Only local clients are accepted."""
+
+DEFAULT_PORT = 8765
+"""Port the service listens to by default."""
+
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+"""Host names always accepted in the ``Host`` and ``Origin`` headers of a request."""
+
+_CONTENT_TYPES = {
+    "zip": "application/zip",
+    "tar": "application/x-tar",
+    "gztar": "application/gzip",
+    "bztar": "application/x-bzip2",
+    "xztar": "application/x-xz",
+}
+"""Content type of each format of archive."""
+
+
+def _get_hostname(url):
+    """Return the lowercase host name of a URL, or ``None`` if it is not valid."""
+    try:
+        return urlsplit(url).hostname
+    except ValueError:
+        return None
+
+
+class BakeError(Exception):
+    """Error answered to a client with an HTTP status."""
+
+    def __init__(self, status, message):
+        """Store the status and the message of the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class BakeService:
+    """Bake projects from templates loaded once and kept in memory.
+
+    The overlay of each template is created and its templated files are
+    compiled when the service starts, so a bake only renders the files and runs
+    the hooks.
+
+    Parameters
+    ----------
+    templates : list, optional
+        Names of the templates to be served. Default is all the templates.
+    workers : int, optional
+        Maximum number of projects baked at the same time. Default is the
+        number of CPUs.
+    queue_depth : int
+        Maximum number of requests waiting for a worker. Requests beyond this
+        limit are rejected. Default is ``16``.
+    use_cache : bool
+        Reuse the properties of the template files and the compiled templates
+        stored in the cache. Default is ``True``.
+    in_process_hooks : bool
+        Run the hooks of the templates in the server process instead of a
+        subprocess. Default is ``False``.
+    output_root : str, optional
+        Directory below which projects can be baked on request. Default is
+        ``None``, in which case projects are only returned as archives.
+
+    """
+
+    def __init__(
+        self,
+        templates=None,
+        workers=None,
+        queue_depth=16,
+        use_cache=True,
+        in_process_hooks=False,
+        output_root=None,
+    ):
+        """Load and compile the templates."""
+        names = templates or list(get_templates())
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self.in_process_hooks = in_process_hooks
+        self.output_root = os.path.realpath(output_root) if output_root is not None else None
+
+        self._templates = {}
+        for name in names:
+            template_path = TEMPLATE_PATH_FINDER[name]
+            overlay = TemplateOverlay(template_path, MIT_LICENSE, use_cache=use_cache)
+            overlay.load_properties()
+            default_context = generate_context(
+                context_file=str(template_path / "cookiecutter.json")
+            )
+            environment = create_environment(overlay, default_context)
+            for infile in overlay.walk(PROJECT_DIR_NAME):
+                kind = overlay.get_kind(f"{PROJECT_DIR_NAME}/{infile}")
+                if kind == TEMPLATED and not is_copy_only_path(infile, default_context):
+                    environment.get_template(infile)
+            self._templates[name] = (overlay, environment)
+
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def templates(self):
+        """Names of the templates served."""
+        return list(self._templates)
+
+    def _admit(self):
+        """Reserve a place for a request, unless workers and queue are full."""
+        with self._lock:
+            if self._pending >= self.workers + self.queue_depth:
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self):
+        """Free the place reserved by a request."""
+        with self._lock:
+            self._pending -= 1
+
+    def resolve_output_dir(self, output_dir):
+        """
+        Resolve a directory requested for baking a project.
+
+        Parameters
+        ----------
+        output_dir : str
+            Directory relative to the output root of the service, or an
+            absolute path below it.
+
+        Returns
+        -------
+        str
+            Absolute path to the directory, with symbolic links resolved.
+
+        Raises
+        ------
+        BakeError
+            If the service has no output root or the directory is not below it.
+
+        """
+        if self.output_root is None:
+            raise BakeError(
+                HTTPStatus.FORBIDDEN, "Baking into a directory is disabled for this service."
+            )
+        if not isinstance(output_dir, str):
+            raise BakeError(HTTPStatus.BAD_REQUEST, "The output directory must be a string.")
+        path = os.path.realpath(os.path.join(self.output_root, output_dir))
+        if os.path.commonpath([self.output_root, path]) != self.output_root:
+            raise BakeError(
+                HTTPStatus.FORBIDDEN, f"The output directory must be below '{self.output_root}'."
+            )
+        return path
+
+    def bake(self, template, request, archive):
+        """
+        Bake a project.
+
+        Parameters
+        ----------
+        template : str
+            Name of the template.
+        request : dict
+            Body of the request. The ``context`` key holds the variables of the
+            project. If ``output_dir`` is given, the project is created in that
+            directory, which must be below the output root of the service.
+            Otherwise, it is written into the archive using the
+            ``archive_format`` key, which defaults to ``"gztar"``. The
+            ``record`` key stores the bake record in the project and defaults
+            to ``False``. Keys starting with an underscore, which hold the
+            private variables of the templates, are rejected.
+        archive : file object
+            Binary file receiving the archive.
+
+        Returns
+        -------
+        tuple
+            Path to the project, or ``None`` if it was archived, and the elapsed
+            time in seconds of each phase of the bake.
+
+        Raises
+        ------
+        BakeError
+            If the request is not valid, the service is busy or the bake fails.
+
+        """
+        if template not in self._templates:
+            raise BakeError(HTTPStatus.NOT_FOUND, f"Unknown template '{template}'.")
+        private_keys = [key for key in request if key.startswith("_")]
+        archive_format = request.get("archive_format", "gztar")
+        if archive_format not in ARCHIVE_FORMATS:
+            raise BakeError(HTTPStatus.BAD_REQUEST, f"Unknown archive format '{archive_format}'.")
+        context = request.get("context", {})
+        if not isinstance(context, dict):
+            raise BakeError(HTTPStatus.BAD_REQUEST, "The context must be a JSON object.")
+        private_keys += [key for key in context if key.startswith("_")]
+        if private_keys:
+            raise BakeError(
+                HTTPStatus.BAD_REQUEST, f"Private keys cannot be set: {', '.join(private_keys)}."
+            )
+        try:
+            validate_context(template, context)
+        except ValueError as error:
+            raise BakeError(HTTPStatus.BAD_REQUEST, str(error))
+        output_dir = request.get("output_dir")
+        if output_dir is not None:
+            output_dir = self.resolve_output_dir(output_dir)
+        if not self._admit():
+            raise BakeError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many pending requests.")
+
+        start = time.perf_counter()
+        timings = {}
+        try:
+            with self._slots:
+                timings["queue"] = time.perf_counter() - start
+                if output_dir is not None:
+                    project_path = self._bake(template, request, output_dir, timings)
+                    return project_path, timings
+
+                with tempfile.TemporaryDirectory() as scratch_path:
+                    project_path = self._bake(template, request, scratch_path, timings)
+                    archive_start = time.perf_counter()
+                    arcname = os.path.relpath(project_path, scratch_path)
+                    write_archive(project_path, archive, archive_format, arcname)
+                    timings["archive"] = time.perf_counter() - archive_start
+                return None, timings
+        finally:
+            self._release()
+            timings["total"] = time.perf_counter() - start
+
+    @staticmethod
+    def _check_project_path(output_dir, context, environment):
+        """Reject a project whose rendered directory is not below the output directory."""
+        output_dir = os.path.realpath(output_dir)
+        project_dir = os.path.realpath(_get_project_path(output_dir, context, environment))
+        if os.path.commonpath([output_dir, project_dir]) != output_dir:
+            raise BakeError(
+                HTTPStatus.BAD_REQUEST, "The project directory must be below the output directory."
+            )
+
+    def _bake(self, template, request, output_dir, timings):
+        """Bake a project into a directory and record the timings."""
+        overlay, environment = self._templates[template]
+        start = time.perf_counter()
+        try:
+            context = _generate_context(
+                overlay.template_path,
+                output_dir,
+                no_input=True,
+                extra_context=request.get("context", {}),
+            )
+            timings["context"] = time.perf_counter() - start
+            self._check_project_path(output_dir, context, environment)
+            project_path = generate_files(
+                overlay,
+                context,
+                output_dir,
+                overwrite_if_exists=True,
+                environment=environment,
+                in_process_hooks=self.in_process_hooks,
+            )
+            if request.get("record", False):
+                write_record(
+                    project_path,
+                    overlay.template_path,
+                    overlay.license_path,
+                    context,
+                    overlay.fingerprint,
+                )
+        except BakeError:
+            raise
+        except Exception as err:
+            raise BakeError(HTTPStatus.UNPROCESSABLE_ENTITY, f"{type(err).__name__}: {err}")
+        timings["generate"] = time.perf_counter() - start - timings["context"]
+        return project_path
+
+
+class BakeRequestHandler(BaseHTTPRequestHandler):
+    """Answer the requests sent to a :class:`BakeService`.
+
+    The following endpoints are available:
+
+    - ``GET /templates`` lists the names of the templates.
+    - ``POST /bake/<template>`` bakes a project from a JSON body. See
+      :meth:`BakeService.bake`.
+
+    The elapsed time of each phase of a bake is returned in the
+    ``Server-Timing`` header, in milliseconds.
+
+    Requests whose ``Host`` or ``Origin`` header names another host than a
+    loopback one or one allowed by the server are rejected, so web pages
+    cannot reach the service through the browser of the user. Bake requests
+    must declare a JSON body.
+
+    """
+
+    server_version = "ansys-templates"
+
+    def address_string(self):
+        """Return the client address, which is empty for Unix sockets."""
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        """Log requests through the logging module instead of stderr."""
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body, content_type="application/json", timings=None):
+        """Send a response."""
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if timings:
+            self.send_header(
+                "Server-Timing",
+                ", ".join(f"{name};dur={value * 1000:.1f}" for name, value in timings.items()),
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _is_allowed_host(self, host):
+        """Check if a host name is a loopback one or one allowed by the server."""
+        return host in LOOPBACK_HOSTS or host in self.server.allowed_hosts
+
+    def _check_origin(self):
+        """Reject the request if sent to or from a host which is not allowed.
+
+        Returns
+        -------
+        bool
+            ``True`` if the request can be answered, ``False`` if it was
+            rejected.
+
+        """
+        host = _get_hostname(f"//{self.headers.get('Host', '')}")
+        origin = self.headers.get("Origin")
+        if not self._is_allowed_host(host):
+            self._send(HTTPStatus.FORBIDDEN, {"error": f"Host '{host}' is not allowed."})
+            return False
+        if origin is not None and not self._is_allowed_host(_get_hostname(origin)):
+            self._send(HTTPStatus.FORBIDDEN, {"error": f"Origin '{origin}' is not allowed."})
+            return False
+        return True
+
+    def do_GET(self):
+        """List the templates."""
+        if not self._check_origin():
+            return
+        if self.path.rstrip("/") != "/templates":
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path '{self.path}'."})
+            return
+        self._send(HTTPStatus.OK, self.server.service.templates)
+
+    def do_POST(self):
+        """Bake a project."""
+        if not self._check_origin():
+            return
+        prefix = "/bake/"
+        if not self.path.startswith(prefix):
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path '{self.path}'."})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                {"error": "The body must be sent as 'application/json'."},
+            )
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("The body must be a JSON object.")
+        except ValueError as err:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"Invalid request: {err}"})
+            return
+
+        with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as archive:
+            try:
+                project_path, timings = self.server.service.bake(
+                    self.path[len(prefix) :], request, archive
+                )
+            except BakeError as err:
+                self._send(err.status, {"error": str(err)})
+                return
+
+            if project_path is not None:
+                self._send(
+                    HTTPStatus.OK,
+                    {"project_path": project_path, "timings": timings},
+                    timings=timings,
+                )
+                return
+
+            archive.seek(0)
+            content_type = _CONTENT_TYPES[request.get("archive_format", "gztar")]
+            self._send(HTTPStatus.OK, archive.read(), content_type=content_type, timings=timings)
+
+
+class BakeHTTPServer(ThreadingHTTPServer):
+    """HTTP server answering each request of a :class:`BakeService` in a thread."""
+
+    daemon_threads = True
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT, allowed_hosts=()):
+        """Bind the server to the given address."""
+        self.service = service
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+        super().__init__((host, port), BakeRequestHandler)
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class BakeUnixServer(socketserver.ThreadingUnixStreamServer):
+        """HTTP server listening to a Unix socket for a :class:`BakeService`."""
+
+        daemon_threads = True
+
+        def __init__(self, service, socket_path, allowed_hosts=()):
+            """Bind the server to the given socket, replacing any stale one."""
+            self.service = service
+            self.allowed_hosts = {host.lower() for host in allowed_hosts}
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            super().__init__(socket_path, BakeRequestHandler)
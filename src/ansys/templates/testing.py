@@ -22,9 +22,39 @@
 
 """A collection of routines focused on testing."""
 
+import argparse
+import ast
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+import hashlib
+import itertools
+import json
+import mmap
 import os
+from pathlib import Path
+import re
+import shutil
+import stat
+import sys
+import tempfile
 
-from ansys.templates.utils import bake_template
+import yaml
+
+from ansys.templates.analysis import ALL_VARIABLES, analyze_template
+from ansys.templates.utils import bake_template, copy_tree
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+    import msvcrt
+
+_WRITE_PERMISSIONS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+"""Permission bits allowing to write a file."""
+
+_CHUNK_SIZE = 1024 * 1024
+"""Size of the chunks in which files are streamed."""
 
 
 def assert_template_baking_process(template_path, output_path, cookiecutter_vars):
@@ -116,3 +146,670 @@ def assert_project_structure(expected_structure, project_path):
         msg += f"Current structure = {current_structure}\n"
         msg += f"Expected structure = {expected_structure}\n"
         raise AssertionError(msg)
+
+
+def get_project_manifest(project_path):
+    """Return the size and the SHA-256 digest of each file of a project.
+
+    Newlines are normalized before hashing, so the manifest of a project does
+    not depend on the platform it was baked on.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the output project path.
+
+    Returns
+    -------
+    dict
+        Paths relative to the project using forward slashes as keys and tuples
+        holding the size and the digest of each file as values, sorted by path.
+
+    """
+    manifest = {}
+    for folder, _, filenames in os.walk(project_path):
+        relative_folder = Path(os.path.relpath(folder, project_path)).as_posix()
+        for filename in filenames:
+            with open(os.path.join(folder, filename), "rb") as file:
+                content = file.read().replace(b"\r\n", b"\n")
+            relative_path = filename if relative_folder == "." else f"{relative_folder}/{filename}"
+            manifest[relative_path] = (len(content), hashlib.sha256(content).hexdigest())
+    return dict(sorted(manifest.items()))
+
+
+def read_snapshot(snapshot_path):
+    """Read the manifest of a project stored in a snapshot file.
+
+    Each line of a snapshot holds the digest, the size and the path of a file.
+
+    Parameters
+    ----------
+    snapshot_path : ~pathlib.Path
+        Path to the snapshot file.
+
+    Returns
+    -------
+    dict
+        Manifest of the project, like the one returned by
+        :func:`get_project_manifest`.
+
+    """
+    manifest = {}
+    with open(snapshot_path, encoding="utf-8") as snapshot_file:
+        for line in snapshot_file:
+            digest, size, relative_path = line.rstrip("\n").split("  ", 2)
+            manifest[relative_path] = (int(size), digest)
+    return manifest
+
+
+def write_snapshot(manifest, snapshot_path):
+    """Write the manifest of a project to a snapshot file.
+
+    Parameters
+    ----------
+    manifest : dict
+        Manifest of the project, as returned by :func:`get_project_manifest`.
+    snapshot_path : ~pathlib.Path
+        Path to the snapshot file.
+
+    """
+    Path(snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_path, "w", encoding="utf-8", newline="\n") as snapshot_file:
+        for relative_path, (size, digest) in sorted(manifest.items()):
+            snapshot_file.write(f"{digest}  {size}  {relative_path}\n")
+
+
+def diff_manifests(expected, current):
+    """Return the differences between two manifests of a project.
+
+    Parameters
+    ----------
+    expected : dict
+        Expected manifest of the project.
+    current : dict
+        Manifest of the baked project.
+
+    Returns
+    -------
+    list
+        One line per added (``+``), removed (``-``) or changed (``~``) file.
+        Unchanged files are not reported.
+
+    """
+    differences = []
+    for relative_path in sorted(expected.keys() | current.keys()):
+        expected_entry, current_entry = expected.get(relative_path), current.get(relative_path)
+        if expected_entry == current_entry:
+            continue
+        if expected_entry is None:
+            differences.append(f"+ {relative_path} ({current_entry[0]} bytes)")
+        elif current_entry is None:
+            differences.append(f"- {relative_path}")
+        else:
+            differences.append(
+                f"~ {relative_path} ({expected_entry[0]} -> {current_entry[0]} bytes)"
+            )
+    return differences
+
+
+def assert_project_snapshot(project_path, snapshot_path, update=False):
+    """Assert if the files of a project and their content match a snapshot.
+
+    The snapshot only stores the path, size and digest of each file, so no
+    copy of the expected project is required.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the output project path.
+    snapshot_path : ~pathlib.Path
+        Path to the snapshot file.
+    update : bool
+        Write the snapshot from the project instead of comparing them.
+
+    """
+    current = get_project_manifest(project_path)
+    if update:
+        write_snapshot(current, snapshot_path)
+        return
+
+    if not Path(snapshot_path).is_file():
+        raise AssertionError(
+            f"Snapshot {snapshot_path} does not exist. Create it with update=True."
+        )
+
+    differences = diff_manifests(read_snapshot(snapshot_path), current)
+    if differences:
+        msg = f"Project {project_path} does not match snapshot {snapshot_path}:\n"
+        msg += "\n".join(differences)
+        raise AssertionError(msg)
+
+
+@contextmanager
+def _map_file(path):
+    """Map the content of a file in memory, without reading it."""
+    with open(path, "rb") as file:
+        # Empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+
+def assert_file_contains(file, text, project_path):
+    """
+    Assert if a file of a project contains some text.
+
+    The file is mapped in memory, so it is not read beyond the first
+    occurrence of the text.
+
+    Parameters
+    ----------
+    file : str
+        File path relative to the output project path.
+    text : str
+        Expected text, encoded as UTF-8 before being searched.
+    project_path : ~pathlib.Path
+        Path to the output project path.
+
+    """
+    with _map_file(project_path / file) as content:
+        found = content.find(text.encode("utf-8")) != -1
+    assert found, f"File {file} does not contain {text!r}"
+
+
+def assert_file_matches(file, pattern, project_path, flags=0):
+    """
+    Assert if a regular expression matches the content of a file of a project.
+
+    Parameters
+    ----------
+    file : str
+        File path relative to the output project path.
+    pattern : str
+        Regular expression searched in the file, encoded as UTF-8.
+    project_path : ~pathlib.Path
+        Path to the output project path.
+    flags : int
+        Flags of the regular expression, like :data:`re.MULTILINE`.
+
+    """
+    with _map_file(project_path / file) as content:
+        found = re.search(pattern.encode("utf-8"), content, flags) is not None
+    assert found, f"File {file} does not match {pattern!r}"
+
+
+def count_lines(path):
+    """
+    Return the number of lines of a file, reading it in chunks.
+
+    Parameters
+    ----------
+    path : ~pathlib.Path
+        Path to the file.
+
+    Returns
+    -------
+    int
+        Number of lines, including a last line without newline character.
+
+    """
+    count, last_chunk = 0, b""
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            count += chunk.count(b"\n")
+            last_chunk = chunk
+    return count + (not last_chunk.endswith(b"\n") if last_chunk else 0)
+
+
+def assert_file_line_count(file, expected_count, project_path):
+    """
+    Assert if a file of a project has the expected number of lines.
+
+    Parameters
+    ----------
+    file : str
+        File path relative to the output project path.
+    expected_count : int
+        Expected number of lines.
+    project_path : ~pathlib.Path
+        Path to the output project path.
+
+    """
+    count = count_lines(project_path / file)
+    assert count == expected_count, f"File {file} has {count} lines, expected {expected_count}"
+
+
+def _validate_json(path):
+    """Parse a JSON file."""
+    with _map_file(path) as content:
+        json.loads(content[:])
+
+
+def _validate_python(path):
+    """Parse the syntax of a Python file without running it."""
+    with _map_file(path) as content:
+        ast.parse(content[:], filename=str(path))
+
+
+def _validate_toml(path):
+    """Parse a TOML file."""
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        # Python < 3.11
+        import tomli as tomllib
+
+    with _map_file(path) as content:
+        tomllib.loads(content[:].decode("utf-8"))
+
+
+def _validate_yaml(path):
+    """Parse all the documents of a YAML file, streaming its content."""
+    with open(path, encoding="utf-8") as yaml_file:
+        for _ in yaml.safe_load_all(yaml_file):
+            pass
+
+
+VALIDATORS = {
+    "*.json": _validate_json,
+    "*.py": _validate_python,
+    "*.toml": _validate_toml,
+    "*.yaml": _validate_yaml,
+    "*.yml": _validate_yaml,
+}
+"""Functions checking the syntax of the files matching each pattern."""
+
+
+def _validate_file(path):
+    """Check the syntax of a file and return the error found, if any."""
+    for pattern, validator in VALIDATORS.items():
+        if fnmatchcase(path.name, pattern):
+            try:
+                validator(path)
+            except Exception as err:
+                return f"{type(err).__name__}: {err}"
+    return None
+
+
+def validate_files(project_path, files=None, jobs=None):
+    """
+    Check the syntax of the JSON, Python, TOML and YAML files of a project.
+
+    Files are checked in a pool of threads.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the output project path.
+    files : list, optional
+        File paths relative to the output project path. Default is all the
+        files of the project matching a pattern of :data:`VALIDATORS`.
+    jobs : int, optional
+        Number of threads checking files. Default is the number of CPUs.
+
+    Returns
+    -------
+    dict
+        Paths relative to the project of the invalid files as keys and the
+        description of their error as values.
+
+    """
+    project_path = Path(project_path)
+    if files is None:
+        files = [
+            file
+            for file in get_project_manifest(project_path)
+            if any(fnmatchcase(file.rsplit("/", 1)[-1], pattern) for pattern in VALIDATORS)
+        ]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        errors = executor.map(_validate_file, [project_path / file for file in files])
+        return {file: error for file, error in zip(files, errors) if error is not None}
+
+
+def assert_valid_files(project_path, files=None, jobs=None):
+    """
+    Assert if the JSON, Python, TOML and YAML files of a project are valid.
+
+    All the files are checked before failing, so every invalid file is
+    reported. See :func:`validate_files`.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the output project path.
+    files : list, optional
+        File paths relative to the output project path. Default is all the
+        files with a known format.
+    jobs : int, optional
+        Number of threads checking files. Default is the number of CPUs.
+
+    """
+    errors = validate_files(project_path, files, jobs)
+    if errors:
+        msg = f"Project {project_path} holds invalid files:\n"
+        msg += "\n".join(f"{file}: {error}" for file, error in errors.items())
+        raise AssertionError(msg)
+
+
+@contextmanager
+def _lock(lock_path):
+    """Hold an exclusive lock on a file, shared by all the processes."""
+    with open(lock_path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            # Locking gives up after some seconds, while a bake may take longer
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _set_writable(path, writable):
+    """Add or remove the write permissions of all the files below a directory."""
+    for folder, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(folder, filename)
+            mode = stat.S_IMODE(os.lstat(file_path).st_mode)
+            os.chmod(file_path, mode | stat.S_IWUSR if writable else mode & ~_WRITE_PERMISSIONS)
+
+
+class BakedProjectCache:
+    """Projects baked once and cloned for each test requiring them.
+
+    Each unique combination of template and variables is baked only once in
+    a directory which can be shared by several processes, like the workers of
+    ``pytest-xdist``. A lock file per combination prevents two processes from
+    baking the same project at the same time. Each test receives its own copy
+    of the baked project, cloned through reflinks where the file system
+    supports them, so no test can modify the files of the cache.
+
+    Parameters
+    ----------
+    cache_dir : ~pathlib.Path
+        Directory holding the baked projects.
+
+    """
+
+    def __init__(self, cache_dir):
+        """Initialize the cache."""
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def get_key(template_path, context=None):
+        """Return the key identifying a project in the cache.
+
+        Parameters
+        ----------
+        template_path : ~pathlib.Path
+            Path to the template.
+        context : dict, optional
+            Variables overriding the default ones of the template.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the template path and the variables.
+
+        """
+        content = {"template": str(Path(template_path).resolve()), "context": context or {}}
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:32]
+
+    def bake(self, template_path, context=None):
+        """Bake a project unless it is already in the cache.
+
+        Parameters
+        ----------
+        template_path : ~pathlib.Path
+            Path to the template.
+        context : dict, optional
+            Variables overriding the default ones of the template.
+
+        Returns
+        -------
+        tuple
+            Path to the output directory holding the baked project and path of
+            the project relative to it.
+
+        """
+        key = self.get_key(template_path, context)
+        output_path = self.cache_dir / key
+        metadata_path = self.cache_dir / f"{key}.json"
+
+        # Projects are renamed into place once baked, so an existing directory
+        # is always complete
+        if not output_path.is_dir():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with _lock(self.cache_dir / f"{key}.lock"):
+                if not output_path.is_dir():
+                    staging_path = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+                    try:
+                        project_path = bake_template(
+                            template_path,
+                            staging_path,
+                            overwrite_if_exists=True,
+                            no_input=True,
+                            extra_context=context or {},
+                        )
+                        _set_writable(staging_path, False)
+                        project = os.path.relpath(project_path, staging_path)
+                        with open(metadata_path, "w", encoding="utf-8") as json_file:
+                            json.dump({"project": project}, json_file)
+                        os.rename(staging_path, output_path)
+                    finally:
+                        shutil.rmtree(staging_path, ignore_errors=True)
+
+        with open(metadata_path, encoding="utf-8") as json_file:
+            return output_path, json.load(json_file)["project"]
+
+    def clone(self, template_path, destination, context=None, writable=False):
+        """Return a clone of a baked project, baking it if required.
+
+        Parameters
+        ----------
+        template_path : ~pathlib.Path
+            Path to the template.
+        destination : ~pathlib.Path
+            Output path for the cloned project, like the one given to
+            :func:`~ansys.templates.utils.bake_template`.
+        context : dict, optional
+            Variables overriding the default ones of the template.
+        writable : bool
+            Make the copied files writable. Otherwise, they are read-only like
+            the files of the cache. Default is ``False``.
+
+        Returns
+        -------
+        ~pathlib.Path
+            Path to the cloned project.
+
+        """
+        output_path, project = self.bake(template_path, context)
+        destination = Path(destination)
+
+        # Hard links would share the files of the cache with the clone, which
+        # read-only permissions do not protect from root or from a chmod
+        copy_tree(output_path, destination)
+        if writable:
+            _set_writable(destination, True)
+        return destination / project
+
+
+def get_choice_contexts(template_path, variables=None, base_context=None, prune=True):
+    """
+    Enumerate the combinations of the values of the choice variables of a template.
+
+    Choice variables are the public variables of ``cookiecutter.json`` holding
+    a list of values.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    variables : list, optional
+        Names of the choice variables to enumerate. Default is all of them.
+    base_context : dict, optional
+        Variables shared by all the combinations. Choice variables given here
+        are not enumerated.
+    prune : bool
+        Skip the choice variables which no file and no hook of the template
+        read, as found by :func:`~ansys.templates.analysis.analyze_template`.
+        Default is ``True``.
+
+    Returns
+    -------
+    list
+        Variables of each combination, starting with the default values.
+
+    """
+    base_context = base_context or {}
+    with open(Path(template_path) / "cookiecutter.json", encoding="utf-8") as json_file:
+        configuration = json.load(json_file)
+
+    choices = {
+        name: value
+        for name, value in configuration.items()
+        if isinstance(value, list)
+        and not name.startswith("_")
+        and name not in base_context
+        and (variables is None or name in variables)
+    }
+    if prune and choices:
+        dependencies = analyze_template(template_path)
+        read_variables = dependencies.hooks.union(*dependencies.files.values())
+        if ALL_VARIABLES not in read_variables:
+            choices = {name: value for name, value in choices.items() if name in read_variables}
+
+    return [
+        {**base_context, **dict(zip(choices, values))}
+        for values in itertools.product(*choices.values())
+    ]
+
+
+def _get_project_digest(template_path, context):
+    """Bake a project in a temporary directory and return the digest of its files."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        project_path = bake_template(
+            template_path,
+            tmp_dir,
+            overwrite_if_exists=True,
+            in_process_hooks=True,
+            no_input=True,
+            extra_context=context,
+        )
+        manifest = get_project_manifest(project_path)
+    return hashlib.sha256(json.dumps(manifest).encode()).hexdigest()
+
+
+def group_equivalent_contexts(template_path, contexts, jobs=None):
+    """
+    Group the contexts baking byte-identical projects.
+
+    Each context is baked in a temporary directory. Projects are compared
+    through the paths, sizes and digests of their files, see
+    :func:`get_project_manifest`.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    contexts : list
+        Variables overriding the default ones of the template.
+    jobs : int, optional
+        Number of processes baking projects in parallel. Default is the number
+        of CPUs. If ``1``, projects are baked in the current process.
+
+    Returns
+    -------
+    list
+        Lists of the contexts baking the same project, ordered by their first
+        context.
+
+    """
+    contexts = list(contexts)
+    jobs = min(jobs or os.cpu_count() or 1, max(len(contexts), 1))
+    if jobs == 1:
+        digests = [_get_project_digest(template_path, context) for context in contexts]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            digests = list(
+                executor.map(_get_project_digest, [template_path] * len(contexts), contexts)
+            )
+
+    groups = {}
+    for context, digest in zip(contexts, digests):
+        groups.setdefault(digest, []).append(context)
+    return list(groups.values())
+
+
+def get_covering_contexts(template_path, variables=None, base_context=None, jobs=None):
+    """
+    Return the smallest list of contexts covering every distinct baked project.
+
+    All the combinations of the choice variables are baked, see
+    :func:`get_choice_contexts`, and only the first context of each group
+    baking the same project is kept. The result can be used to parametrize the
+    tests of a template.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    variables : list, optional
+        Names of the choice variables to enumerate. Default is all of them.
+    base_context : dict, optional
+        Variables shared by all the combinations.
+    jobs : int, optional
+        Number of processes baking projects in parallel. Default is the number
+        of CPUs.
+
+    Returns
+    -------
+    list
+        Variables of each distinct project.
+
+    """
+    contexts = get_choice_contexts(template_path, variables, base_context)
+    return [group[0] for group in group_equivalent_contexts(template_path, contexts, jobs)]
+
+
+def main(argv=None):
+    """Print the contexts covering every distinct project baked from a template."""
+    # Only required for finding the templates by name
+    from ansys.templates.paths import TEMPLATE_PATH_FINDER
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ansys.templates.testing",
+        description="Find the contexts covering every distinct project baked from a template.",
+    )
+    parser.add_argument("template", help="Name of or path to the template.")
+    parser.add_argument(
+        "--variable",
+        action="append",
+        help="Only enumerate the values of this choice variable. Can be repeated.",
+    )
+    parser.add_argument("--jobs", type=int, help="Number of processes baking projects.")
+    args = parser.parse_args(argv)
+
+    template_path = TEMPLATE_PATH_FINDER.get(args.template, Path(args.template))
+    contexts = get_covering_contexts(template_path, args.variable, jobs=args.jobs)
+    json.dump(contexts, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Keep baked projects in sync with their template."""
+
+from dataclasses import dataclass, field
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import zipfile
+
+from ansys.templates import __version__
+from ansys.templates.paths import LICENSES_TEMPLATES_PATH, PYTHON_TEMPLATES_PATH
+
+RECORD_DIR_NAME = ".ansys-templates"
+"""Name of the directory holding the bake record of a project."""
+
+RECORD_MANIFEST_NAME = "manifest.json"
+"""Name of the file holding the context and the hashes of the baked files."""
+
+RECORD_BASE_NAME = "base.zip"
+"""Name of the archive holding the baked files, used as base for merges."""
+
+_CONFLICT_MARKERS = ("<<<<<<< project\n", "=======\n", ">>>>>>> template\n")
+"""Lines delimiting both versions of a conflicting region."""
+
+
+@dataclass
+class UpdateResult:
+    """Changes applied to a project by an update."""
+
+    project_path: str
+    """Path to the updated project."""
+
+    updated: list = field(default_factory=list)
+    """Files replaced by their new version."""
+
+    added: list = field(default_factory=list)
+    """Files added by the new version of the template."""
+
+    removed: list = field(default_factory=list)
+    """Files no longer part of the template."""
+
+    merged: list = field(default_factory=list)
+    """Files edited in the project whose changes were merged with the new version."""
+
+    conflicts: list = field(default_factory=list)
+    """Files whose changes could not be merged."""
+
+    @property
+    def changed(self):
+        """Whether any file of the project was modified."""
+        return bool(self.updated or self.added or self.removed or self.merged or self.conflicts)
+
+
+def _hash_file(path):
+    """Return the SHA-256 digest of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _collect_files(project_path):
+    """Return the files of a project, excluding its bake record.
+
+    Returns
+    -------
+    dict
+        Relative paths using forward slashes as keys and absolute paths as
+        values.
+
+    """
+    files = {}
+    for folder, subfolders, filenames in os.walk(project_path):
+        if folder == os.fspath(project_path) and RECORD_DIR_NAME in subfolders:
+            subfolders.remove(RECORD_DIR_NAME)
+        relative_folder = Path(os.path.relpath(folder, project_path)).as_posix()
+        for filename in filenames:
+            relative_path = filename if relative_folder == "." else f"{relative_folder}/{filename}"
+            files[relative_path] = os.path.join(folder, filename)
+    return files
+
+
+def get_public_variables(context):
+    """Return the variables of a cookiecutter context which can be overridden.
+
+    Parameters
+    ----------
+    context : dict
+        Cookiecutter context.
+
+    Returns
+    -------
+    dict
+        Variables whose names do not start with an underscore.
+
+    """
+    return {key: value for key, value in context["cookiecutter"].items() if not key.startswith("_")}
+
+
+def get_context_hash(context, fingerprint):
+    """Return a digest identifying the output of a bake.
+
+    Two bakes with the same digest use the same version of the package, the
+    same template files and the same variables, so they produce the same
+    project.
+
+    Parameters
+    ----------
+    context : dict
+        Cookiecutter context.
+    fingerprint : str
+        Fingerprint of the template files.
+
+    Returns
+    -------
+    str
+        SHA-256 digest of the version, fingerprint and public variables.
+
+    """
+    content = {
+        "version": __version__,
+        "fingerprint": fingerprint,
+        "context": get_public_variables(context),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def write_record(project_path, template_path, license_path, context, fingerprint, baked_path=None):
+    """
+    Store how a project was baked inside of it.
+
+    The record lives in the ``.ansys-templates`` directory of the project. It
+    holds a manifest with the template, the variables and the hash of each
+    file, together with an archive of the baked files.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the freshly baked project.
+    template_path : ~pathlib.Path
+        Path to the template.
+    license_path : ~pathlib.Path
+        Path to the license template.
+    context : dict
+        Cookiecutter context used to bake the project.
+    fingerprint : str
+        Fingerprint of the template files.
+    baked_path : ~pathlib.Path, optional
+        Path to the baked files to be recorded. Default is the project path.
+
+    """
+    template_path = Path(template_path)
+    try:
+        template = template_path.relative_to(PYTHON_TEMPLATES_PATH.parent).as_posix()
+    except ValueError:
+        template = str(template_path)
+
+    record_path = Path(project_path) / RECORD_DIR_NAME
+    record_path.mkdir(exist_ok=True)
+    files = _collect_files(baked_path or project_path)
+    with zipfile.ZipFile(record_path / RECORD_BASE_NAME, "w", zipfile.ZIP_DEFLATED) as archive:
+        for relative_path, path in sorted(files.items()):
+            archive.write(path, relative_path)
+
+    manifest = {
+        "version": __version__,
+        "template": template,
+        "license": Path(license_path).name,
+        "fingerprint": fingerprint,
+        "context": get_public_variables(context),
+        "context_hash": get_context_hash(context, fingerprint),
+        "files": {relative_path: _hash_file(path) for relative_path, path in sorted(files.items())},
+    }
+    with open(record_path / RECORD_MANIFEST_NAME, "w", encoding="utf-8") as json_file:
+        json.dump(manifest, json_file, indent=2)
+        json_file.write("\n")
+
+
+def read_record(project_path):
+    """
+    Read the manifest stored in a project when it was baked.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the project.
+
+    Returns
+    -------
+    dict
+        Content of the manifest, with the ``template`` and ``license`` entries
+        converted to absolute paths.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the project has no bake record.
+
+    """
+    manifest_path = Path(project_path) / RECORD_DIR_NAME / RECORD_MANIFEST_NAME
+    if not manifest_path.is_file():
+        raise FileNotFoundError(
+            f"No bake record found in '{project_path}'. Create the project with --record."
+        )
+    with open(manifest_path, encoding="utf-8") as json_file:
+        manifest = json.load(json_file)
+
+    manifest["template"] = PYTHON_TEMPLATES_PATH.parent / manifest["template"]
+    manifest["license"] = LICENSES_TEMPLATES_PATH / manifest["license"]
+    return manifest
+
+
+def is_up_to_date(project_path, context, fingerprint):
+    """
+    Check if a project was already baked from the same context and template.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the project.
+    context : dict
+        Cookiecutter context of the requested bake.
+    fingerprint : str
+        Fingerprint of the template files.
+
+    Returns
+    -------
+    bool
+        ``True`` if the bake record of the project holds the same context
+        hash, ``False`` otherwise or if the project has no bake record.
+
+    """
+    try:
+        record = read_record(project_path)
+    except FileNotFoundError:
+        return False
+    return record.get("context_hash") == get_context_hash(context, fingerprint)
+
+
+def _get_hunks(base, other, side):
+    """Return the regions of the base lines replaced in other lines."""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (base_start, base_end, side, other[start:end])
+        for tag, base_start, base_end, start, end in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply_hunks(base, start, end, hunks):
+    """Apply the hunks of one side to a region of the base lines."""
+    lines, position = [], start
+    for hunk_start, hunk_end, _, replacement in hunks:
+        lines.extend(base[position:hunk_start])
+        lines.extend(replacement)
+        position = hunk_end
+    lines.extend(base[position:end])
+    return lines
+
+
+def _terminate(lines):
+    """Return lines whose last item ends with a newline."""
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [f"{lines[-1]}\n"]
+    return lines
+
+
+def merge_lines(base, project, template):
+    """
+    Merge the changes made to some lines by the project and by the template.
+
+    Regions changed by only one side take the version of that side. Regions
+    changed by both sides in a different way are reported as conflicts and
+    both versions are kept between conflict markers.
+
+    Parameters
+    ----------
+    base : list
+        Lines as originally baked.
+    project : list
+        Lines as found in the project.
+    template : list
+        Lines as baked by the new version of the template.
+
+    Returns
+    -------
+    tuple
+        Merged lines and number of conflicts.
+
+    """
+    hunks = sorted(_get_hunks(base, project, 0) + _get_hunks(base, template, 1))
+
+    merged, conflicts, position, index = [], 0, 0, 0
+    while index < len(hunks):
+        # Group the hunks touching or overlapping the same region of the base
+        start, end = hunks[index][0], hunks[index][1]
+        group = [hunks[index]]
+        index += 1
+        while index < len(hunks) and hunks[index][0] <= end:
+            end = max(end, hunks[index][1])
+            group.append(hunks[index])
+            index += 1
+
+        merged.extend(base[position:start])
+        project_hunks = [hunk for hunk in group if hunk[2] == 0]
+        template_hunks = [hunk for hunk in group if hunk[2] == 1]
+        project_lines = _apply_hunks(base, start, end, project_hunks)
+        template_lines = _apply_hunks(base, start, end, template_hunks)
+        if not template_hunks or project_lines == template_lines:
+            merged.extend(project_lines)
+        elif not project_hunks:
+            merged.extend(template_lines)
+        else:
+            conflicts += 1
+            merged.append(_CONFLICT_MARKERS[0])
+            merged.extend(_terminate(project_lines))
+            merged.append(_CONFLICT_MARKERS[1])
+            merged.extend(_terminate(template_lines))
+            merged.append(_CONFLICT_MARKERS[2])
+        position = end
+
+    merged.extend(base[position:])
+    return merged, conflicts
+
+
+def _merge_file(base, project_path, template_path, dry_run=False):
+    """Merge a file of the project with its new version in place.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file was merged without conflicts.
+
+    """
+    try:
+        base_lines = base.decode("utf-8").splitlines(keepends=True)
+        with open(project_path, encoding="utf-8", newline="") as file:
+            project_lines = file.read().splitlines(keepends=True)
+        with open(template_path, encoding="utf-8", newline="") as file:
+            template_lines = file.read().splitlines(keepends=True)
+    except UnicodeDecodeError:
+        # Binary files can not be merged, the project version is kept
+        return False
+
+    merged, conflicts = merge_lines(base_lines, project_lines, template_lines)
+    if not dry_run:
+        with open(project_path, "w", encoding="utf-8", newline="") as file:
+            file.write("".join(merged))
+    return conflicts == 0
+
+
+def _remove_file(project_path, relative_path):
+    """Remove a file from a project along with the folders left empty."""
+    path = Path(project_path) / relative_path
+    path.unlink()
+    for parent in path.parents:
+        if parent == Path(project_path) or any(parent.iterdir()):
+            break
+        parent.rmdir()
+
+
+def apply_update(project_path, baked_path, dry_run=False):
+    """
+    Apply the changes between two bakes of a template to a project.
+
+    Only files whose baked content changed since the project was baked are
+    considered. Files left untouched in the project are replaced, files edited
+    in the project are merged with their new version. All other files are left
+    as they are, so their modification time is preserved.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the project holding a bake record.
+    baked_path : ~pathlib.Path
+        Path to a project baked by the new version of the template.
+    dry_run : bool
+        Only report the changes, without modifying the project. Default is
+        ``False``.
+
+    Returns
+    -------
+    UpdateResult
+        Changes applied to the project.
+
+    """
+    project_path = Path(project_path)
+    record_path = project_path / RECORD_DIR_NAME
+    base_hashes = read_record(project_path)["files"]
+    baked_files = _collect_files(baked_path)
+    baked_hashes = {relative_path: _hash_file(path) for relative_path, path in baked_files.items()}
+
+    result = UpdateResult(project_path=str(project_path))
+    with zipfile.ZipFile(record_path / RECORD_BASE_NAME) as archive:
+        for relative_path in sorted(set(base_hashes) | set(baked_hashes)):
+            base_hash = base_hashes.get(relative_path)
+            baked_hash = baked_hashes.get(relative_path)
+            if base_hash == baked_hash:
+                continue
+
+            path = project_path / relative_path
+            current_hash = _hash_file(path) if path.is_file() else None
+            if current_hash == baked_hash:
+                continue
+
+            if current_hash == base_hash:
+                if baked_hash is None:
+                    result.removed.append(relative_path)
+                    if not dry_run:
+                        _remove_file(project_path, relative_path)
+                    continue
+                (result.added if base_hash is None else result.updated).append(relative_path)
+                if not dry_run:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy(baked_files[relative_path], path)
+            elif current_hash is None or baked_hash is None:
+                # The file was removed on one side and edited on the other
+                result.conflicts.append(relative_path)
+            else:
+                base = archive.read(relative_path) if base_hash is not None else b""
+                if _merge_file(base, path, baked_files[relative_path], dry_run=dry_run):
+                    result.merged.append(relative_path)
+                else:
+                    result.conflicts.append(relative_path)
+
+    return result
@@ -21,172 +21,1198 @@
 # SOFTWARE.
 
 """A collection of useful utilities and routines."""
+import ast
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import dataclass, field, fields
+from enum import Enum
+import filecmp
+from functools import lru_cache
+import hashlib
 import json
+import logging
 import os
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import shutil
+import stat
+import sys
 import tempfile
+import time
+from typing import Optional
 
-from cookiecutter.main import cookiecutter
+from cookiecutter.config import get_user_config
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.exceptions import (
+    FailedHookException,
+    InvalidModeException,
+    OutputDirExistsException,
+    UndefinedVariableInTemplate,
+)
+from cookiecutter.generate import generate_context, is_copy_only_path, render_and_create_dir
+from cookiecutter.hooks import find_hook, run_script_with_context
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.replay import dump, load
+from jinja2 import FileSystemBytecodeCache
+from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
+from ansys.templates import __version__
+from ansys.templates.archive import get_archive_format, write_archive
+from ansys.templates.cache import get_cache_entry, record_cache_write, touch_cache_entry
 from ansys.templates.licenses import MIT_LICENSE
+from ansys.templates.overlay import BINARY, PROJECT_DIR_NAME, STATIC, OverlayLoader, TemplateOverlay
+from ansys.templates.profiling import (
+    Profiler,
+    activate,
+    collect_hook_spans,
+    get_profiler,
+    profiled,
+    span,
+)
+from ansys.templates.registry import find_template
+from ansys.templates.update import (
+    UpdateResult,
+    apply_update,
+    is_up_to_date,
+    read_record,
+    write_record,
+)
 
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_FICLONE = 0x40049409 if sys.platform.startswith("linux") else None
+"""Linux ioctl request cloning a file into another one, ``None`` on other platforms."""
+
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+"""Default number of threads copying files concurrently."""
+
+ARCHIVE_SPOOL_SIZE = 64 * 1024 * 1024
+"""Size in bytes above which an archive streamed to the standard output is
+buffered on disk instead of in memory."""
+
+
+@profiled("remove_file")
+def remove_file(filename, project_path=Path(os.getcwd())):
+    """Remove desired file being given its relative path to project.
+
+    Parameters
+    ----------
+    filename : str
+        Filename relative to project root directory.
+    project_path : Path
+        Project's root directory.
 
-def _copytree(input_path, output_path):
     """
-    Recursively copy all the contents of a directory into desired one.
+    filepath = project_path / filename
+    filepath.unlink()
+
+
+@profiled("keep_files")
+def keep_files(files_list, project_path=Path(os.getcwd()), dry_run=False):
+    """Remove undesired files except given ones from project.
+
+    Directories left empty are removed too, unless they are given.
 
     Parameters
     ----------
-    input_path : ~pathlib.Path
-        Path of the source directory to be copied.
-    output_path : ~pathlib.Path
-        Path of the destination directory.
+    files_list : list
+        Desired file names relative to project's root directory, using forward
+        slashes.
+    project_path : Path
+        Project's root directory.
+    dry_run : bool
+        Only collect the files and directories to be removed, without removing
+        them. Default is ``False``.
+
+    Returns
+    -------
+    list
+        Paths of the removed files and directories, in removal order.
 
     """
-    # Create output directory if it does not exist and ensure permission bits
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-        shutil.copystat(input_path, output_path)
+    desired_files = {PurePosixPath(file) for file in files_list}
 
-    # Get all file directories from the input directory
-    files_list = os.listdir(input_path)
+    removed, removed_folders = [], set()
+    for folder, subfolders, files in os.walk(project_path, topdown=False):
+        relative_folder = PurePosixPath(*Path(os.path.relpath(folder, project_path)).parts)
+        kept_entries = 0
 
-    for file in files_list:
-        # Create source and destination file paths
-        source_path = os.path.join(input_path, file)
-        dest_path = os.path.join(output_path, file)
+        # Links to folders are not walked, so they are handled like files
+        for name in subfolders:
+            path = os.path.join(folder, name)
+            if os.path.islink(path):
+                files.append(name)
+            elif path not in removed_folders:
+                kept_entries += 1
 
-        # Recursion is used in case a directory is found
-        if os.path.isdir(source_path):
-            _copytree(source_path, dest_path)
-        else:
-            shutil.copy2(source_path, dest_path)
+        for name in files:
+            if relative_folder / name in desired_files:
+                kept_entries += 1
+                continue
+            path = os.path.join(folder, name)
+            if not dry_run:
+                os.unlink(path)
+            removed.append(Path(path))
+
+        # Subfolders are visited first, so emptiness is known at this point
+        if kept_entries or relative_folder == PurePosixPath() or relative_folder in desired_files:
+            continue
+        if not dry_run:
+            os.rmdir(folder)
+        removed_folders.add(folder)
+        removed.append(Path(folder))
+
+    return removed
+
+
+@profiled("rename_files")
+def rename_files(files_list: list[tuple[str, str]], project_path=Path(os.getcwd())):
+    """Rename files in the project.
 
+    Parameters
+    ----------
+    files_list : list
+        List of tuples containing the original and new file names.
+    project_path : Path
+        Project's root directory.
 
-def _copy_common_template_files(common_path, project_path):
     """
-    Copy common template files into desired project directory.
+    project_path = Path(project_path).absolute()
+    for old_name, new_name in files_list:
+        old_file = (project_path / old_name).absolute()
+        new_file = (project_path / new_name).absolute()
+        new_file.parent.mkdir(parents=True, exist_ok=True)
+        old_file.rename(new_file)
+        for parent in old_file.parents:
+            if parent == project_path:
+                break
+            if not os.listdir(parent):
+                parent.rmdir()
+
+
+def _canonical_setting(value, project_path):
+    """Return a JSON serializable form of an isort setting.
+
+    Paths below the project are made relative to it, so the form does not
+    depend on where the project is baked.
+
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(str(_canonical_setting(item, project_path)) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_setting(item, project_path) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical_setting(item, project_path) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (str, os.PathLike)):
+        path = os.fspath(value)
+        if path == project_path or path.startswith(project_path + os.sep):
+            return PurePosixPath(*Path(os.path.relpath(path, project_path)).parts).as_posix()
+        return path
+    return value
+
+
+def _get_isort_settings(project_path, line_length, profile):
+    """
+    Return the isort configuration of a project and a digest of its settings.
+
+    The configuration file of the project is read if it exists. Its root is
+    always the project, even if the file cannot be parsed.
 
     Parameters
     ----------
-    common_path : ~pathlib.Path
-        Path to the common template directory.
-    project_path : ~pathlib.Path
-        Path to the baked project directory.
+    project_path : str
+        Project's root directory.
+    line_length : int
+        Maximum length of a line.
+    profile : str
+        Name of the isort profile.
+
+    Returns
+    -------
+    tuple
+        The :class:`isort.settings.Config` and the SHA-256 digest of its
+        settings.
 
     """
-    _copytree(
-        common_path / "{{cookiecutter.__project_name_slug}}",
-        project_path / "{{cookiecutter.__project_name_slug}}",
+    import isort.settings
+
+    config = isort.settings.Config(
+        line_length=line_length,
+        profile=profile,
+        settings_path=project_path,
+        directory=project_path,
     )
+    # Sources only tell where each setting comes from
+    settings = {
+        config_field.name: _canonical_setting(getattr(config, config_field.name), project_path)
+        for config_field in fields(config)
+        if config_field.name != "sources"
+    }
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+    return config, digest
+
+
+def _sort_code(content, file_path, config):
+    """Sort the imports of the content of a Python file."""
+    import isort.api
 
+    return isort.api.sort_code_string(content, config=config, file_path=Path(file_path))
 
-def _copy_all_template_files(template_path, project_path):
+
+@profiled("sort_imports")
+def sort_imports(
+    filepaths, project_path=None, line_length=100, profile="black", jobs=None, use_cache=True
+):
     """
-    Copy all template files including cookiecutter.json and hooks/ directory.
+    Sort the imports of Python files of a baked project with isort.
+
+    All the files are processed in a single batch. The sorted content of each
+    file is stored in the cache with a key made of the SHA-256 digest of its
+    content, the line length, the profile and a digest of the isort settings
+    of the project. Files rendered alike by several bakes are only sorted once.
+    Files missing from the cache are sorted concurrently.
 
     Parameters
     ----------
-    template_path : ~pathlib.Path
-        Path to the template directory.
-    project_path : ~pathlib.Path
+    filepaths : list
+        Paths of the Python files.
+    project_path : ~pathlib.Path, optional
+        Project's root directory, from which the isort settings are read.
+        Default is the current working directory.
+    line_length : int
+        Maximum length of a line. Default is ``100``.
+    profile : str
+        Name of the isort profile. Default is ``"black"``.
+    jobs : int, optional
+        Maximum number of processes sorting the files missing from the cache.
+        Default is the number of CPUs. If ``1``, files are sorted in the
+        current process.
+    use_cache : bool
+        Read and store the sorted files in the cache. Default is ``True``.
+
+    Returns
+    -------
+    list
+        Paths of the files whose imports were sorted.
+
+    """
+    project_path = str(Path(project_path or os.getcwd()).absolute())
+    line_length = int(line_length)
+    config, settings_digest = _get_isort_settings(project_path, line_length, profile)
+
+    contents, entries, sorted_contents = {}, {}, {}
+    for filepath in map(Path, filepaths):
+        with open(filepath, encoding="utf-8", newline="") as source_file:
+            contents[filepath] = source_file.read()
+        content_digest = hashlib.sha256(contents[filepath].encode("utf-8")).hexdigest()
+        entries[filepath] = get_cache_entry(
+            "isort", f"{content_digest[:32]}-{line_length}-{profile}-{settings_digest[:16]}.py"
+        )
+        if use_cache and entries[filepath].is_file():
+            touch_cache_entry(entries[filepath])
+            with open(entries[filepath], encoding="utf-8", newline="") as cached_file:
+                sorted_contents[filepath] = cached_file.read()
+
+    pending = [filepath for filepath in contents if filepath not in sorted_contents]
+    jobs = min(jobs or os.cpu_count() or 1, len(pending))
+    arguments = ([contents[path] for path in pending], pending, [config] * len(pending))
+    if jobs <= 1:
+        results = list(map(_sort_code, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_sort_code, *arguments))
+
+    for filepath, sorted_content in zip(pending, results):
+        sorted_contents[filepath] = sorted_content
+        if use_cache:
+            entry = entries[filepath]
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp_entry = entry.with_name(f".{entry.name}.{os.getpid()}")
+            with open(tmp_entry, "w", encoding="utf-8", newline="") as cached_file:
+                cached_file.write(sorted_content)
+            os.replace(tmp_entry, entry)
+    if use_cache and pending:
+        written_size = sum(len(sorted_contents[filepath].encode("utf-8")) for filepath in pending)
+        record_cache_write(written_size, keep=entries.values())
+
+    changed = []
+    for filepath, content in contents.items():
+        if sorted_contents[filepath] != content:
+            with open(filepath, "w", encoding="utf-8", newline="") as target_file:
+                target_file.write(sorted_contents[filepath])
+            changed.append(filepath)
+    return changed
+
+
+def _copy_content(source, destination, size):
+    """Copy the content of an open file into another one."""
+    # The request number of FICLONE means something else on other platforms
+    if fcntl is not None and _FICLONE is not None:
+        try:
+            fcntl.ioctl(destination.fileno(), _FICLONE, source.fileno())
+            return
+        except OSError:
+            pass
+
+    if hasattr(os, "copy_file_range"):
+        copied = 0
+        try:
+            while copied < size:
+                count = os.copy_file_range(source.fileno(), destination.fileno(), size - copied)
+                if count == 0:
+                    break
+                copied += count
+            return
+        except OSError:
+            # Start over if the file system does not support it
+            destination.truncate(0)
+            source.seek(0)
+            destination.seek(0)
+
+    shutil.copyfileobj(source, destination)
+
+
+def _copy_file(source_path, destination_path):
+    """
+    Copy the content and permissions of a file using the fastest method available.
+
+    On Linux, the file is cloned if the file system supports reflinks.
+    Otherwise, the copy is performed by the kernel through ``copy_file_range``
+    if available or through :func:`shutil.copyfileobj`. Permissions are only
+    changed if they differ from the ones of the new file, and timestamps are
+    not preserved.
+
+    Parameters
+    ----------
+    source_path : ~pathlib.Path
+        Path to the file to be copied.
+    destination_path : ~pathlib.Path
+        Path to the new file.
+
+    Returns
+    -------
+    int
+        Number of bytes copied.
+
+    """
+    with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+        source_stat = os.fstat(source.fileno())
+        _copy_content(source, destination, source_stat.st_size)
+
+        mode = stat.S_IMODE(source_stat.st_mode)
+        if not hasattr(os, "fchmod"):
+            destination.close()
+            os.chmod(destination_path, mode)
+        elif stat.S_IMODE(os.fstat(destination.fileno()).st_mode) != mode:
+            os.fchmod(destination.fileno(), mode)
+
+    return source_stat.st_size
+
+
+@dataclass
+class CopyStats:
+    """Amount of data copied by :func:`copy_files`."""
+
+    files: int = 0
+    """Number of files copied."""
+
+    bytes: int = 0
+    """Number of bytes copied."""
+
+    def update(self, other):
+        """Add the amounts of another instance to this one."""
+        self.files += other.files
+        self.bytes += other.bytes
+
+
+def copy_files(files, jobs=None):
+    """
+    Copy files concurrently on a pool of threads.
+
+    Parent directories of the new files are created first, once per
+    directory.
+
+    Parameters
+    ----------
+    files : list
+        Pairs of source and destination paths.
+    jobs : int, optional
+        Maximum number of threads copying files. Default is the number of CPUs
+        plus four, up to 32. If ``1``, files are copied in the current thread.
+
+    Returns
+    -------
+    CopyStats
+        Number of files and bytes copied.
+
+    """
+    files = list(files)
+    for directory in {os.path.dirname(destination) for _, destination in files}:
+        os.makedirs(directory, exist_ok=True)
+
+    jobs = min(jobs or _COPY_WORKERS, len(files))
+    if jobs <= 1:
+        sizes = [_copy_file(source, destination) for source, destination in files]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            sizes = list(executor.map(lambda paths: _copy_file(*paths), files))
+
+    return CopyStats(files=len(sizes), bytes=sum(sizes))
+
+
+def _scan_tree(source, destination):
+    """Collect the directories and files to be copied from a directory."""
+    directories, files = [destination], []
+    with os.scandir(source) as entries:
+        for entry in entries:
+            target = os.path.join(destination, entry.name)
+            if entry.is_dir():
+                subdirectories, subfiles = _scan_tree(entry.path, target)
+                directories.extend(subdirectories)
+                files.extend(subfiles)
+            else:
+                files.append((entry.path, target))
+    return directories, files
+
+
+def copy_tree(source, destination, jobs=None):
+    """
+    Copy the contents of a directory into another one.
+
+    The source directory is scanned with :func:`os.scandir`, so each entry is
+    only checked once, and files are copied with :func:`copy_files`. Existing
+    files in the destination directory are overwritten.
+
+    Parameters
+    ----------
+    source : ~pathlib.Path
+        Path to the directory to be copied.
+    destination : ~pathlib.Path
+        Path to the directory receiving the copy. It is created if required.
+    jobs : int, optional
+        Maximum number of threads copying files. See :func:`copy_files`.
+
+    Returns
+    -------
+    CopyStats
+        Number of files and bytes copied.
+
+    """
+    directories, files = _scan_tree(os.fspath(source), os.fspath(destination))
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    return copy_files(files, jobs=jobs)
+
+
+def _render_path(path, context, environment):
+    """Render a path holding Jinja variables."""
+    return environment.from_string(path).render(**context)
+
+
+@lru_cache(maxsize=64)
+def _compile_hook(source, filename):
+    """Compile the rendered source of a hook, reused by bakes rendering it alike.
+
+    Returns ``None`` if the hook does not define a top-level ``main`` function,
+    so hooks which only run as scripts are never executed in process.
+
+    """
+    tree = ast.parse(source, filename)
+    if not any(isinstance(node, ast.FunctionDef) and node.name == "main" for node in tree.body):
+        return None
+    return compile(tree, filename, "exec")
+
+
+def _run_hook_in_process(script, project_dir, context):
+    """
+    Run the ``main`` function of a Python hook in the current interpreter.
+
+    The hook is rendered like cookiecutter does before running it in a
+    subprocess. Its ``main`` function receives the path to the project, so the
+    working directory of the interpreter is not changed.
+
+    Parameters
+    ----------
+    script : str
+        Path to the hook script.
+    project_dir : str
         Path to the baked project directory.
+    context : dict
+        Cookiecutter context.
+
+    Returns
+    -------
+    bool
+        ``False`` if the hook does not define a ``main`` function, in which case
+        it needs to run in a subprocess.
+
+    Raises
+    ------
+    FailedHookException
+        If the hook raises an exception or exits with a non-zero status.
 
     """
-    _copytree(
-        template_path,
-        project_path,
-    )
+    with open(script, encoding="utf-8") as hook_file:
+        contents = hook_file.read()
+    environment = StrictEnvironment(context=context, keep_trailing_newline=True)
+    source = environment.from_string(contents).render(**context)
+
+    # Hooks without a main function are left to the subprocess before any of
+    # their code runs, so their side effects do not happen twice
+    code = _compile_hook(source, script)
+    if code is None:
+        return False
+
+    namespace = {"__name__": "__ansys_templates_hook__", "__file__": script}
+    try:
+        exec(code, namespace)
+        namespace["main"](project_path=project_dir)
+    except SystemExit as err:
+        if err.code not in (None, 0):
+            raise FailedHookException(f"Hook script failed (exit status: {err.code})") from err
+    except Exception as err:
+        raise FailedHookException(f"Hook script failed (error: {err})") from err
+    return True
+
 
+def _run_hook(
+    overlay, hook_name, project_dir, context, delete_project_on_failure, in_process=False
+):
+    """
+    Run a hook of the template from the baked project directory.
+
+    The ``_use_cache`` variable of the context rendering the hook holds
+    whether the overlay uses the cache, so the hooks can do the same.
+
+    Parameters
+    ----------
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    hook_name : str
+        Name of the hook to be executed.
+    project_dir : str
+        Path to the baked project directory.
+    context : dict
+        Cookiecutter context.
+    delete_project_on_failure : bool
+        Remove the baked project if the hook fails.
+    in_process : bool
+        Run the Python hooks of the templates shipped with ``ansys-templates``
+        in the current interpreter instead of a subprocess. Default is
+        ``False``.
 
-def _include_license(license_path, project_path):
     """
-    Include a desired license into the baked project.
+    scripts = find_hook(hook_name, hooks_dir=str(overlay.template_path / "hooks")) or []
+    in_process = in_process and find_template(overlay.template_path) is not None
+    # Hooks are told whether they may use the cache through a private variable
+    context = {
+        **context,
+        "cookiecutter": {**context["cookiecutter"], "_use_cache": overlay.use_cache},
+    }
+    profiler = get_profiler()
+    for script in scripts:
+        try:
+            with span(hook_name, "hook", script=os.path.basename(script)):
+                if in_process and script.endswith(".py"):
+                    if _run_hook_in_process(script, project_dir, context):
+                        continue
+                with collect_hook_spans(profiler) if profiler is not None else nullcontext():
+                    run_script_with_context(script, project_dir, context)
+        except (FailedHookException, UndefinedError):
+            if delete_project_on_failure:
+                shutil.rmtree(project_dir, ignore_errors=True)
+            logger.error(
+                "Stopping generation because %s hook script didn't exit successfully", hook_name
+            )
+            raise
+
+
+def _generate_file(overlay, infile, project_dir, context, environment, skip_if_file_exists):
+    """
+    Render a file of the template into the baked project.
 
     Parameters
     ----------
-    license_path : ~pathlib.Path
-        Path to the license template.
-    project_path : ~pathlib.Path
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    infile : str
+        Path of the file relative to the project directory of the template.
+    project_dir : str
         Path to the baked project directory.
+    context : dict
+        Cookiecutter context.
+    environment : ~jinja2.Environment
+        Environment used to render the file.
+    skip_if_file_exists : bool
+        Do not overwrite files which already exist.
+
+    Returns
+    -------
+    tuple or None
+        Source and destination paths if the file must be copied instead of
+        rendered, ``None`` otherwise.
+
+    """
+    outfile = os.path.join(project_dir, _render_path(infile, context, environment))
+    if os.path.isdir(outfile) or (skip_if_file_exists and os.path.exists(outfile)):
+        return None
+
+    relative_path = f"{PROJECT_DIR_NAME}/{infile}"
+    source_path = overlay.resolve(relative_path)
+
+    # Binary files, static files and those which must not be rendered are
+    # simply copied. Static files are rendered if newlines are customized or
+    # Jinja uses different delimiters
+    kind = overlay.get_kind(relative_path)
+    is_static = kind == STATIC and not (
+        context["cookiecutter"].get("_new_lines") or context["cookiecutter"].get("_jinja2_env_vars")
+    )
+    if is_copy_only_path(infile, context) or kind == BINARY or is_static:
+        return source_path, outfile
+
+    with span("render", "file", path=infile):
+        os.makedirs(os.path.dirname(outfile), exist_ok=True)
+        try:
+            template = environment.get_template(infile)
+        except TemplateSyntaxError as exception:
+            # Disable translated so that printed exception contains verbose
+            # information about syntax error location
+            exception.translated = False
+            raise
+        rendered_file = template.render(**context)
+
+        newline = context["cookiecutter"].get("_new_lines") or overlay.get_newline(relative_path)
+        with open(outfile, "w", encoding="utf-8", newline=newline) as file:
+            file.write(rendered_file)
+
+        shutil.copymode(source_path, outfile)
+    return None
+
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache accounting for the compiled templates written to the cache."""
+
+    def dump_bytecode(self, bucket):
+        """Store the compiled template and evict old entries if required."""
+        # The entry may have been evicted by a concurrent process
+        os.makedirs(self.directory, exist_ok=True)
+        super().dump_bytecode(bucket)
+        try:
+            size = os.path.getsize(self._get_cache_filename(bucket))
+        except OSError:
+            return
+        record_cache_write(size, keep=[Path(self.directory)])
+
+
+def get_environment_key(context):
+    """
+    Return a digest of the settings of the Jinja environment declared by a context.
+
+    Contexts sharing the same key can be rendered by the same environment, and
+    their compiled templates can be shared.
+
+    Parameters
+    ----------
+    context : dict
+        Cookiecutter context declaring the Jinja extensions and environment
+        variables.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the ``_extensions`` and ``_jinja2_env_vars``
+        variables.
+
+    """
+    variables = context["cookiecutter"]
+    settings = [variables.get("_extensions", []), variables.get("_jinja2_env_vars", {})]
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def _get_bytecode_cache(overlay, environment_key):
+    """
+    Return the bytecode cache holding the compiled templates of an overlay.
+
+    Parameters
+    ----------
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    environment_key : str
+        Digest of the settings of the environment compiling the templates, as
+        templates compiled with other delimiters or extensions differ.
+
+    Returns
+    -------
+    ~jinja2.FileSystemBytecodeCache
+        Bytecode cache stored in the cache of ansys-templates.
+
+    """
+    key = f"{overlay.template_path.name}-{overlay.fingerprint[:32]}-{environment_key[:16]}"
+    entry = get_cache_entry("bytecode", key)
+    if entry.is_dir():
+        touch_cache_entry(entry)
+    else:
+        entry.mkdir(parents=True, exist_ok=True)
+    return _BytecodeCache(str(entry))
+
+
+def create_environment(overlay, context):
+    """
+    Create the Jinja environment used to render the files of an overlay.
+
+    Parameters
+    ----------
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    context : dict
+        Cookiecutter context declaring the Jinja extensions and environment
+        variables.
+
+    Returns
+    -------
+    ~cookiecutter.environment.StrictEnvironment
+        Environment loading the templates from the overlay. If the overlay
+        uses the cache, compiled templates are stored in it and reused by
+        later bakes of the same template.
+
+    """
+    envvars = context["cookiecutter"].get("_jinja2_env_vars", {})
+    environment = StrictEnvironment(context=context, keep_trailing_newline=True, **envvars)
+    environment.loader = OverlayLoader(overlay)
+    if overlay.use_cache:
+        environment.bytecode_cache = _get_bytecode_cache(overlay, get_environment_key(context))
+    return environment
+
+
+def generate_files(
+    overlay,
+    context,
+    output_dir,
+    overwrite_if_exists=False,
+    skip_if_file_exists=False,
+    accept_hooks=True,
+    keep_project_on_failure=False,
+    environment=None,
+    copy_stats=None,
+    in_process_hooks=False,
+):
+    """
+    Render the files of a template overlay into a new project.
+
+    Parameters
+    ----------
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    context : dict
+        Cookiecutter context.
+    output_dir : ~pathlib.Path
+        Directory where the project gets created.
+    overwrite_if_exists : bool
+        Overwrite the contents of the project if it already exists.
+    skip_if_file_exists : bool
+        Do not overwrite files which already exist.
+    accept_hooks : bool
+        Run the hooks of the template.
+    keep_project_on_failure : bool
+        Keep the project if its generation fails.
+    environment : ~jinja2.Environment, optional
+        Environment used to render the files. Reusing an environment across
+        projects baked from the same template saves compiling the templates
+        again. Default is a new environment created with
+        :func:`create_environment`.
+    copy_stats : CopyStats, optional
+        Instance updated with the number of files and bytes copied instead of
+        rendered.
+    in_process_hooks : bool
+        Run the Python hooks of the templates shipped with ``ansys-templates``
+        in the current interpreter instead of a subprocess. Default is
+        ``False``.
+
+    Returns
+    -------
+    str
+        Path to the baked project.
 
     Notes
     -----
-    This function is intended to be used during the pre_gen_project.py hook.
+    This function mimics :func:`cookiecutter.generate.generate_files` but reads
+    the files through the overlay instead of a template directory.
 
     """
-    shutil.copyfile(license_path, project_path / "{{cookiecutter.__project_name_slug}}/LICENSE")
+    if environment is None:
+        environment = create_environment(overlay, context)
 
+    try:
+        project_dir, output_directory_created = render_and_create_dir(
+            PROJECT_DIR_NAME, context, output_dir, environment, overwrite_if_exists
+        )
+    except UndefinedError as err:
+        msg = f"Unable to create project directory '{PROJECT_DIR_NAME}'"
+        raise UndefinedVariableInTemplate(msg, err, context) from err
+    project_dir = os.path.abspath(project_dir)
 
-def remove_file(filename, project_path=Path(os.getcwd())):
-    """Remove desired file being given its relative path to project.
+    # If the project directory was created, then it can be removed on failure
+    delete_project_on_failure = output_directory_created and not keep_project_on_failure
+
+    if accept_hooks:
+        _run_hook(
+            overlay,
+            "pre_gen_project",
+            project_dir,
+            context,
+            delete_project_on_failure,
+            in_process=in_process_hooks,
+        )
+
+    # Files which do not need rendering are collected and copied concurrently
+    # once all the others have been rendered
+    copies = []
+
+    # Only the files declared by the manifest of the template are rendered
+    for infile in overlay.select(context, environment):
+        # Files inside directories which must not be rendered are copied as is,
+        # only the name of the directory gets rendered
+        copy_only_dir = next(
+            (
+                parent
+                for parent in reversed(list(Path(infile).parents)[:-1])
+                if is_copy_only_path(str(parent), context)
+            ),
+            None,
+        )
+        try:
+            if copy_only_dir is not None:
+                outdir = _render_path(copy_only_dir.as_posix(), context, environment)
+                outfile = Path(project_dir, outdir, Path(infile).relative_to(copy_only_dir))
+                copies.append((overlay.resolve(f"{PROJECT_DIR_NAME}/{infile}"), outfile))
+                continue
+
+            copy = _generate_file(
+                overlay, infile, project_dir, context, environment, skip_if_file_exists
+            )
+            if copy is not None:
+                copies.append(copy)
+        except UndefinedError as err:
+            if delete_project_on_failure:
+                shutil.rmtree(project_dir, ignore_errors=True)
+            msg = f"Unable to create file '{infile}'"
+            raise UndefinedVariableInTemplate(msg, err, context) from err
+
+    with span("copy", files=len(copies)):
+        stats = copy_files(copies)
+    logger.debug("Copied %d files (%d bytes) into %s", stats.files, stats.bytes, project_dir)
+    if copy_stats is not None:
+        copy_stats.update(stats)
+
+    if accept_hooks:
+        _run_hook(
+            overlay,
+            "post_gen_project",
+            project_dir,
+            context,
+            delete_project_on_failure,
+            in_process=in_process_hooks,
+        )
+
+    return project_dir
+
+
+def _generate_context(
+    template_path,
+    output_path,
+    no_input=False,
+    extra_context=None,
+    config_file=None,
+    default_config=False,
+    replay=None,
+):
+    """
+    Generate the cookiecutter context of a template.
+
+    The user is prompted for the values of the variables unless ``no_input``
+    is ``True`` or the context is replayed.
 
     Parameters
     ----------
-    filename : str
-        Filename relative to project root directory.
-    project_path : Path
-        Project's root directory.
+    template_path : ~pathlib.Path
+        Path to the template.
+    output_path : ~pathlib.Path
+        Output path for the baked template.
+    no_input : bool
+        Do not prompt for user input.
+    extra_context : dict
+        Variables overriding the default ones of the template.
+    config_file : str
+        Path to the cookiecutter user configuration file.
+    default_config : bool
+        Use the default cookiecutter configuration instead of the user one.
+    replay : bool or str, optional
+        Reuse the context of the last bake of the template stored in the
+        cookiecutter replay directory if ``True``, or the one stored in the
+        given replay file.
+
+    Returns
+    -------
+    dict
+        Cookiecutter context.
+
+    Raises
+    ------
+    InvalidModeException
+        If ``replay`` is combined with ``no_input`` or ``extra_context``.
 
     """
-    filepath = project_path / filename
-    filepath.unlink()
+    if replay and (no_input is not False or extra_context is not None):
+        raise InvalidModeException(
+            "You can not use both replay and no_input or extra_context at the same time."
+        )
 
+    config_dict = get_user_config(config_file=config_file, default_config=default_config)
 
-def keep_files(files_list, project_path=Path(os.getcwd())):
-    """Remove undesired files except given ones from project.
+    if replay:
+        if isinstance(replay, bool):
+            context = load(config_dict["replay_dir"], template_path.name)
+        else:
+            replay_dir, replay_name = os.path.split(os.path.splitext(replay)[0])
+            context = load(replay_dir, replay_name)
+    else:
+        context = generate_context(
+            context_file=str(template_path / "cookiecutter.json"),
+            default_context=config_dict["default_context"],
+            extra_context=extra_context,
+        )
+
+        # Preserve the original options and prompt for the final ones
+        context["_cookiecutter"] = {
+            key: value for key, value in context["cookiecutter"].items() if not key.startswith("_")
+        }
+        context["cookiecutter"].update(prompt_for_config(context, no_input))
+
+    context["cookiecutter"]["_template"] = str(template_path)
+    context["cookiecutter"]["_output_dir"] = os.path.abspath(output_path)
+    context["cookiecutter"]["_repo_dir"] = str(template_path)
+
+    dump(config_dict["replay_dir"], template_path.name, context)
+    return context
+
+
+def _get_project_path(output_path, context, environment):
+    """Return the path of the project baked from a context."""
+    project_name = _render_path(PROJECT_DIR_NAME, context, environment)
+    return Path(os.path.normpath(os.path.join(os.path.abspath(output_path), project_name)))
+
+
+def _create_staging_dir(project_path, overwrite_if_exists=False):
+    """
+    Create a directory for baking a project next to its final location.
+
+    The staging directory is a hidden sibling of the project, so both live in
+    the same file system and the baked files can be renamed into place.
 
     Parameters
     ----------
-    files_list : list
-        Desired file names relative to project's root directory.
-    project_path : Path
-        Project's root directory.
+    project_path : ~pathlib.Path
+        Final path of the project.
+    overwrite_if_exists : bool
+        Allow the project to exist already.
+
+    Returns
+    -------
+    str
+        Path to the staging directory.
+
+    Raises
+    ------
+    OutputDirExistsException
+        If the project already exists and it must not be overwritten.
 
     """
-    # Collect all the files in the project
-    all_project_files = project_path.glob("**/*")
+    if project_path.exists() and not overwrite_if_exists:
+        raise OutputDirExistsException(f'Error: "{project_path}" directory already exists')
+    project_path.parent.mkdir(parents=True, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f".{project_path.name}.staging-", dir=project_path.parent)
 
-    # Fix path name according to OS flavor
-    separator, new_separator = ("/", "\\") if os.name != "posix" else ("/", "/")
-    desired_files = [file.replace(separator, new_separator) for file in files_list]
 
-    folders = []
-    # Removing undesired files
-    for file in all_project_files:
-        if str(file.relative_to(project_path)).replace(separator, new_separator) not in desired_files:
-            file.unlink() if file.is_file() else folders.append(file)
+def _is_same_file(source, target):
+    """Check if two files have the same content and permissions."""
+    source_stat, target_stat = os.lstat(source), os.lstat(target)
+    if stat.S_ISLNK(source_stat.st_mode) or stat.S_ISLNK(target_stat.st_mode):
+        return (
+            stat.S_ISLNK(source_stat.st_mode)
+            and stat.S_ISLNK(target_stat.st_mode)
+            and os.readlink(source) == os.readlink(target)
+        )
+    return (
+        stat.S_ISREG(target_stat.st_mode)
+        and source_stat.st_size == target_stat.st_size
+        and stat.S_IMODE(source_stat.st_mode) == stat.S_IMODE(target_stat.st_mode)
+        and filecmp.cmp(source, target, shallow=False)
+    )
 
-    folders = sorted(folders, reverse=True)
 
-    # Removing undesired empty folders
-    [folder.rmdir() for folder in folders if not os.listdir(str(folder))]
+def move_into_place(staged_path, project_path, skip_if_file_exists=False):
+    """
+    Move a project baked in a staging directory to its final location.
 
+    If the project does not exist yet, the staging directory is renamed, which
+    is atomic within a file system. Otherwise, the baked files are renamed one
+    by one over the ones of the project. Files whose content and permissions
+    did not change are left untouched, so their modification time is
+    preserved. Files of the project which were not baked are kept.
 
-def rename_files(files_list: list[tuple[str, str]], project_path=Path(os.getcwd())):
-    """Rename files in the project.
+    Parameters
+    ----------
+    staged_path : ~pathlib.Path
+        Path to the project baked in the staging directory.
+    project_path : ~pathlib.Path
+        Final path of the project.
+    skip_if_file_exists : bool
+        Do not overwrite files which already exist in the project.
+
+    Returns
+    -------
+    list
+        Paths of the written files relative to the project, using forward
+        slashes.
+
+    """
+    staged_path, project_path = os.fspath(staged_path), os.fspath(project_path)
+    if not os.path.lexists(project_path):
+        os.rename(staged_path, project_path)
+        return sorted(
+            Path(os.path.relpath(os.path.join(folder, name), project_path)).as_posix()
+            for folder, _, filenames in os.walk(project_path)
+            for name in filenames
+        )
+
+    written = []
+    for folder, subfolders, filenames in os.walk(staged_path):
+        relative_folder = os.path.relpath(folder, staged_path)
+        target_folder = os.path.normpath(os.path.join(project_path, relative_folder))
+        os.makedirs(target_folder, exist_ok=True)
+
+        # Links to folders are not walked, so they are moved like files
+        filenames += [name for name in subfolders if os.path.islink(os.path.join(folder, name))]
+        for name in filenames:
+            source, target = os.path.join(folder, name), os.path.join(target_folder, name)
+            if os.path.lexists(target) and (skip_if_file_exists or _is_same_file(source, target)):
+                continue
+            os.replace(source, target)
+            written.append(Path(os.path.relpath(target, project_path)).as_posix())
+    return sorted(written)
+
+
+def _generate_project(
+    overlay,
+    context,
+    output_path,
+    environment=None,
+    staged=False,
+    record=False,
+    overwrite_if_exists=False,
+    skip_if_file_exists=False,
+    keep_project_on_failure=False,
+    **generate_kwargs,
+):
+    """
+    Generate a project and record how it was baked.
 
     Parameters
     ----------
-    files_list : list
-        List of tuples containing the original and new file names.
-    project_path : Path
-        Project's root directory.
+    overlay : ~ansys.templates.overlay.TemplateOverlay
+        Overlay providing the template files.
+    context : dict
+        Cookiecutter context.
+    output_path : ~pathlib.Path
+        Output path for the baked project.
+    environment : ~jinja2.Environment, optional
+        Environment rendering the templates. Default is a new environment
+        created by :func:`create_environment`.
+    staged : bool
+        Bake the project in a staging directory and move it into place once
+        complete. See :func:`bake_template`.
+    record : bool
+        Store the variables and the baked files inside the project.
+    overwrite_if_exists : bool
+        Overwrite the contents of the project if it already exists.
+    skip_if_file_exists : bool
+        Do not overwrite files which already exist.
+    keep_project_on_failure : bool
+        Keep the project, or the staging directory, if its generation fails.
+    **generate_kwargs : dict
+        Additional keyword arguments of :func:`generate_files`.
+
+    Returns
+    -------
+    str
+        Path to the baked project.
 
     """
-    for old_name, new_name in files_list:
-        old_file = (project_path / old_name).absolute()
-        new_file = (project_path / new_name).absolute()
-        new_file.parent.mkdir(parents=True, exist_ok=True)
-        old_file.rename(new_file)
-        for parent in old_file.parents:
-            if parent == project_path:
-                break
-            if not os.listdir(parent):
-                parent.rmdir()
+    if environment is None:
+        environment = create_environment(overlay, context)
+    if staged:
+        project_path = _get_project_path(output_path, context, environment)
+        staging_path = _create_staging_dir(project_path, overwrite_if_exists)
+
+    try:
+        with span("generate"):
+            baked_path = generate_files(
+                overlay,
+                context,
+                staging_path if staged else output_path,
+                environment=environment,
+                overwrite_if_exists=overwrite_if_exists or staged,
+                skip_if_file_exists=skip_if_file_exists and not staged,
+                keep_project_on_failure=keep_project_on_failure,
+                **generate_kwargs,
+            )
+        if record:
+            with span("record"):
+                write_record(
+                    baked_path,
+                    overlay.template_path,
+                    overlay.license_path,
+                    context,
+                    overlay.fingerprint,
+                )
+    except BaseException:
+        if staged and not keep_project_on_failure:
+            shutil.rmtree(staging_path, ignore_errors=True)
+        raise
+
+    if not staged:
+        return baked_path
+    with span("move"):
+        move_into_place(baked_path, project_path, skip_if_file_exists)
+    shutil.rmtree(staging_path, ignore_errors=True)
+    return str(project_path)
+
+
+_CONTEXT_KWARGS = {"no_input", "extra_context", "config_file", "default_config", "replay"}
+"""Cookiecutter keyword arguments accepted by :func:`bake_template`."""
+
 
-def bake_template(template_path, output_path, license_path=MIT_LICENSE, **cookiecutter_kwargs):
+def bake_template(
+    template_path,
+    output_path,
+    license_path=MIT_LICENSE,
+    use_cache=True,
+    overwrite_if_exists=False,
+    skip_if_file_exists=False,
+    accept_hooks=True,
+    keep_project_on_failure=False,
+    record=False,
+    profile=None,
+    in_process_hooks=False,
+    staged=False,
+    **context_kwargs,
+):
     """
     Bakes project using desired template and common files.
 
@@ -198,43 +1224,442 @@ def bake_template(template_path, output_path, license_path=MIT_LICENSE, **cookie
         Output path for the baked template.
     license_path: ~pathlib.Path
         Path to license file. Default is MIT.
-    **cookiecutter_kwargs: dict
-        Additional cookiecutter keyword arguments.
+    use_cache: bool
+        Reuse the properties of the template files and the compiled templates
+        stored in the cache. Default is ``True``.
+    overwrite_if_exists : bool
+        Overwrite the contents of the project if it already exists.
+    skip_if_file_exists : bool
+        Do not overwrite files which already exist.
+    accept_hooks : bool
+        Run the hooks of the template.
+    keep_project_on_failure : bool
+        Keep the project if its generation fails.
+    record : bool
+        Store the variables and the baked files inside the project, so it can
+        later be updated with :func:`update_project`. Default is ``False``.
+    profile : str, ~pathlib.Path or ~ansys.templates.profiling.Profiler, optional
+        Record the time spent in each phase of the bake, each hook and each
+        rendered file. If a path is given, the spans are written to it as a
+        Chrome trace. Otherwise, they are recorded by the given profiler.
+    in_process_hooks : bool
+        Run the Python hooks of the templates shipped with ``ansys-templates``
+        in the current interpreter instead of a subprocess, which saves
+        starting a new interpreter. Default is ``False``.
+    staged : bool
+        Bake the project in a staging directory next to it and move it into
+        place once it is complete, see :func:`move_into_place`. A failed or
+        interrupted bake leaves an existing project untouched. Default is
+        ``False``.
+    **context_kwargs: dict
+        Additional cookiecutter keyword arguments used to generate the context,
+        namely ``no_input``, ``extra_context``, ``config_file``,
+        ``default_config`` and ``replay``.
+
+    Returns
+    -------
+    str
+        Path to the baked project.
+
+    Raises
+    ------
+    TypeError
+        If a keyword argument is not supported. Templates are read from the
+        ``ansys-templates`` package, so the repository options of cookiecutter
+        such as ``checkout``, ``password`` and ``directory`` do not apply.
 
     Notes
     -----
-    Files from the common directory need to be copied before the cookiecutter
+    Files from the common directory need to be available before the cookiecutter
     context initializes. Otherwise, copied files by a hook will not be
-    rendered. This function creates a temporary directory where the common and
-    desired template are combined so then cookiecutter can be executed.
+    rendered. Instead of copying the common and desired template into a single
+    directory, the files are read through a
+    :class:`~ansys.templates.overlay.TemplateOverlay` which resolves each path
+    against the license, the template and the common files.
+
+    """
+    unsupported = sorted(set(context_kwargs) - _CONTEXT_KWARGS)
+    if unsupported:
+        raise TypeError(f"bake_template() got unsupported arguments: {', '.join(unsupported)}")
+
+    template_path, output_path = Path(template_path), Path(output_path)
+    profiler = profile if isinstance(profile, Profiler) or profile is None else Profiler()
+
+    try:
+        with activate(profiler) if profiler is not None else nullcontext():
+            with span("bake", template=template_path.name):
+                with span("overlay"):
+                    overlay = TemplateOverlay(template_path, license_path, use_cache=use_cache)
+                with span("context"):
+                    context = _generate_context(template_path, output_path, **context_kwargs)
+
+                project_path = _generate_project(
+                    overlay,
+                    context,
+                    output_path,
+                    staged=staged,
+                    record=record,
+                    overwrite_if_exists=overwrite_if_exists,
+                    skip_if_file_exists=skip_if_file_exists,
+                    accept_hooks=accept_hooks,
+                    keep_project_on_failure=keep_project_on_failure,
+                    in_process_hooks=in_process_hooks,
+                )
+    finally:
+        if profiler is not None and profiler is not profile:
+            profiler.write_chrome_trace(profile)
+    return project_path
+
+
+def update_project(project_path, use_cache=True, extra_context=None, dry_run=False):
+    """
+    Update a project with the current version of its template.
+
+    The project must have been baked with ``record=True``. The template is
+    baked again in a temporary directory using the recorded variables, and
+    only the files whose baked content changed are applied to the project. See
+    :func:`ansys.templates.update.apply_update`. Nothing is baked if neither the
+    template files nor the variables changed.
+
+    Parameters
+    ----------
+    project_path : ~pathlib.Path
+        Path to the project.
+    use_cache : bool
+        Reuse the properties of the template files and the compiled templates
+        stored in the cache. Default is ``True``.
+    extra_context : dict, optional
+        Variables overriding the recorded ones.
+    dry_run : bool
+        Only report the changes, without modifying the project. Default is
+        ``False``.
+
+    Returns
+    -------
+    ~ansys.templates.update.UpdateResult
+        Changes applied to the project.
 
     """
-    # Create a temporary directory to be used as the final template source
-    with tempfile.TemporaryDirectory() as tmp_template_path:
+    project_path = Path(project_path).absolute()
+    record = read_record(project_path)
+    variables = {**record["context"], **(extra_context or {})}
+    overlay = TemplateOverlay(record["template"], record["license"], use_cache=use_cache)
+    if (
+        overlay.fingerprint == record["fingerprint"]
+        and variables == record["context"]
+        and __version__ == record["version"]
+    ):
+        return UpdateResult(project_path=str(project_path))
 
-        # The common directory can be obtained from the template path
-        common_path = template_path / "../common"
+    with tempfile.TemporaryDirectory() as scratch_path:
+        context = _generate_context(
+            record["template"], scratch_path, no_input=True, extra_context=variables
+        )
+        baked_path = generate_files(overlay, context, scratch_path, overwrite_if_exists=True)
+        result = apply_update(project_path, baked_path, dry_run=dry_run)
+        if not dry_run:
+            write_record(
+                project_path,
+                record["template"],
+                record["license"],
+                context,
+                overlay.fingerprint,
+                baked_path=baked_path,
+            )
+    return result
 
-        # Copy the common and desired template files
-        _copy_common_template_files(common_path, Path(str(tmp_template_path)))
-        _copy_all_template_files(template_path, Path(str(tmp_template_path)))
 
-        # Copy license file
-        _include_license(license_path, Path(str(tmp_template_path)))
+@contextmanager
+def _stdout_to_stderr():
+    """Send everything written to the standard output to the standard error."""
+    sys.stdout.flush()
+    stdout_fd = os.dup(1)
+    try:
+        # Hooks run in subprocesses writing to the file descriptor directly
+        os.dup2(2, 1)
+        with redirect_stdout(sys.stderr):
+            yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(stdout_fd, 1)
+        os.close(stdout_fd)
 
-        # Bake the temporary project using cookiecutter with desired options
-        cookiecutter(str(tmp_template_path), output_dir=str(output_path), **cookiecutter_kwargs)
+
+def bake_archive(
+    template_path,
+    archive_path,
+    archive_format=None,
+    spool_size=ARCHIVE_SPOOL_SIZE,
+    **bake_kwargs,
+):
+    """
+    Bake a project straight into an archive.
+
+    The project is baked in a temporary directory, where the hooks of the
+    template are applied, and then written into the archive. Neither the
+    current directory nor the destination directory of the archive hold any
+    project file.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    archive_path : str
+        Path to the archive or ``"-"`` for writing it to the standard output.
+        When writing to the standard output, anything printed while baking is
+        sent to the standard error instead.
+    archive_format : str, optional
+        One of the keys of :data:`~ansys.templates.archive.ARCHIVE_FORMATS`.
+        Default is guessed from the extension of the archive, or ``"gztar"``
+        for the standard output.
+    spool_size : int
+        Size in bytes above which an archive written to the standard output is
+        buffered on disk instead of in memory. Default is
+        :data:`ARCHIVE_SPOOL_SIZE`.
+    **bake_kwargs : dict
+        Additional keyword arguments passed to :func:`bake_template`.
+
+    Returns
+    -------
+    str
+        Path to the archive or ``"-"``.
+
+    """
+    to_stdout = str(archive_path) == "-"
+    if archive_format is None:
+        archive_format = "gztar" if to_stdout else get_archive_format(archive_path)
+
+    with tempfile.TemporaryDirectory() as scratch_path:
+        if to_stdout:
+            with _stdout_to_stderr():
+                project_path = bake_template(template_path, scratch_path, **bake_kwargs)
+        else:
+            project_path = bake_template(template_path, scratch_path, **bake_kwargs)
+        arcname = os.path.relpath(project_path, scratch_path)
+
+        # Archives are only published once complete, so a failure does not
+        # leave a truncated archive behind
+        if to_stdout:
+            with tempfile.SpooledTemporaryFile(max_size=spool_size) as buffer:
+                with span("archive", format=archive_format):
+                    write_archive(project_path, buffer, archive_format, arcname)
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+            return "-"
+
+        partial_path = f"{archive_path}.part"
+        try:
+            with open(partial_path, "wb") as archive, span("archive", format=archive_format):
+                write_archive(project_path, archive, archive_format, arcname)
+            os.replace(partial_path, archive_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+    return str(archive_path)
+
+
+@dataclass
+class BakeResult:
+    """Outcome of baking a project with :func:`bake_many`."""
+
+    context: dict
+    """Variables used to bake the project."""
+
+    project_path: Optional[str] = None
+    """Path to the baked project, if it was created."""
+
+    timings: dict = field(default_factory=dict)
+    """Elapsed time in seconds for each phase of the bake and in total."""
+
+    copy_stats: CopyStats = field(default_factory=CopyStats)
+    """Files copied without rendering into the project."""
+
+    error: Optional[str] = None
+    """Description of the error raised while baking the project, if any."""
+
+    skipped: bool = False
+    """Whether the bake was skipped because the project is up to date."""
+
+    @property
+    def succeeded(self):
+        """Whether the project was baked without errors."""
+        return self.error is None
+
+
+_BATCH_STATE = {}
+"""Overlay and environments shared by all the bakes of a process."""
+
+
+def _initialize_batch(template_path, license_path, use_cache):
+    """Create the overlay and environment reused by the bakes of a process."""
+    overlay = TemplateOverlay(template_path, license_path, use_cache=use_cache)
+    overlay.load_properties()
+    default_context = generate_context(context_file=str(template_path / "cookiecutter.json"))
+    _BATCH_STATE["template_path"] = template_path
+    _BATCH_STATE["overlay"] = overlay
+    _BATCH_STATE["environments"] = {}
+    _get_batch_environment(default_context)
+
+
+def _get_batch_environment(context):
+    """Return the environment of the batch matching the Jinja settings of a context."""
+    key = get_environment_key(context)
+    environments = _BATCH_STATE["environments"]
+    if key not in environments:
+        environments[key] = create_environment(_BATCH_STATE["overlay"], context)
+    return environments[key]
+
+
+def _bake_one(
+    extra_context, output_root, generate_kwargs, record=False, skip_unchanged=False, staged=False
+):
+    """Bake a single project using the state of the current process."""
+    result = BakeResult(context=extra_context)
+    start = time.perf_counter()
+    try:
+        context = _generate_context(
+            _BATCH_STATE["template_path"],
+            output_root,
+            no_input=True,
+            extra_context=extra_context,
+        )
+        result.timings["context"] = time.perf_counter() - start
+        environment = _get_batch_environment(context)
+
+        if skip_unchanged:
+            overlay = _BATCH_STATE["overlay"]
+            project_path = _get_project_path(output_root, context, environment)
+            if is_up_to_date(project_path, context, overlay.fingerprint):
+                result.project_path = str(project_path)
+                result.skipped = True
+                result.timings["total"] = time.perf_counter() - start
+                return result
+
+        result.project_path = _generate_project(
+            _BATCH_STATE["overlay"],
+            context,
+            output_root,
+            environment=environment,
+            staged=staged,
+            record=record,
+            copy_stats=result.copy_stats,
+            **generate_kwargs,
+        )
+        result.timings["generate"] = time.perf_counter() - start - result.timings["context"]
+    except Exception as err:
+        result.error = f"{type(err).__name__}: {err}"
+    result.timings["total"] = time.perf_counter() - start
+    return result
+
+
+def bake_many(
+    template_path,
+    contexts,
+    output_root,
+    jobs=None,
+    license_path=MIT_LICENSE,
+    use_cache=True,
+    record=False,
+    skip_unchanged=False,
+    staged=False,
+    **generate_kwargs,
+):
+    """
+    Bake one project per context using the same template.
+
+    The overlay of the template and the Jinja environment, including its
+    compiled templates, are created once per process and reused by all the
+    bakes it runs. Contexts declaring other Jinja extensions or environment
+    variables get their own environment.
+
+    Parameters
+    ----------
+    template_path : ~pathlib.Path
+        Path to the template.
+    contexts : list
+        Variables overriding the default ones of the template. A project is
+        baked for each item.
+    output_root : ~pathlib.Path
+        Output path for the baked projects.
+    jobs : int, optional
+        Number of processes baking projects in parallel. Default is the number
+        of CPUs. If ``1``, projects are baked in the current process.
+    license_path : ~pathlib.Path
+        Path to license file. Default is MIT.
+    use_cache : bool
+        Reuse the properties of the template files and the compiled templates
+        stored in the cache. Default is ``True``.
+    record : bool
+        Store the variables and the baked files inside each project. See
+        :func:`bake_template`. Default is ``False``.
+    skip_unchanged : bool
+        Skip the projects whose bake record shows they were already baked from
+        the same template and variables. Requires ``record``, as projects
+        baked without a record cannot be checked. Default is ``False``.
+    staged : bool
+        Bake each project in a staging directory and move it into place once
+        complete. See :func:`bake_template`. Default is ``False``.
+    **generate_kwargs : dict
+        Additional keyword arguments passed to :func:`generate_files`.
+
+    Returns
+    -------
+    list
+        A :class:`BakeResult` for each context, in the same order.
+
+    Raises
+    ------
+    ValueError
+        If ``skip_unchanged`` is requested without ``record``.
+
+    """
+    if skip_unchanged and not record:
+        raise ValueError("Skipping unchanged projects requires recording them.")
+
+    template_path, output_root = Path(template_path), Path(output_root)
+    contexts = list(contexts)
+    jobs = min(jobs or os.cpu_count() or 1, max(len(contexts), 1))
+
+    # The first overlay stores the properties of the files in the cache, so
+    # worker processes only need to read them
+    _initialize_batch(template_path, license_path, use_cache)
+    if jobs == 1:
+        return [
+            _bake_one(context, output_root, generate_kwargs, record, skip_unchanged, staged)
+            for context in contexts
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_initialize_batch,
+        initargs=(template_path, license_path, use_cache),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _bake_one, context, output_root, generate_kwargs, record, skip_unchanged, staged
+            )
+            for context in contexts
+        ]
+        return [future.result() for future in futures]
 
 
 def load_inputs_from_configuration_file(template_path):
     """
-    Read the cookiecutter.json file and return the inputs only.
+    Return the default values of the inputs of a template.
+
+    Inputs are read from the registry of the templates. The cookiecutter.json
+    file is only read for templates which are not part of the package.
 
     Parameters
     ----------
     template_path: ~pathlib.Path
         Path to the template.
     """
+    entry = find_template(template_path)
+    if entry is not None:
+        return dict(entry["variables"])
+
     with open(template_path / "cookiecutter.json", 'r') as json_file:
         configuration = json.load(json_file)
 
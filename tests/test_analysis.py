@@ -0,0 +1,102 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import json
+
+from jinja2 import Environment
+import pytest
+
+from ansys.templates.analysis import ALL_VARIABLES, analyze_template, find_variables, main
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+
+
+@pytest.mark.parametrize(
+    "source, variables",
+    [
+        ("{{ cookiecutter.name }}", {"name"}),
+        ("{% if cookiecutter['the ui'] == 'dash' %}{% endif %}", {"the ui"}),
+        ("{{ cookiecutter.get('name', '') }}", {"name"}),
+        ("{{ cookiecutter | tojson }}", {ALL_VARIABLES}),
+        ("{{ name }}", set()),
+    ],
+)
+def test_find_variables(source, variables):
+    assert find_variables(Environment().parse(source)) == variables
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    template_path = tmp_path / "template"
+    project_path = template_path / "{{cookiecutter.__project_name_slug}}"
+    (project_path / "src/{{cookiecutter.__project_name_slug}}").mkdir(parents=True)
+    (template_path / "hooks").mkdir()
+
+    configuration = {
+        "project_name": "demo",
+        "build_system": ["flit", "setuptools"],
+        "logo": "ansys",
+        "__project_name_slug": "{{ cookiecutter.project_name | lower }}",
+        "_copy_without_render": ["raw.txt"],
+    }
+    manifest = {
+        "files": ["README.rst", "raw.txt", "src/*"],
+        "conditional_files": [{"when": "build_system == 'setuptools'", "files": ["setup.py"]}],
+    }
+    (template_path / "cookiecutter.json").write_text(json.dumps(configuration))
+    (template_path / "manifest.json").write_text(json.dumps(manifest))
+    (template_path / "hooks/post_gen_project.py").write_text("print('{{ cookiecutter.logo }}')\n")
+    (project_path / "README.rst").write_text("{{ cookiecutter.project_name }}\n")
+    (project_path / "raw.txt").write_text("{{ cookiecutter.logo }}\n")
+    (project_path / "setup.py").write_text("print('static')\n")
+    (project_path / "unused.txt").write_text("{{ cookiecutter.logo }}\n")
+    (project_path / "src/{{cookiecutter.__project_name_slug}}/__init__.py").write_text("")
+    return template_path
+
+
+def test_analyze_template(template_path):
+    dependencies = analyze_template(template_path, use_cache=False)
+
+    package = "src/{{cookiecutter.__project_name_slug}}/__init__.py"
+    assert dependencies.files == {
+        "README.rst": {"project_name"},
+        "raw.txt": frozenset(),
+        "setup.py": {"build_system"},
+        package: {"__project_name_slug", "project_name"},
+    }
+    assert dependencies.hooks == {"logo"}
+    assert dependencies.get_graph() == {
+        "__project_name_slug": [package],
+        "build_system": ["setup.py"],
+        "project_name": ["README.rst", package],
+    }
+    assert dependencies.get_affected_files(["build_system"]) == ["setup.py"]
+    assert dependencies.get_affected_files(["logo"]) == sorted(dependencies.files)
+
+
+def test_analyze_bundled_template(capsys):
+    dependencies = analyze_template(TEMPLATE_PATH_FINDER["pyansys-advanced"])
+    assert "pyproject.toml" in dependencies.get_graph()["build_system"]
+    assert "build_system" in dependencies.hooks
+
+    assert main(["pybasic", "--changed", "short_description"]) == 0
+    affected_files = json.loads(capsys.readouterr().out)
+    assert "README.rst" in affected_files
+    assert ".gitignore" not in affected_files
@@ -0,0 +1,127 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from pathlib import Path
+
+from ansys.templates.cache import (
+    CACHE_DIR_ENV_VAR,
+    CACHE_MAX_SIZE_ENV_VAR,
+    evict_cache,
+    get_cache_dir,
+    get_cache_entry,
+    record_cache_write,
+)
+from ansys.templates.paths import PYTHON_TEMPLATES_PYBASIC_PATH
+from ansys.templates.utils import bake_template
+
+
+def test_get_cache_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+    assert get_cache_dir() == tmp_path
+    assert get_cache_entry("templates", "key") == tmp_path / "templates" / "key"
+
+
+def test_evict_cache_removes_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+    entries = [get_cache_entry("templates", name) for name in ["old", "recent", "in-use"]]
+    for timestamp, entry in enumerate(entries):
+        entry.mkdir(parents=True)
+        (entry / "file.txt").write_bytes(b"x" * 10)
+        os.utime(entry, (timestamp, timestamp))
+
+    assert evict_cache(max_size=30) == []
+    assert evict_cache(max_size=20, keep=[entries[0]]) == [entries[1]]
+    assert evict_cache(max_size=10) == [entries[0]]
+    assert entries[2].is_dir()
+
+
+def test_evict_cache_ignores_entries_removed_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+    entries = [get_cache_entry("templates", name) for name in ["removed", "kept"]]
+    entries[0].parent.mkdir(parents=True)
+    for entry in entries:
+        entry.write_bytes(b"x" * 10)
+
+    original_stat = Path.stat
+
+    def stat(path, *args, **kwargs):
+        # Simulate another process evicting the entry while the cache is walked
+        if path == entries[0]:
+            entries[0].unlink(missing_ok=True)
+        return original_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    assert evict_cache(max_size=0, keep=[entries[1]]) == []
+    assert entries[1].is_file()
+
+
+def test_record_cache_write_evicts_only_above_max_size(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setenv(CACHE_MAX_SIZE_ENV_VAR, "25")
+    entries = [get_cache_entry("templates", name) for name in ["old", "recent", "new"]]
+    entries[0].parent.mkdir(parents=True)
+    for timestamp, entry in enumerate(entries):
+        entry.write_bytes(b"x" * 10)
+        os.utime(entry, (timestamp, timestamp))
+
+    # The size of the cache is only computed when it is unknown
+    assert evict_cache() == [entries[0]]
+    entries[0].write_bytes(b"x" * 10)
+    assert record_cache_write(0) == []
+    assert entries[0].is_file()
+
+    # Entries are walked again once the estimated size exceeds the maximum
+    assert record_cache_write(10, keep=[entries[0]]) == [entries[1]]
+
+
+def test_bake_template_reuses_cached_properties(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    for output_dir in ["first", "second"]:
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH,
+            tmp_path / output_dir,
+            no_input=True,
+            extra_context=dict(project_name="pybasic"),
+        )
+        assert (tmp_path / output_dir / "pybasic" / "setup.py").is_file()
+
+    entries = list((tmp_path / "cache" / "templates").iterdir())
+    assert len(entries) == 1 and entries[0].suffix == ".json"
+
+    # Compiled templates are stored too
+    entries = list((tmp_path / "cache" / "bytecode").iterdir())
+    assert len(entries) == 1 and any(entries[0].iterdir())
+
+
+def test_bake_template_without_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    bake_template(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        tmp_path,
+        use_cache=False,
+        no_input=True,
+        extra_context=dict(project_name="pybasic"),
+    )
+
+    assert (tmp_path / "pybasic" / "setup.py").is_file()
+    assert not (tmp_path / "cache").exists()
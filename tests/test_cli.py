@@ -20,12 +20,21 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import json
+import os
+import subprocess
+import sys
+
 from click.testing import CliRunner
 import pytest
 
 from ansys.templates import AVAILABLE_TEMPLATES_AND_DESCRIPTION, __version__
+from ansys.templates.cache import CACHE_DIR_ENV_VAR
 from ansys.templates.cli import main
 
+CLI_IMPORT_TIME_BUDGET_ENV_VAR = "ANSYS_TEMPLATES_CLI_IMPORT_TIME_BUDGET"
+"""Environment variable holding the maximum time in microseconds for importing the CLI module."""
+
 
 def test_cli_main_group():
     runner = CliRunner()
@@ -49,6 +58,21 @@ def test_cli_main_list_command():
     for template, description in AVAILABLE_TEMPLATES_AND_DESCRIPTION.items():
         assert f"{template.replace('_', '-')}: {description}" in result.output
 
+    # Templates are listed in the order declared by their manifest, not alphabetically
+    listed_templates = [line.split(":")[0] for line in result.output.splitlines()[2:] if line]
+    assert listed_templates == [
+        "doc-project",
+        "pybasic",
+        "pyansys",
+        "pyansys-advanced",
+        "pyansys-openapi-client",
+        "pyace",
+        "pyace-flask",
+        "pyace-grpc",
+        "pyace-fast",
+        "solution",
+    ]
+
 
 def test_cli_main_new_group():
     runner = CliRunner()
@@ -72,9 +96,152 @@ def test_cli_main_version_command():
     assert f"ansys-templates {__version__}" in result.output
 
 
+def test_cli_cache_clear_command(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    (tmp_path / "cache" / "templates").mkdir(parents=True)
+    (tmp_path / "cache" / "templates" / "entry.json").write_text("{}")
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["cache", "clear"])
+    assert result.exit_code == 0
+    assert f"Cleared the cache in {tmp_path / 'cache'}" in result.output
+    assert not (tmp_path / "cache").exists()
+
+
 @pytest.mark.parametrize("template", AVAILABLE_TEMPLATES_AND_DESCRIPTION.keys())
 def test_cli_main_new(template):
     runner = CliRunner()
     with runner.isolated_filesystem() as td:
         result = runner.invoke(main, ["new", template.replace("_", "-")])
         assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("in_process_hooks", [[], ["--in-process-hooks"]])
+def test_cli_main_new_without_cache(tmp_path, monkeypatch, in_process_hooks):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["new", "doc-project", "--no-cache", *in_process_hooks])
+    assert result.exit_code == 0
+    assert (tmp_path / "doc-project" / "doc" / "source" / "conf.py").is_file()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_cli_main_new_records_on_request(tmp_path):
+    runner = CliRunner()
+    for record in [[], ["--record"]]:
+        output_dir = tmp_path / str(bool(record))
+        result = runner.invoke(main, ["new", "pybasic", "--output-dir", str(output_dir), *record])
+        assert result.exit_code == 0
+        assert (output_dir / ".ansys-templates").is_dir() == bool(record)
+
+
+def test_cli_main_new_with_contexts(tmp_path):
+    contexts_file = tmp_path / "contexts.json"
+    contexts_file.write_text(json.dumps([dict(project_name="first"), dict(project_name="second")]))
+
+    runner = CliRunner()
+    result = runner.invoke(
+        main,
+        [
+            "new",
+            "pybasic",
+            "--contexts",
+            str(contexts_file),
+            "--jobs",
+            "2",
+            "--output-dir",
+            str(tmp_path / "projects"),
+            "--force",
+        ],
+    )
+    assert result.exit_code == 0
+
+    for project_name in ["first", "second"]:
+        assert f"Created {tmp_path / 'projects' / project_name}" in result.output
+        assert (tmp_path / "projects" / project_name / "setup.py").is_file()
+
+
+def test_cli_main_new_with_yaml_contexts(tmp_path):
+    contexts_file = tmp_path / "contexts.yaml"
+    contexts_file.write_text("- project_name: first\n- project_name: second\n")
+    arguments = ["new", "pybasic", "--contexts", str(contexts_file), "--output-dir", str(tmp_path)]
+    arguments.append("--record")
+
+    runner = CliRunner()
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 0
+    assert "2 created, 0 skipped, 0 failed" in result.output
+
+    contexts_file.write_text("- project_name: first\n- project_name: third\n")
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 0
+    assert f"Skipped {tmp_path / 'first'}, already up to date" in result.output
+    assert f"Created {tmp_path / 'third'}" in result.output
+    assert "1 created, 1 skipped, 0 failed" in result.output
+
+    result = runner.invoke(main, arguments + ["--force"])
+    assert result.exit_code == 0
+    assert "2 created, 0 skipped, 0 failed" in result.output
+
+
+def test_cli_main_new_with_invalid_contexts(tmp_path):
+    contexts_file = tmp_path / "contexts.yml"
+    contexts_file.write_text("project_name: first\n")
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["new", "pybasic", "--contexts", str(contexts_file), "--force"])
+    assert result.exit_code == 2
+    assert "must hold a list of variables mappings" in result.output
+
+
+def test_cli_main_new_with_contexts_without_record(tmp_path):
+    contexts_file = tmp_path / "contexts.yaml"
+    contexts_file.write_text("- project_name: first\n")
+    arguments = ["new", "pybasic", "--contexts", str(contexts_file), "--output-dir", str(tmp_path)]
+
+    runner = CliRunner()
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 2
+    assert "--contexts requires --record" in result.output
+    assert not (tmp_path / "first").exists()
+
+    for _ in range(2):
+        result = runner.invoke(main, arguments + ["--force"])
+        assert result.exit_code == 0
+        assert "1 created, 0 skipped, 0 failed" in result.output
+    assert not (tmp_path / "first" / ".ansys-templates").exists()
+
+
+def get_cli_import_times():
+    """Return the cumulative import time in microseconds of each module imported by the CLI."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ansys.templates.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Each line reads 'import time: <self> | <cumulative> | <module>'
+    cumulative_times = {}
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative_times[fields[2].strip()] = int(fields[1])
+    return cumulative_times
+
+
+def test_cli_defers_heavy_imports():
+    cumulative_times = get_cli_import_times()
+    for module in ["cookiecutter", "jinja2", "importlib.metadata", "ansys.templates.utils"]:
+        assert module not in cumulative_times, f"{module} is imported with the CLI"
+
+
+@pytest.mark.skipif(
+    CLI_IMPORT_TIME_BUDGET_ENV_VAR not in os.environ,
+    reason=f"{CLI_IMPORT_TIME_BUDGET_ENV_VAR} is not set",
+)
+def test_cli_import_time():
+    budget = int(os.environ[CLI_IMPORT_TIME_BUDGET_ENV_VAR])
+    assert get_cli_import_times()["ansys.templates.cli"] < budget
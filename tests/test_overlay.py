@@ -0,0 +1,160 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from fnmatch import fnmatchcase
+import json
+import os
+
+from jinja2 import Environment
+import pytest
+
+from ansys.templates import overlay as overlay_module
+from ansys.templates.licenses import MIT_LICENSE
+from ansys.templates.overlay import (
+    BINARY,
+    MANIFEST_FILE_NAME,
+    PROJECT_DIR_NAME,
+    STATIC,
+    TEMPLATED,
+    OverlayLoader,
+    TemplateOverlay,
+)
+from ansys.templates.paths import TEMPLATE_PATH_FINDER
+
+
+def create_template_family(root):
+    """Create a template, its common files and a license."""
+    for layer in ["common", "template"]:
+        (root / layer / PROJECT_DIR_NAME).mkdir(parents=True)
+        (root / layer / PROJECT_DIR_NAME / "README.md").write_text(f"{layer} readme")
+        (root / layer / PROJECT_DIR_NAME / "LICENSE").write_text(f"{layer} license")
+    (root / "common" / PROJECT_DIR_NAME / "AUTHORS").write_text("common authors")
+    (root / "template" / "cookiecutter.json").write_text("{}")
+    (root / "LICENSE_MIT").write_text("MIT license")
+
+
+def test_overlay_resolves_layers_by_priority(tmp_path):
+    create_template_family(tmp_path)
+    overlay = TemplateOverlay(tmp_path / "template", tmp_path / "LICENSE_MIT", use_cache=False)
+
+    assert overlay.walk(PROJECT_DIR_NAME) == ["AUTHORS", "LICENSE", "README.md"]
+    assert "cookiecutter.json" in overlay
+    assert overlay.resolve(f"{PROJECT_DIR_NAME}/LICENSE") == tmp_path / "LICENSE_MIT"
+    assert overlay.resolve(f"{PROJECT_DIR_NAME}/README.md").read_text() == "template readme"
+    assert overlay.resolve(f"{PROJECT_DIR_NAME}/AUTHORS").read_text() == "common authors"
+
+
+def test_overlay_fingerprint_depends_on_content(tmp_path, monkeypatch):
+    for root in ["first", "second"]:
+        create_template_family(tmp_path / root)
+    readme = tmp_path / "second" / "template" / PROJECT_DIR_NAME / "README.md"
+    os.utime(readme, ns=(0, 0))
+
+    def get_fingerprint(root):
+        # Digests are kept for the lifetime of a process, so start from scratch
+        monkeypatch.setattr(overlay_module, "_CONTENT_DIGESTS", {})
+        template_path = tmp_path / root / "template"
+        return TemplateOverlay(template_path, tmp_path / root / "LICENSE_MIT").fingerprint
+
+    # Copies of the same files share their fingerprint, whatever their location and mtime
+    first_fingerprint = get_fingerprint("first")
+    assert get_fingerprint("second") == first_fingerprint
+
+    # Content changes are detected, even if the size and mtime are preserved
+    stat = readme.stat()
+    readme.write_text("template README")
+    os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert readme.stat().st_size == stat.st_size
+    assert get_fingerprint("second") != first_fingerprint
+
+
+def test_overlay_loader(tmp_path):
+    create_template_family(tmp_path)
+    overlay = TemplateOverlay(tmp_path / "template", tmp_path / "LICENSE_MIT", use_cache=False)
+    environment = Environment(loader=OverlayLoader(overlay))
+
+    assert environment.get_template("AUTHORS").render() == "common authors"
+    assert not overlay.is_binary(f"{PROJECT_DIR_NAME}/AUTHORS")
+
+
+@pytest.mark.parametrize(
+    "content, kind",
+    [
+        (b"plain text\n", STATIC),
+        (b"windows\r\nnewlines\r\n", STATIC),
+        (b"mixed\r\nnewlines\n", TEMPLATED),
+        (b"{{ cookiecutter.project_name }}\n", TEMPLATED),
+        (b"{% if True %}yes{% endif %}\n", TEMPLATED),
+        (b"{# comment #}\n", TEMPLATED),
+        (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00", BINARY),
+    ],
+)
+def test_overlay_classifies_files(tmp_path, content, kind):
+    create_template_family(tmp_path)
+    (tmp_path / "template" / PROJECT_DIR_NAME / "file").write_bytes(content)
+    overlay = TemplateOverlay(tmp_path / "template", tmp_path / "LICENSE_MIT", use_cache=False)
+
+    assert overlay.get_kind(f"{PROJECT_DIR_NAME}/file") == kind
+
+
+def test_overlay_selects_files_declared_by_manifest(tmp_path):
+    create_template_family(tmp_path)
+    (tmp_path / "template" / PROJECT_DIR_NAME / "setup.py").write_text("setup()")
+    (tmp_path / "template" / PROJECT_DIR_NAME / "docs").mkdir()
+    (tmp_path / "template" / PROJECT_DIR_NAME / "docs" / "index.rst").write_text("index")
+    manifest = {
+        "files": ["README.md", "docs/*"],
+        "conditional_files": [
+            {"when": "build_system == 'setuptools'", "files": ["setup.py"]},
+            {"when": "cookiecutter.license == 'MIT'", "files": ["LICENSE"]},
+        ],
+    }
+    (tmp_path / "template" / MANIFEST_FILE_NAME).write_text(json.dumps(manifest))
+    overlay = TemplateOverlay(tmp_path / "template", tmp_path / "LICENSE_MIT", use_cache=False)
+    environment = Environment()
+
+    context = {"cookiecutter": {"build_system": "flit", "license": "MIT"}}
+    assert overlay.select(context, environment) == ["LICENSE", "README.md", "docs/index.rst"]
+    context = {"cookiecutter": {"build_system": "setuptools", "license": "GPL"}}
+    assert overlay.select(context, environment) == ["README.md", "docs/index.rst", "setup.py"]
+
+
+def test_overlay_selects_all_files_without_manifest(tmp_path):
+    create_template_family(tmp_path)
+    overlay = TemplateOverlay(tmp_path / "template", tmp_path / "LICENSE_MIT", use_cache=False)
+
+    assert overlay.select({"cookiecutter": {}}, Environment()) == overlay.walk(PROJECT_DIR_NAME)
+
+
+@pytest.mark.parametrize("template", sorted(set(TEMPLATE_PATH_FINDER) - {"common"}))
+def test_template_manifest_declares_existing_files(template):
+    overlay = TemplateOverlay(TEMPLATE_PATH_FINDER[template], MIT_LICENSE, use_cache=False)
+    manifest = overlay.load_manifest()
+    if manifest is None:
+        pytest.skip(f"Template {template} does not declare a manifest")
+
+    files = overlay.walk(PROJECT_DIR_NAME)
+    declared = manifest["files"] + [
+        path for group in manifest.get("conditional_files", []) for path in group["files"]
+    ]
+    for path in declared:
+        assert any(fnmatchcase(file, path) for file in files), f"{path} not found in {template}"
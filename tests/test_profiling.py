@@ -0,0 +1,84 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import json
+import os
+
+from click.testing import CliRunner
+
+from ansys.templates.cli import main
+from ansys.templates.paths import PYTHON_TEMPLATES_PYBASIC_PATH
+from ansys.templates.profiling import Profiler, activate, span
+from ansys.templates.utils import bake_template
+
+
+def test_profiler_records_spans():
+    profiler = Profiler()
+    with span("ignored"):
+        pass
+    with activate(profiler):
+        with span("bake"):
+            with span("render", "file", path="README.rst"):
+                pass
+
+    assert [recorded.name for recorded in profiler.spans] == ["render", "bake"]
+
+    events = profiler.to_chrome_trace()["traceEvents"]
+    assert [event["name"] for event in events] == ["bake", "render"]
+    assert all(event["ph"] == "X" and event["pid"] == os.getpid() for event in events)
+    assert events[1]["args"] == {"path": "README.rst"}
+
+    summary = profiler.summary()
+    assert "bake" in summary.splitlines()[1]
+    assert "README.rst" in summary.splitlines()[-1]
+
+
+def test_bake_template_profile(tmp_path):
+    trace_path = tmp_path / "trace.json"
+    bake_template(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        tmp_path,
+        no_input=True,
+        extra_context=dict(project_name="demo"),
+        profile=trace_path,
+    )
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    names = {event["name"] for event in events}
+    assert {"bake", "context", "generate", "render", "copy", "post_gen_project"} <= names
+
+    # Spans of the hook are recorded by its own process
+    keep_files = next(event for event in events if event["name"] == "keep_files")
+    assert keep_files["pid"] != os.getpid()
+
+
+def test_cli_profile(tmp_path):
+    trace_path = tmp_path / "trace.json"
+    runner = CliRunner()
+    result = runner.invoke(
+        main,
+        ["new", "pybasic", "--output-dir", str(tmp_path), "--profile", str(trace_path)],
+        input="demo\n" + "\n" * 10,
+    )
+
+    assert result.exit_code == 0
+    assert "Slowest" in result.output
+    assert trace_path.is_file()
@@ -0,0 +1,90 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import pytest
+
+from ansys.templates import AVAILABLE_TEMPLATES_AND_DESCRIPTION
+from ansys.templates.paths import PYTHON_TEMPLATES_SOLUTION_PATH, TEMPLATE_PATH_FINDER
+from ansys.templates.registry import (
+    REGISTRY_VERSION,
+    build_registry,
+    find_template,
+    get_templates,
+    load_registry,
+    main,
+    validate_context,
+    write_registry,
+)
+from ansys.templates.utils import load_inputs_from_configuration_file
+
+
+def test_registry_is_up_to_date():
+    assert (
+        build_registry() == load_registry()
+    ), "The registry is outdated. Regenerate it with 'python -m ansys.templates.registry'."
+
+
+def test_registry_lists_templates():
+    templates = get_templates()
+    assert set(TEMPLATE_PATH_FINDER) == {"common", *templates}
+    assert AVAILABLE_TEMPLATES_AND_DESCRIPTION["pybasic"] == templates["pybasic"]["description"]
+    assert set(templates["pybasic"]) == {"path", "description", "variables", "choices"}
+
+
+def test_find_template(tmp_path):
+    assert find_template(TEMPLATE_PATH_FINDER["pyace"]) is get_templates()["pyace"]
+    assert find_template(tmp_path) is None
+
+
+def test_load_inputs_from_configuration_file(tmp_path):
+    (tmp_path / "cookiecutter.json").write_text('{"__private": "", "name": "", "ui": ["a", "b"]}')
+
+    assert load_inputs_from_configuration_file(tmp_path) == {"name": "", "ui": "a"}
+    inputs = load_inputs_from_configuration_file(PYTHON_TEMPLATES_SOLUTION_PATH)
+    assert inputs["the type of solution UI"] == "dash"
+
+
+@pytest.mark.parametrize(
+    "context, message",
+    [
+        ({"project_name": "demo", "__private": "value"}, None),
+        ({"requires_python": "2.7"}, "Invalid value '2.7'"),
+        ({"unknown": "value"}, "Unknown variable 'unknown'"),
+    ],
+)
+def test_validate_context(context, message):
+    if message is None:
+        validate_context("pybasic", context)
+    else:
+        with pytest.raises(ValueError, match=message):
+            validate_context("pybasic", context)
+
+
+def test_registry_version(tmp_path):
+    registry_path = tmp_path / "registry.json"
+    write_registry({"version": REGISTRY_VERSION + 1, "templates": {}}, registry_path)
+
+    with pytest.raises(ValueError, match="Unsupported registry version"):
+        load_registry(registry_path)
+
+
+def test_registry_check():
+    assert main(["--check"]) == 0
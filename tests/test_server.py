@@ -0,0 +1,216 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import http.client
+import io
+import json
+import socket
+import tarfile
+import threading
+
+import pytest
+
+from ansys.templates import server as server_module
+from ansys.templates.server import BakeHTTPServer, BakeService
+
+
+@pytest.fixture(scope="module")
+def output_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("output_root")
+
+
+@pytest.fixture(scope="module")
+def service(output_root):
+    return BakeService(templates=["pybasic"], workers=1, queue_depth=0, output_root=output_root)
+
+
+@pytest.fixture(scope="module")
+def address(service):
+    """Run a server in a thread and return its address."""
+    server = BakeHTTPServer(service, port=0, allowed_hosts=["templates.example.com"])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def request(address, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    body = json.dumps(body) if body is not None else None
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def test_server_lists_templates(address):
+    response, body = request(address, "GET", "/templates")
+    assert response.status == 200
+    assert json.loads(body) == ["pybasic"]
+
+
+def test_server_bakes_archive(address):
+    response, body = request(
+        address, "POST", "/bake/pybasic", {"context": {"project_name": "demo"}}
+    )
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/gzip"
+    timings = response.getheader("Server-Timing")
+    for phase in ["queue", "context", "generate", "archive", "total"]:
+        assert f"{phase};dur=" in timings
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as tar_file:
+        assert "demo/setup.py" in tar_file.getnames()
+
+
+@pytest.mark.parametrize("absolute", [False, True])
+def test_server_bakes_into_directory(address, output_root, absolute):
+    output_dir = output_root / f"absolute-{absolute}"
+    response, body = request(
+        address,
+        "POST",
+        "/bake/pybasic",
+        {
+            "context": {"project_name": "demo"},
+            "output_dir": str(output_dir) if absolute else output_dir.name,
+            "record": False,
+        },
+    )
+
+    assert response.status == 200
+    assert json.loads(body)["project_path"] == str(output_dir.resolve() / "demo")
+    assert (output_dir / "demo" / "setup.py").is_file()
+    assert not (output_dir / "demo" / ".ansys-templates").exists()
+
+
+@pytest.mark.parametrize("output_dir", ["..", "../outside", "link", "/"])
+def test_server_rejects_directory_outside_output_root(address, output_root, output_dir):
+    link = output_root / "link"
+    if not link.exists():
+        try:
+            link.symlink_to(output_root.parent, target_is_directory=True)
+        except OSError:
+            pytest.skip("Symbolic links are not available")
+    context = {"project_name": "demo"}
+    response, body = request(
+        address, "POST", "/bake/pybasic", {"context": context, "output_dir": output_dir}
+    )
+
+    assert response.status == 403
+    assert "below" in json.loads(body)["error"]
+    assert not (output_root.parent / "demo").exists()
+
+
+@pytest.mark.parametrize("output_dir", [None, "traversal"])
+def test_server_rejects_project_outside_output_dir(address, output_root, output_dir):
+    body = {"context": {"__project_name_slug": "../escaped"}}
+    if output_dir is not None:
+        body["output_dir"] = output_dir
+    response, _ = request(address, "POST", "/bake/pybasic", body)
+    assert response.status == 400
+    assert not (output_root / "escaped").exists()
+
+
+def test_server_checks_rendered_project_path(service, output_root):
+    request = {"context": {"__project_name_slug": "../escaped"}}
+    with pytest.raises(server_module.BakeError, match="below") as error:
+        service._bake("pybasic", request, str(output_root / "traversal"), {})
+    assert error.value.status == 400
+    assert not (output_root / "escaped").exists()
+
+
+def test_server_rejects_directory_without_output_root(tmp_path):
+    service = BakeService(templates=["pybasic"], workers=1)
+    with pytest.raises(server_module.BakeError, match="disabled") as error:
+        service.bake("pybasic", {"output_dir": str(tmp_path)}, io.BytesIO())
+    assert error.value.status == 403
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({"Content-Type": "text/plain"}, 415),
+        ({"Content-Type": "application/x-www-form-urlencoded"}, 415),
+        ({"Host": "attacker.example.com"}, 403),
+        ({"Host": "attacker.example.com:8765"}, 403),
+        ({"Origin": "https://attacker.example.com"}, 403),
+        ({"Host": "templates.example.com", "Origin": "http://templates.example.com"}, 200),
+        ({"Host": "localhost:8765", "Content-Type": "application/json; charset=utf-8"}, 200),
+    ],
+)
+def test_server_checks_headers(address, headers, status):
+    response, body = request(address, "POST", "/bake/pybasic", {}, headers=headers)
+    assert response.status == status
+    if status != 200:
+        assert "error" in json.loads(body)
+
+
+def test_server_rejects_listing_from_other_host(address):
+    response, _ = request(address, "GET", "/templates", headers={"Host": "rebound.example.com"})
+    assert response.status == 403
+
+
+@pytest.mark.parametrize(
+    "path, body, status",
+    [
+        ("/bake/unknown", {}, 404),
+        ("/bake/pybasic", {"archive_format": "rar"}, 400),
+        ("/bake/pybasic", [], 400),
+        ("/bake/pybasic", {"context": []}, 400),
+        ("/bake/pybasic", {"context": {"requires_python": "2.7"}}, 400),
+        ("/bake/pybasic", {"context": {"unknown": "value"}}, 400),
+        ("/bake/pybasic", {"context": {"_template": "/"}}, 400),
+        ("/bake/pybasic", {"_internal": True}, 400),
+    ],
+)
+def test_server_rejects_invalid_requests(address, path, body, status):
+    response, body = request(address, "POST", path, body)
+    assert response.status == status
+    assert "error" in json.loads(body)
+
+
+def test_server_rejects_requests_when_busy(address, service):
+    assert service._admit()
+    try:
+        response, _ = request(address, "POST", "/bake/pybasic", {})
+    finally:
+        service._release()
+    assert response.status == 503
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available")
+def test_server_listens_to_unix_socket(service, tmp_path):
+    socket_path = str(tmp_path / "bake.sock")
+    server = server_module.BakeUnixServer(service, socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        connection = http.client.HTTPConnection("localhost")
+        connection.sock = client
+        connection.request("GET", "/templates")
+        assert json.loads(connection.getresponse().read()) == ["pybasic"]
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
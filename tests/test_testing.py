@@ -20,9 +20,30 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import json
 import os
+import re
+import stat
 
-from ansys.templates.testing import assert_files_in_baked_project, assert_template_baking_process
+import pytest
+
+from ansys.templates import utils
+from ansys.templates.paths import PYTHON_TEMPLATES_PYBASIC_PATH
+from ansys.templates.testing import (
+    BakedProjectCache,
+    assert_file_contains,
+    assert_file_line_count,
+    assert_file_matches,
+    assert_files_in_baked_project,
+    assert_project_snapshot,
+    assert_template_baking_process,
+    assert_valid_files,
+    get_choice_contexts,
+    get_covering_contexts,
+    get_project_manifest,
+    group_equivalent_contexts,
+    validate_files,
+)
 
 
 def test_assert_files_in_baked_project(tmp_path):
@@ -62,3 +83,171 @@ def test_assert_template_baking_process(tmp_path):
     assert_template_baking_process(
         tmp_path / "template", tmp_path, dict(project_name_slug="hello_project")
     )
+
+
+def test_get_project_manifest(tmp_path):
+    (tmp_path / "doc").mkdir()
+    (tmp_path / "doc" / "index.rst").write_bytes(b"Title\r\n")
+    (tmp_path / "README.rst").write_bytes(b"Title\n")
+
+    manifest = get_project_manifest(tmp_path)
+
+    assert list(manifest) == ["README.rst", "doc/index.rst"]
+    assert manifest["README.rst"] == manifest["doc/index.rst"]
+    assert manifest["README.rst"][0] == 6
+
+
+def test_assert_project_snapshot(tmp_path):
+    project_path, snapshot_path = tmp_path / "project", tmp_path / "project.txt"
+    project_path.mkdir()
+    for file in ("file_A.txt", "file_B.txt", "file_C.txt"):
+        (project_path / file).write_text(file)
+
+    with pytest.raises(AssertionError, match="does not exist"):
+        assert_project_snapshot(project_path, snapshot_path)
+    assert_project_snapshot(project_path, snapshot_path, update=True)
+    assert_project_snapshot(project_path, snapshot_path)
+
+    (project_path / "file_A.txt").write_text("changed")
+    (project_path / "file_B.txt").unlink()
+    (project_path / "file_D.txt").write_text("new")
+    with pytest.raises(AssertionError) as error:
+        assert_project_snapshot(project_path, snapshot_path)
+
+    differences = str(error.value).splitlines()[1:]
+    assert differences == [
+        "~ file_A.txt (10 -> 7 bytes)",
+        "- file_B.txt",
+        "+ file_D.txt (3 bytes)",
+    ]
+
+
+def test_baked_project_cache(tmp_path, monkeypatch):
+    bakes = []
+
+    def bake_template(*args, **kwargs):
+        bakes.append(args)
+        return utils.bake_template(*args, **kwargs)
+
+    monkeypatch.setattr("ansys.templates.testing.bake_template", bake_template)
+    cache = BakedProjectCache(tmp_path / "cache")
+    context = dict(project_name="first")
+
+    first_path = cache.clone(PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path / "one", context)
+    second_path = cache.clone(PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path / "two", context)
+    writable_path = cache.clone(
+        PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path / "three", context, writable=True
+    )
+
+    assert len(bakes) == 1
+    assert first_path == tmp_path / "one" / "first"
+    assert not os.path.samefile(first_path / "setup.py", second_path / "setup.py")
+    assert not os.stat(first_path / "setup.py").st_mode & stat.S_IWUSR
+    assert not os.path.samefile(first_path / "setup.py", writable_path / "setup.py")
+    assert os.stat(writable_path / "setup.py").st_mode & stat.S_IWUSR
+    assert (writable_path / "setup.py").read_bytes() == (first_path / "setup.py").read_bytes()
+
+    # Writing to a clone, even after making it writable, leaves the cache untouched
+    original_content = (first_path / "setup.py").read_bytes()
+    (first_path / "setup.py").chmod(0o644)
+    (first_path / "setup.py").write_text("edited")
+    third_path = cache.clone(PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path / "four", context)
+    assert (third_path / "setup.py").read_bytes() == original_content
+
+
+def test_baked_project_fixture(baked_project):
+    project_path = baked_project("pybasic", dict(project_name="fixture"))
+    assert project_path.name == "fixture"
+    assert (project_path / "setup.py").is_file()
+
+
+@pytest.fixture
+def choice_template_path(tmp_path):
+    template_path = tmp_path / "template"
+    project_path = template_path / "{{cookiecutter.__project_name_slug}}"
+    project_path.mkdir(parents=True)
+    configuration = {
+        "name": "demo",
+        "style": ["a", "b", "c"],
+        "unused": ["x", "y"],
+        "__project_name_slug": "{{ cookiecutter.name }}",
+    }
+    (template_path / "cookiecutter.json").write_text(json.dumps(configuration))
+    (project_path / "README.md").write_text("{{ 'C' if cookiecutter.style == 'c' else 'AB' }}\n")
+    return template_path
+
+
+def test_get_choice_contexts(choice_template_path):
+    assert get_choice_contexts(choice_template_path) == [
+        {"style": "a"},
+        {"style": "b"},
+        {"style": "c"},
+    ]
+    assert len(get_choice_contexts(choice_template_path, prune=False)) == 6
+    assert get_choice_contexts(choice_template_path, ["unused"], prune=False) == [
+        {"unused": "x"},
+        {"unused": "y"},
+    ]
+    assert get_choice_contexts(choice_template_path, base_context={"name": "other"}) == [
+        {"name": "other", "style": "a"},
+        {"name": "other", "style": "b"},
+        {"name": "other", "style": "c"},
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_group_equivalent_contexts(choice_template_path, jobs):
+    contexts = get_choice_contexts(choice_template_path)
+    assert group_equivalent_contexts(choice_template_path, contexts, jobs=jobs) == [
+        [{"style": "a"}, {"style": "b"}],
+        [{"style": "c"}],
+    ]
+    assert get_covering_contexts(choice_template_path, jobs=jobs) == [
+        {"style": "a"},
+        {"style": "c"},
+    ]
+
+
+def test_content_assertions(tmp_path):
+    (tmp_path / "empty.txt").write_bytes(b"")
+    (tmp_path / "file.txt").write_bytes(b"name = 'demo'\nversion = '1.0'\nlast line")
+
+    assert_file_contains("file.txt", "version = '1.0'", tmp_path)
+    assert_file_matches("file.txt", r"^version = '\d+\.\d+'$", tmp_path, flags=re.MULTILINE)
+    assert_file_line_count("file.txt", 3, tmp_path)
+    assert_file_line_count("empty.txt", 0, tmp_path)
+
+    with pytest.raises(AssertionError, match="does not contain 'other'"):
+        assert_file_contains("empty.txt", "other", tmp_path)
+    with pytest.raises(AssertionError, match="does not match"):
+        assert_file_matches("file.txt", r"^version = '2", tmp_path)
+    with pytest.raises(AssertionError, match="has 3 lines, expected 2"):
+        assert_file_line_count("file.txt", 2, tmp_path)
+
+
+def test_validate_files(tmp_path):
+    valid_files = {
+        "data.json": '{"name": "demo"}',
+        "module.py": "def main():\n    pass\n",
+        "pyproject.toml": '[project]\nname = "demo"\n',
+        "config.yml": "first: 1\n---\nsecond: 2\n",
+        "README.md": "{ not checked",
+    }
+    invalid_files = {
+        "invalid.json": "{'name': 'demo'}",
+        "src/invalid.py": "def main(:\n",
+        "invalid.toml": "[project\n",
+        "invalid.yaml": "key: [value\n",
+    }
+    for file, content in {**valid_files, **invalid_files}.items():
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text(content)
+
+    errors = validate_files(tmp_path, jobs=2)
+    assert sorted(errors) == sorted(invalid_files)
+    assert errors["src/invalid.py"].startswith("SyntaxError")
+    assert validate_files(tmp_path, files=list(valid_files)) == {}
+
+    assert_valid_files(tmp_path, files=list(valid_files))
+    with pytest.raises(AssertionError, match="invalid.toml: TOMLDecodeError"):
+        assert_valid_files(tmp_path)
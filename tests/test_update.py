@@ -0,0 +1,124 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import json
+
+from click.testing import CliRunner
+import pytest
+
+from ansys.templates.cli import main
+from ansys.templates.overlay import PROJECT_DIR_NAME
+from ansys.templates.update import RECORD_DIR_NAME, merge_lines, read_record
+from ansys.templates.utils import bake_template, update_project
+
+
+@pytest.mark.parametrize(
+    "base, project, template, expected, conflicts",
+    [
+        (["a\n", "b\n"], ["a\n", "b\n"], ["a\n", "c\n"], ["a\n", "c\n"], 0),
+        (
+            ["a\n", "b\n"],
+            ["z\n", "a\n", "b\n"],
+            ["a\n", "b\n", "c\n"],
+            ["z\n", "a\n", "b\n", "c\n"],
+            0,
+        ),
+        (["a\n", "b\n"], ["a\n", "x\n"], ["a\n", "x\n"], ["a\n", "x\n"], 0),
+        (
+            ["a\n", "b\n"],
+            ["a\n", "x\n"],
+            ["a\n", "y"],
+            ["a\n", "<<<<<<< project\n", "x\n", "=======\n", "y\n", ">>>>>>> template\n"],
+            1,
+        ),
+    ],
+)
+def test_merge_lines(base, project, template, expected, conflicts):
+    assert merge_lines(base, project, template) == (expected, conflicts)
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    """Create a minimal template and its common files."""
+    for layer in ["common", "template"]:
+        (tmp_path / layer / PROJECT_DIR_NAME).mkdir(parents=True)
+    (tmp_path / "template" / "cookiecutter.json").write_text(
+        json.dumps(
+            {"project_name": "demo", "__project_name_slug": "{{ cookiecutter.project_name }}"}
+        )
+    )
+    (tmp_path / "template" / PROJECT_DIR_NAME / "README.md").write_text(
+        "# {{ cookiecutter.project_name }}\n\nIntroduction.\n"
+    )
+    (tmp_path / "template" / PROJECT_DIR_NAME / "setup.py").write_text("setup()\n")
+    (tmp_path / "template" / PROJECT_DIR_NAME / "obsolete.txt").write_text("obsolete\n")
+    return tmp_path / "template"
+
+
+def test_update_project(tmp_path, template_path):
+    project_path = bake_template(template_path, tmp_path / "output", no_input=True, record=True)
+    record = read_record(project_path)
+    assert record["context"] == {"project_name": "demo"}
+    assert set(record["files"]) == {"LICENSE", "README.md", "setup.py", "obsolete.txt"}
+    assert not update_project(project_path).changed
+
+    # Edit the project and the template
+    readme = tmp_path / "output" / "demo" / "README.md"
+    readme.write_text(readme.read_text() + "\nUser notes.\n")
+    setup_mtime = (tmp_path / "output" / "demo" / "setup.py").stat().st_mtime_ns
+    (template_path / PROJECT_DIR_NAME / "README.md").write_text(
+        "# The {{ cookiecutter.project_name }} project\n\nIntroduction.\n"
+    )
+    (template_path / PROJECT_DIR_NAME / "obsolete.txt").unlink()
+    (template_path / PROJECT_DIR_NAME / "tox.ini").write_text("[tox]\n")
+
+    result = update_project(project_path, dry_run=True)
+    assert (result.merged, result.added, result.removed) == (
+        ["README.md"],
+        ["tox.ini"],
+        ["obsolete.txt"],
+    )
+    assert not (tmp_path / "output" / "demo" / "tox.ini").exists()
+
+    result = update_project(project_path)
+    assert (result.merged, result.added, result.removed) == (
+        ["README.md"],
+        ["tox.ini"],
+        ["obsolete.txt"],
+    )
+    assert readme.read_text() == "# The demo project\n\nIntroduction.\n\nUser notes.\n"
+    assert (tmp_path / "output" / "demo" / "setup.py").stat().st_mtime_ns == setup_mtime
+    assert not (tmp_path / "output" / "demo" / "obsolete.txt").exists()
+    assert not update_project(project_path).changed
+
+
+def test_cli_update(tmp_path, template_path):
+    project_path = bake_template(template_path, tmp_path / "output", no_input=True, record=True)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["update", project_path])
+    assert result.exit_code == 0
+    assert "is up to date" in result.output
+
+    (tmp_path / "output" / "demo" / RECORD_DIR_NAME / "manifest.json").unlink()
+    result = runner.invoke(main, ["update", project_path])
+    assert result.exit_code == 1
+    assert "No bake record found" in result.output
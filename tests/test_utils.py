@@ -0,0 +1,382 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import os
+import tarfile
+from types import SimpleNamespace
+import zipfile
+
+from cookiecutter.exceptions import FailedHookException, InvalidModeException
+import pytest
+
+from ansys.templates.archive import get_archive_format
+from ansys.templates.licenses import MIT_LICENSE
+from ansys.templates.paths import PYTHON_TEMPLATES_PYBASIC_PATH
+from ansys.templates.utils import (
+    CopyStats,
+    _copy_file,
+    _get_batch_environment,
+    _initialize_batch,
+    _run_hook_in_process,
+    bake_archive,
+    bake_many,
+    bake_template,
+    copy_tree,
+    get_environment_key,
+    keep_files,
+    sort_imports,
+)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_bake_many(tmp_path, jobs):
+    contexts = [dict(project_name=f"project_{index}") for index in range(3)]
+    contexts.append(dict(requires_python="2.7"))
+
+    results = bake_many(PYTHON_TEMPLATES_PYBASIC_PATH, contexts, tmp_path, jobs=jobs)
+
+    assert [result.succeeded for result in results] == [True, True, True, False]
+    for index, result in enumerate(results[:3]):
+        assert result.project_path == str(tmp_path / f"project_{index}")
+        assert (tmp_path / f"project_{index}" / "setup.py").is_file()
+        assert set(result.timings) == {"context", "generate", "total"}
+        assert result.copy_stats.files > 0
+    assert "ValueError" in results[3].error
+
+
+def test_bake_many_skips_unchanged_projects(tmp_path):
+    contexts = [dict(project_name="first"), dict(project_name="second")]
+    bake_many(PYTHON_TEMPLATES_PYBASIC_PATH, contexts[:1], tmp_path, jobs=1, record=True)
+    (tmp_path / "first" / "setup.py").write_text("edited")
+
+    results = bake_many(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        contexts,
+        tmp_path,
+        jobs=1,
+        record=True,
+        skip_unchanged=True,
+        overwrite_if_exists=True,
+    )
+
+    assert [result.skipped for result in results] == [True, False]
+    assert all(result.succeeded for result in results)
+    assert (tmp_path / "first" / "setup.py").read_text() == "edited"
+    assert (tmp_path / "second" / "setup.py").is_file()
+
+
+def test_bake_many_skip_unchanged_requires_record(tmp_path):
+    with pytest.raises(ValueError, match="requires recording"):
+        bake_many(PYTHON_TEMPLATES_PYBASIC_PATH, [{}], tmp_path, jobs=1, skip_unchanged=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_bake_many_environment_per_jinja_settings(tmp_path):
+    _initialize_batch(PYTHON_TEMPLATES_PYBASIC_PATH, MIT_LICENSE, use_cache=False)
+    default_context = {"cookiecutter": {"project_name": "first"}}
+    custom_context = {"cookiecutter": {"_jinja2_env_vars": {"lstrip_blocks": True}}}
+
+    default_environment = _get_batch_environment(default_context)
+    custom_environment = _get_batch_environment(custom_context)
+
+    assert get_environment_key(default_context) != get_environment_key(custom_context)
+    assert custom_environment is not default_environment
+    assert custom_environment.lstrip_blocks and not default_environment.lstrip_blocks
+    assert _get_batch_environment({"cookiecutter": {}}) is default_environment
+
+
+def _read_tree(path):
+    return {
+        file.relative_to(path).as_posix(): file.read_bytes()
+        for file in path.rglob("*")
+        if file.is_file()
+    }
+
+
+def test_bake_template_with_in_process_hooks(tmp_path):
+    cwd = os.getcwd()
+    for in_process_hooks in (False, True):
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH,
+            tmp_path / str(in_process_hooks),
+            no_input=True,
+            in_process_hooks=in_process_hooks,
+        )
+
+    assert os.getcwd() == cwd
+    assert (tmp_path / "True" / "setup.py").is_file()
+    assert _read_tree(tmp_path / "True") == _read_tree(tmp_path / "False")
+
+
+def test_bake_template_with_failing_in_process_hook(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("ansys.templates.utils.keep_files", fail)
+
+    with pytest.raises(FailedHookException, match="disk full"):
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH,
+            tmp_path / "project",
+            no_input=True,
+            in_process_hooks=True,
+        )
+    assert not (tmp_path / "project").exists()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "open('side_effect.txt', 'a').write('ran')\n",
+        "if True:\n    def main(project_path):\n        pass\nopen('side_effect.txt', 'a').write('ran')\n",
+    ],
+)
+def test_run_hook_in_process_skips_hook_without_main(tmp_path, monkeypatch, source):
+    monkeypatch.chdir(tmp_path)
+    script = tmp_path / "post_gen_project.py"
+    script.write_text(source)
+
+    assert not _run_hook_in_process(str(script), str(tmp_path), {"cookiecutter": {}})
+    assert not (tmp_path / "side_effect.txt").exists()
+
+
+def test_bake_template_replay(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f"replay_dir: {(tmp_path / 'replay').as_posix()}\n")
+    bake_template(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        tmp_path / "first",
+        no_input=True,
+        extra_context=dict(project_name="replayed"),
+        config_file=str(config_file),
+    )
+    replay_file = tmp_path / "replay" / f"{PYTHON_TEMPLATES_PYBASIC_PATH.name}.json"
+
+    for name, replay in [("second", True), ("third", str(replay_file))]:
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH,
+            tmp_path / name,
+            config_file=str(config_file),
+            replay=replay,
+        )
+        assert _read_tree(tmp_path / name) == _read_tree(tmp_path / "first")
+    assert "replayed" in (tmp_path / "first" / "replayed" / "setup.py").read_text()
+
+    with pytest.raises(InvalidModeException):
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path / "fourth", no_input=True, replay=True
+        )
+
+
+def test_bake_template_rejects_unsupported_arguments(tmp_path):
+    with pytest.raises(TypeError, match="checkout, password"):
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH, tmp_path, no_input=True, password="", checkout="main"
+        )
+    assert os.listdir(tmp_path) == []
+
+
+def test_bake_template_staged(tmp_path):
+    project_path = tmp_path / "project"
+    bake_template(PYTHON_TEMPLATES_PYBASIC_PATH, project_path, no_input=True, staged=True)
+    (project_path / "setup.py").write_text("edited")
+    (project_path / "notes.txt").write_text("kept")
+    os.utime(project_path / "README.rst", ns=(0, 0))
+
+    bake_template(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        project_path,
+        no_input=True,
+        staged=True,
+        overwrite_if_exists=True,
+    )
+
+    assert (project_path / "setup.py").read_text() != "edited"
+    assert (project_path / "notes.txt").read_text() == "kept"
+    assert os.stat(project_path / "README.rst").st_mtime_ns == 0
+    assert os.listdir(tmp_path) == ["project"]
+
+
+def test_bake_template_staged_failure(tmp_path, monkeypatch):
+    project_path = tmp_path / "project"
+    bake_template(PYTHON_TEMPLATES_PYBASIC_PATH, project_path, no_input=True, staged=True)
+    (project_path / "setup.py").write_text("edited")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("ansys.templates.utils.keep_files", fail)
+    with pytest.raises(FailedHookException):
+        bake_template(
+            PYTHON_TEMPLATES_PYBASIC_PATH,
+            project_path,
+            no_input=True,
+            staged=True,
+            overwrite_if_exists=True,
+            in_process_hooks=True,
+        )
+
+    assert (project_path / "setup.py").read_text() == "edited"
+    assert os.listdir(tmp_path) == ["project"]
+
+
+def test_copy_file(tmp_path):
+    content = bytes(range(256)) * 1024
+    (tmp_path / "source").write_bytes(content)
+    (tmp_path / "destination").write_bytes(b"previous content" * 100000)
+
+    (tmp_path / "source").chmod(0o755)
+
+    assert _copy_file(tmp_path / "source", tmp_path / "destination") == len(content)
+    assert (tmp_path / "destination").read_bytes() == content
+    assert os.access(tmp_path / "destination", os.X_OK)
+
+
+@pytest.mark.parametrize("copy_file_range", [True, False])
+def test_copy_file_without_ficlone(tmp_path, monkeypatch, copy_file_range):
+    def ioctl(*args):
+        raise AssertionError("FICLONE is only requested on Linux")
+
+    monkeypatch.setattr("ansys.templates.utils._FICLONE", None)
+    monkeypatch.setattr("ansys.templates.utils.fcntl", SimpleNamespace(ioctl=ioctl))
+    if not copy_file_range:
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+    content = bytes(range(256)) * 1024
+    (tmp_path / "source").write_bytes(content)
+
+    assert _copy_file(tmp_path / "source", tmp_path / "destination") == len(content)
+    assert (tmp_path / "destination").read_bytes() == content
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_copy_tree(tmp_path, jobs):
+    source = tmp_path / "source"
+    (source / "package" / "empty").mkdir(parents=True)
+    for index in range(10):
+        (source / "package" / f"module_{index}.py").write_text(f"value = {index}\n")
+    (source / "README.md").write_text("readme")
+
+    stats = copy_tree(source, tmp_path / "destination", jobs=jobs)
+
+    assert stats == CopyStats(files=11, bytes=sum(len(f"value = {i}\n") for i in range(10)) + 6)
+    assert (tmp_path / "destination" / "package" / "empty").is_dir()
+    assert (tmp_path / "destination" / "package" / "module_9.py").read_text() == "value = 9\n"
+    assert (tmp_path / "destination" / "README.md").read_text() == "readme"
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_keep_files(tmp_path, dry_run):
+    for file in ["README.md", "src/module.py", "src/extra.py", "docs/source/index.rst"]:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text(file)
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "kept").mkdir()
+    before = sorted(tmp_path.rglob("*"))
+
+    removed = keep_files(["README.md", "src/module.py", "kept"], tmp_path, dry_run=dry_run)
+
+    assert set(removed) == {
+        tmp_path / "src" / "extra.py",
+        tmp_path / "docs" / "source" / "index.rst",
+        tmp_path / "docs" / "source",
+        tmp_path / "docs",
+        tmp_path / "empty",
+    }
+    assert removed.index(tmp_path / "docs" / "source") < removed.index(tmp_path / "docs")
+    if dry_run:
+        assert sorted(tmp_path.rglob("*")) == before
+    else:
+        assert sorted(tmp_path.rglob("*")) == sorted(set(before) - set(removed))
+
+
+def test_bake_archive_to_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    archive_path = bake_archive(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        "project.zip",
+        no_input=True,
+        extra_context=dict(project_name="demo"),
+    )
+
+    assert archive_path == "project.zip"
+    assert os.listdir(tmp_path) == ["project.zip"]
+    with zipfile.ZipFile(tmp_path / "project.zip") as zip_file:
+        assert "demo/setup.py" in zip_file.namelist()
+
+
+def test_bake_archive_to_stdout(capfdbinary):
+    bake_archive(
+        PYTHON_TEMPLATES_PYBASIC_PATH,
+        "-",
+        no_input=True,
+        extra_context=dict(project_name="demo"),
+    )
+
+    with tarfile.open(fileobj=io.BytesIO(capfdbinary.readouterr().out), mode="r:gz") as tar_file:
+        assert "demo/setup.py" in tar_file.getnames()
+
+
+@pytest.mark.parametrize(
+    "archive_path, archive_format",
+    [("project.zip", "zip"), ("project.TAR.GZ", "gztar"), ("project.tar.xz", "xztar")],
+)
+def test_get_archive_format(archive_path, archive_format):
+    assert get_archive_format(archive_path) == archive_format
+
+
+def test_get_archive_format_unknown():
+    with pytest.raises(ValueError, match="Unable to guess the format"):
+        get_archive_format("project.rar")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_sort_imports(tmp_path, monkeypatch, jobs):
+    monkeypatch.setenv("ANSYS_TEMPLATES_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "project" / "src" / "mypackage").mkdir(parents=True)
+    unsorted = "import sys\nfrom mypackage import core\nimport os\n"
+    for name in ("first.py", "second.py"):
+        (tmp_path / "project" / name).write_text(unsorted)
+    filepaths = [tmp_path / "project" / name for name in ("first.py", "second.py")]
+
+    changed = sort_imports(filepaths, tmp_path / "project", jobs=jobs)
+
+    assert changed == filepaths
+    expected = "import os\nimport sys\n\nfrom mypackage import core\n"
+    assert all(filepath.read_text() == expected for filepath in filepaths)
+    assert len(list((tmp_path / "cache" / "isort").iterdir())) == 1
+    assert sort_imports(filepaths, tmp_path / "project", jobs=jobs) == []
+
+
+def test_sort_imports_reuses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANSYS_TEMPLATES_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "module.py").write_text("import sys\nimport os\n")
+    sort_imports([tmp_path / "module.py"], tmp_path)
+    (tmp_path / "module.py").write_text("import sys\nimport os\n")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file sorted again")
+
+    monkeypatch.setattr("ansys.templates.utils._sort_code", fail)
+    assert sort_imports([tmp_path / "module.py"], tmp_path) == [tmp_path / "module.py"]
+    assert (tmp_path / "module.py").read_text() == "import os\nimport sys\n"
@@ -22,13 +22,24 @@
 
 from copy import deepcopy
 import json
+from pathlib import Path
+import re
 
+import arrow
 import pytest
 
+from ansys.templates import utils
 from ansys.templates.paths import PYTHON_TEMPLATES_COMMON_PATH, TEMPLATE_PATH_FINDER
-from ansys.templates.testing import assert_project_structure, assert_template_baking_process
+from ansys.templates.testing import (
+    assert_project_snapshot,
+    assert_project_structure,
+    get_choice_contexts,
+)
 from ansys.templates.utils import keep_files
 
+SNAPSHOTS_PATH = Path(__file__).parent / "snapshots"
+"""Directory holding the snapshots of the baked projects."""
+
 PYCOMMON_VARS = dict(
     __project_name_slug="common"
 )
@@ -395,37 +406,55 @@ TEMPLATES_VARIABLES_AND_STRUCTURE = {
 }
 
 
-@pytest.mark.parametrize("build_system", ["flit", "poetry", "setuptools"])
-@pytest.mark.parametrize("template", TEMPLATES_VARIABLES_AND_STRUCTURE)
-def test_template_python(tmp_path, build_system, template):
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Render the dates of the templates as if the projects were baked in 2024."""
+    now = arrow.get(2024, 1, 1)
+    monkeypatch.setattr("cookiecutter.extensions.arrow.now", lambda tz=None: now.to(tz or "utc"))
+
+
+def get_template_cases():
+    """Return the template and the build system of each tested project.
+
+    Templates are baked once per build system they declare as a choice, or
+    with their only build system otherwise.
+
+    """
+    cases = []
+    for template in TEMPLATES_VARIABLES_AND_STRUCTURE:
+        template_path = TEMPLATE_PATH_FINDER[template]
+        with open(template_path / "cookiecutter.json", 'r', encoding="utf-8") as fp:
+            config_json = json.load(fp)
+        default_build_system = config_json.get(
+            "build_system", "setuptools" if template != "solution" else "poetry"
+        )
+        contexts = get_choice_contexts(template_path, variables=["build_system"], prune=False)
+        cases.extend(
+            (template, context.get("build_system", default_build_system)) for context in contexts
+        )
+    return cases
 
-    # Get the list of supported build systems for the template
-    template_path = TEMPLATE_PATH_FINDER[template]
-    with open(template_path / "cookiecutter.json", 'r', encoding="utf-8") as fp:
-        config_json = json.load(fp)
-    default_build_system = "setuptools" if template != "solution" else "poetry"
-    supported_build_systems = config_json.get("build_system", [default_build_system])
 
-    # Skip if template does not support a particular build system
-    if build_system not in supported_build_systems:
-        pytest.skip(f"Template {template} does not support {build_system}.")
+@pytest.mark.parametrize("template, build_system", get_template_cases())
+def test_template_python(template, build_system, baked_project, frozen_time, update_snapshots):
 
     # Collect variables and expected structure
     VARIABLES, EXPECTED_STRUCTURE = TEMPLATES_VARIABLES_AND_STRUCTURE[template]
 
     # Collect some additional information
-    template_path, outdir_name = (
-        (TEMPLATE_PATH_FINDER[template], VARIABLES["__project_name_slug"])
-        if template != "common" else (PYTHON_TEMPLATES_COMMON_PATH, "common")
+    template_path = (
+        TEMPLATE_PATH_FINDER[template] if template != "common" else PYTHON_TEMPLATES_COMMON_PATH
     )
-    project_path = tmp_path.joinpath(outdir_name)
 
-    # Update variables if required
-    if template == "pyansys-advanced":
-        VARIABLES["build_system"] = build_system
+    # Select the build system if the template lets the user choose it
+    with open(template_path / "cookiecutter.json", 'r', encoding="utf-8") as fp:
+        config_json = json.load(fp)
+    if isinstance(config_json.get("build_system"), list):
+        VARIABLES = dict(VARIABLES, build_system=build_system)
 
-    # Assert no errors were raised during template rendering process
-    assert_template_baking_process(template_path, tmp_path, VARIABLES)
+    # Assert no errors were raised during template rendering process. Projects
+    # baked from the same variables are only baked once per session
+    project_path = baked_project(template_path, VARIABLES)
 
     # The pyansys-advanced template does not ship with some files included in
     # the common/ directory
@@ -436,3 +465,64 @@ def test_template_python(tmp_path, build_system, template):
 
     # Check that all common files are included in baked project
     assert_project_structure(EXPECTED_STRUCTURE, project_path)
+
+    # Check that the content of the baked files did not change
+    assert_project_snapshot(
+        project_path, SNAPSHOTS_PATH / f"{template}-{build_system}.txt", update=update_snapshots
+    )
+
+
+def get_structure_cases():
+    """Return the template and the variables of each variant whose files may differ.
+
+    Only the choice variables read by the conditions of the manifest or by the
+    hooks of a template, directly or through a private variable, are
+    enumerated.
+
+    """
+    cases = []
+    for template in TEMPLATES_VARIABLES_AND_STRUCTURE:
+        if template == "common":
+            continue
+        template_path = TEMPLATE_PATH_FINDER[template]
+        with open(template_path / "manifest.json", encoding="utf-8") as json_file:
+            manifest = json.load(json_file)
+        with open(template_path / "cookiecutter.json", encoding="utf-8") as json_file:
+            configuration = json.load(json_file)
+        sources = [group["when"] for group in manifest.get("conditional_files", [])]
+        sources.extend(hook.read_text() for hook in (template_path / "hooks").glob("*.py"))
+        source = " ".join(sources)
+        names = set(re.findall(r"\w+", source))
+        source += " ".join(
+            value for name, value in configuration.items() if name in names and isinstance(value, str)
+        )
+        variables = [name for name in configuration if name in source]
+        contexts = get_choice_contexts(template_path, variables=variables, prune=False)
+        cases.extend((template, context) for context in contexts)
+    return cases
+
+
+@pytest.mark.parametrize("template, context", get_structure_cases())
+def test_manifest_matches_desired_structure(template, context, tmp_path, monkeypatch):
+    """Check that the manifest selects the files kept by the hooks, and only them."""
+    calls = []
+
+    def recording_keep_files(files, project_path, *args, **kwargs):
+        missing = [path for path in files if not (Path(project_path) / path).exists()]
+        removed = keep_files(files, project_path, *args, **kwargs)
+        calls.append((missing, removed))
+        return removed
+
+    monkeypatch.setattr(utils, "keep_files", recording_keep_files)
+    utils.bake_template(
+        TEMPLATE_PATH_FINDER[template],
+        tmp_path,
+        no_input=True,
+        in_process_hooks=True,
+        extra_context=dict(TEMPLATES_VARIABLES_AND_STRUCTURE[template][0], **context),
+    )
+
+    assert calls, "The hook did not run in process"
+    for missing, removed in calls:
+        assert removed == [], "Files selected by the manifest are not desired by the hook"
+        assert missing == [], "Files desired by the hook are not selected by the manifest"
@@ -0,0 +1,108 @@
+# Copyright (C) 2022 - 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import importlib.util
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="Paths are only faked for Linux")
+
+
+@pytest.fixture
+def run_setup_environment(baked_project, monkeypatch):
+    """Return a function running the setup script of a solution with faked commands.
+
+    The commands of the script are recorded instead of being run. Only the
+    files each step checks for are created.
+
+    """
+    project_path = baked_project("solution", writable=True)
+    (project_path / ".env").write_text("SOLUTIONS_PRIVATE_PYPI_TOKEN=token\n")
+    monkeypatch.chdir(project_path)
+    monkeypatch.setenv("USER", "setup-environment-test")
+
+    commands = []
+
+    def run(command, *args, **kwargs):
+        text = command if isinstance(command, str) else " ".join(map(str, command))
+        if "dotnet" not in text:
+            commands.append(text)
+        if " -m venv " in text:
+            (Path(command[-1]) / "bin").mkdir(parents=True, exist_ok=True)
+            (Path(command[-1]) / "bin" / "python").touch()
+        if " pip install poetry" in text:
+            Path(".poetry/.venv/bin/poetry").touch()
+        if text.startswith("ln -sf"):
+            Path(".venv/bin/poetry").touch()
+        if " config " in text:
+            Path("poetry.toml").touch()
+        if text.endswith("poetry install -vv"):
+            # Poetry updates the lock file if it is outdated
+            Path("poetry.lock").write_text("# Resolved by poetry\n")
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(subprocess, "run", run)
+    spec = importlib.util.spec_from_file_location(
+        "setup_environment", project_path / "setup_environment.py"
+    )
+    setup_environment = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(setup_environment)
+    monkeypatch.setattr(
+        setup_environment, "get_python_package_versions", lambda *_, **__: ["1.8.4"]
+    )
+    monkeypatch.setattr(setup_environment, "check_python_version", lambda args: None)
+
+    def run_script(*arguments):
+        commands.clear()
+        monkeypatch.setattr(sys, "argv", ["setup_environment.py", *arguments])
+        setup_environment.main()
+        return list(commands)
+
+    return run_script
+
+
+def test_setup_environment_skips_unchanged_steps(run_setup_environment):
+    commands = run_setup_environment("-d", "run", "tests")
+    assert any(command.endswith("poetry install -vv") for command in commands)
+    assert any(command.endswith("poetry install --only tests -vv") for command in commands)
+
+    # The lock file updated by the first install does not invalidate the steps
+    assert run_setup_environment("-d", "run", "tests") == []
+
+    commands = run_setup_environment("-d", "run", "tests", "doc")
+    assert len(commands) == 1 and commands[0].endswith("poetry install --only doc -vv")
+
+
+def test_setup_environment_reinstalls_deleted_venv(run_setup_environment):
+    run_setup_environment("-d", "run", "tests")
+    shutil.rmtree(".venv")
+    assert not os.path.exists(".venv")
+
+    commands = run_setup_environment("-d", "run", "tests")
+    assert any(command.endswith("-m venv .venv") for command in commands)
+    assert any(command.endswith("poetry install -vv") for command in commands)
+    assert any(command.endswith("poetry install --only tests -vv") for command in commands)
+    assert run_setup_environment("-d", "run", "tests") == []